@@ -0,0 +1,206 @@
+"""
+Batched, length-bucketed Whisper evaluation
+
+Replaces the one-sample-at-a-time `model.generate` loop with:
+- Length bucketing so each batch decodes utterances of similar duration
+- A DataLoader with worker prefetch over numpy-formatted features
+- torch.inference_mode for generation
+- Throughput (samples/sec) and real-time factor alongside WER
+- WER on normalized text (punctuation, nukta, nasalisation, digits), using
+  the Hindi normalizer shared with task_04's lattice WER
+
+Usage:
+    from batch_eval import evaluate_model_batched
+    wer, predictions, references, stats = evaluate_model_batched(
+        model, processor, prepared_dataset, device="cpu", batch_size=16
+    )
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, Dataset
+import evaluate
+from tqdm import tqdm
+
+# The Hindi normalizer lives with the lattice WER code (see task_04/README.md)
+TASK_04_SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "task_04", "src")
+
+_normalizer = None
+
+
+def get_normalizer():
+    """
+    The shared HindiNormalizer, imported from task_04/src on first use
+
+    task_04/src is appended to sys.path only here, so scoring raw text
+    (normalize=False) leaves the import path untouched.
+    """
+    global _normalizer
+    if _normalizer is None:
+        if TASK_04_SRC not in sys.path:
+            sys.path.append(TASK_04_SRC)
+        from text_normalizer import HindiNormalizer
+        _normalizer = HindiNormalizer()
+    return _normalizer
+
+
+def normalize_pairs(predictions, references, normalizer=None):
+    """
+    Normalize predictions and references for scoring (with the shared
+    normalizer unless one is given), dropping pairs whose reference is empty
+    after normalization (e.g. punctuation only)
+    """
+    normalizer = normalizer or get_normalizer()
+    pairs = [
+        (normalizer.normalize(prediction), normalizer.normalize(reference))
+        for prediction, reference in zip(predictions, references)
+    ]
+    pairs = [(prediction, reference) for prediction, reference in pairs if reference]
+    return [p for p, _ in pairs], [r for _, r in pairs]
+
+
+class FeatureDataset(Dataset):
+    """Index-preserving view over the input_features column of a prepared dataset"""
+
+    def __init__(self, dataset):
+        # datasets.Dataset needs numpy formatting; CachedFeatureSet already yields arrays
+        if hasattr(dataset, "with_format"):
+            dataset = dataset.with_format("numpy", columns=["input_features"])
+        self.dataset = dataset
+
+    def __len__(self):
+        return len(self.dataset)
+
+    def __getitem__(self, idx):
+        return idx, self.dataset[idx]["input_features"]
+
+
+def collate_features(samples):
+    """Stack features into one float32 tensor without going through Python lists"""
+    indices = [idx for idx, _ in samples]
+    features = torch.from_numpy(np.stack([f for _, f in samples]).astype(np.float32, copy=False))
+    return indices, features
+
+
+def length_bucketed_batches(durations, batch_size):
+    """Group sample indices into batches of similar duration, longest first"""
+    order = np.argsort(-np.asarray(durations), kind="stable")
+    return [order[i:i + batch_size].tolist() for i in range(0, len(order), batch_size)]
+
+
+def get_durations(dataset):
+    """Audio durations in seconds, or None if the dataset does not carry them"""
+    if "duration" in dataset.column_names:
+        return list(dataset["duration"])
+    return None
+
+
+def iter_predictions(model, processor, test_dataset, device="cuda",
+                     batch_size=16, num_workers=2, indices=None):
+    """
+    Decode a prepared dataset batch by batch
+
+    Args:
+        indices: Optional subset of row indices to decode (e.g. to resume)
+
+    Yields:
+        (indices, transcriptions, elapsed) for each batch, where elapsed is
+        the wall-clock time spent on that batch's generate + decode
+    """
+    # ONNX Runtime models (optimum) have .to() but no .eval()
+    if hasattr(model, "eval"):
+        model.eval()
+    model.to(device)
+
+    durations = get_durations(test_dataset)
+    if indices is None:
+        indices = list(range(len(test_dataset)))
+    if durations is None:
+        durations = [0.0] * len(test_dataset)
+    batches = [
+        [indices[i] for i in batch]
+        for batch in length_bucketed_batches([durations[i] for i in indices], batch_size)
+    ]
+
+    loader = DataLoader(
+        FeatureDataset(test_dataset),
+        batch_sampler=batches,
+        collate_fn=collate_features,
+        num_workers=num_workers,
+        prefetch_factor=2 if num_workers > 0 else None,
+        pin_memory=str(device).startswith("cuda"),
+    )
+
+    with torch.inference_mode():
+        for batch_indices, input_features in tqdm(loader, desc="Evaluating"):
+            start = time.perf_counter()
+            input_features = input_features.to(device, non_blocking=True)
+            predicted_ids = model.generate(input_features)
+            transcriptions = processor.batch_decode(predicted_ids, skip_special_tokens=True)
+            yield batch_indices, transcriptions, time.perf_counter() - start
+
+
+def compute_stats(num_samples, elapsed, audio_seconds):
+    """Throughput and real-time factor for a decode run"""
+    return {
+        "num_samples": num_samples,
+        "elapsed": elapsed,
+        "samples_per_sec": num_samples / elapsed if elapsed > 0 else 0.0,
+        "audio_seconds": audio_seconds,
+        "rtf": elapsed / audio_seconds if audio_seconds > 0 else float("nan"),
+    }
+
+
+def evaluate_model_batched(model, processor, test_dataset, device="cuda",
+                           batch_size=16, num_workers=2, normalize=True):
+    """
+    Evaluate model on a prepared dataset and compute WER
+
+    Args:
+        model: WhisperForConditionalGeneration
+        processor: WhisperProcessor used to decode predictions
+        test_dataset: Dataset (or feature_cache.CachedFeatureSet) with
+            input_features and reference columns, and optionally duration,
+            used for bucketing and RTF
+        device: Device to run generation on
+        batch_size: Samples per generate call
+        num_workers: DataLoader workers prefetching features
+        normalize: Compute WER on normalized text (predictions and
+            references are still returned as decoded / stored)
+
+    Returns:
+        Tuple of (wer, predictions, references, stats) where stats holds
+        num_samples, elapsed, samples_per_sec, audio_seconds and rtf
+    """
+    predictions = [None] * len(test_dataset)
+    references = list(test_dataset["reference"])
+
+    start = time.perf_counter()
+    for indices, transcriptions, _ in iter_predictions(
+        model, processor, test_dataset, device, batch_size, num_workers
+    ):
+        for idx, transcription in zip(indices, transcriptions):
+            predictions[idx] = transcription
+    elapsed = time.perf_counter() - start
+
+    wer_metric = evaluate.load("wer")
+    if normalize:
+        scored_predictions, scored_references = normalize_pairs(predictions, references)
+    else:
+        scored_predictions, scored_references = predictions, references
+    wer = wer_metric.compute(predictions=scored_predictions, references=scored_references)
+
+    durations = get_durations(test_dataset)
+    audio_seconds = float(sum(durations)) if durations is not None else 0.0
+    stats = compute_stats(len(predictions), elapsed, audio_seconds)
+    return wer, predictions, references, stats
+
+
+def format_stats(stats):
+    """One-line throughput summary"""
+    return (f"{stats['samples_per_sec']:.2f} samples/sec, "
+            f"RTF {stats['rtf']:.3f} ({stats['num_samples']} samples in {stats['elapsed']:.1f}s)")
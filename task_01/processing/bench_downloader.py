@@ -0,0 +1,130 @@
+"""
+Benchmark the concurrent downloader against the sequential requests.get loop
+
+Serves the local audio/ directory over HTTP (with Range support and an
+artificial per-request latency to mimic a remote bucket) and downloads every
+file with both strategies.
+
+Usage:
+    python bench_downloader.py --latency 0.05 --workers 16
+"""
+
+import argparse
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from functools import partial
+
+import requests
+
+from downloader import download_all
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """Static file handler with single-range support and simulated latency"""
+    latency = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        path = self.translate_path(self.path)
+        match = re.match(r'bytes=(\d+)-', self.headers.get('Range', ''))
+        if not match or not os.path.isfile(path):
+            return super().do_GET()
+
+        size = os.path.getsize(path)
+        start = int(match.group(1))
+        if start >= size:
+            self.send_error(416)
+            return
+
+        self.send_response(206)
+        self.send_header('Content-Type', self.guess_type(path))
+        self.send_header('Content-Range', f'bytes {start}-{size - 1}/{size}')
+        self.send_header('Content-Length', str(size - start))
+        self.end_headers()
+        with open(path, 'rb') as f:
+            f.seek(start)
+            shutil.copyfileobj(f, self.wfile)
+
+
+def start_server(directory, latency):
+    """Start a threaded HTTP server in the background and return it"""
+    RangeRequestHandler.latency = latency
+    handler = partial(RangeRequestHandler, directory=directory)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def sequential_download(jobs):
+    """Original preprocess.py strategy: fresh request, whole body in memory"""
+    for url, save_path in jobs:
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+        with open(save_path, 'wb') as f:
+            f.write(response.content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dataset downloader")
+    parser.add_argument("--audio_dir", type=str, default="audio",
+                        help="Directory of files to serve")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="Simulated per-request server latency in seconds")
+    parser.add_argument("--workers", type=int, default=16,
+                        help="Concurrent download workers")
+    args = parser.parse_args()
+
+    server = start_server(args.audio_dir, args.latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    files = sorted(os.listdir(args.audio_dir))
+    total_bytes = sum(os.path.getsize(os.path.join(args.audio_dir, f)) for f in files)
+
+    print("=" * 80)
+    print("Downloader Benchmark")
+    print("=" * 80)
+    print(f"Files: {len(files)}  Size: {total_bytes / 1e6:.2f} MB  Latency: {args.latency*1000:.0f} ms")
+
+    timings = {}
+    for name in ['sequential', 'concurrent']:
+        with tempfile.TemporaryDirectory() as out_dir:
+            jobs = [(f"{base_url}/{f}", os.path.join(out_dir, f)) for f in files]
+            start = time.perf_counter()
+            if name == 'sequential':
+                sequential_download(jobs)
+            else:
+                results = download_all(jobs, max_workers=args.workers, show_progress=False)
+                assert all(results.values())
+            timings[name] = time.perf_counter() - start
+
+    # Resume check: truncate a file to half and make sure it is completed via Range
+    with tempfile.TemporaryDirectory() as out_dir:
+        src = os.path.join(args.audio_dir, files[0])
+        dst = os.path.join(out_dir, files[0])
+        with open(src, 'rb') as f:
+            data = f.read()
+        with open(dst + '.part', 'wb') as f:
+            f.write(data[:len(data) // 2])
+        download_all([(f"{base_url}/{files[0]}", dst)], max_workers=1, show_progress=False)
+        with open(dst, 'rb') as f:
+            resumed_ok = f.read() == data
+
+    server.shutdown()
+
+    print(f"\n{'Strategy':<15} {'Time (s)':<12} {'Files/s':<12} {'MB/s':<12}")
+    print("-" * 51)
+    for name, elapsed in timings.items():
+        print(f"{name:<15} {elapsed:<12.3f} {len(files)/elapsed:<12.1f} {total_bytes/1e6/elapsed:<12.2f}")
+    print(f"\nSpeedup: {timings['sequential'] / timings['concurrent']:.1f}x")
+    print(f"Range resume: {'OK' if resumed_ok else 'FAILED'}")
+
+
+if __name__ == "__main__":
+    main()
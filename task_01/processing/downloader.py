@@ -0,0 +1,115 @@
+"""
+Concurrent, resumable file downloader for the Hindi ASR dataset
+
+Features:
+- Bounded thread pool sharing one pooled HTTP session
+- Streamed, chunked writes to a temporary .part file with atomic rename
+- HTTP Range resume for partially downloaded files
+- Retry with exponential backoff on network and 5xx errors
+
+Usage:
+    from downloader import download_all
+    results = download_all([(url, save_path), ...], max_workers=16)
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+from tqdm import tqdm
+
+
+CHUNK_SIZE = 1024 * 1024
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def make_session(pool_size=16):
+    """Create an HTTP session with a connection pool sized for the worker count"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _fetch(session, url, save_path, timeout, chunk_size):
+    """Stream one URL into save_path.part, resuming from any existing partial file"""
+    part_path = save_path + '.part'
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    headers = {'Range': f'bytes={offset}-'} if offset else {}
+
+    with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if offset and response.status_code == 416:
+            # Partial file already holds the whole body
+            os.replace(part_path, save_path)
+            return
+        response.raise_for_status()
+
+        # Append only if the server honoured the Range request, else restart
+        mode = 'ab' if offset and response.status_code == 206 else 'wb'
+        with open(part_path, mode) as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    f.write(chunk)
+
+    os.replace(part_path, save_path)
+
+
+def download_file(session, url, save_path, timeout=30, max_retries=5,
+                  backoff=0.5, chunk_size=CHUNK_SIZE):
+    """Download file from URL with resume and retry, return True on success"""
+    if os.path.exists(save_path):
+        return True
+
+    for attempt in range(max_retries + 1):
+        try:
+            _fetch(session, url, save_path, timeout, chunk_size)
+            return True
+        except requests.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            if status not in RETRY_STATUS or attempt == max_retries:
+                print(f"   Error downloading {url}: {e}")
+                return False
+        except (requests.ConnectionError, requests.Timeout,
+                requests.exceptions.ChunkedEncodingError) as e:
+            if attempt == max_retries:
+                print(f"   Error downloading {url}: {e}")
+                return False
+        except Exception as e:
+            print(f"   Error downloading {url}: {e}")
+            return False
+
+        time.sleep(backoff * (2 ** attempt))
+
+    return False
+
+
+def download_all(jobs, max_workers=16, session=None, show_progress=True, **kwargs):
+    """
+    Download many files concurrently
+
+    Args:
+        jobs: Iterable of (url, save_path) pairs
+        max_workers: Size of the worker pool (and HTTP connection pool)
+        session: Optional shared requests.Session
+        **kwargs: Passed through to download_file
+
+    Returns:
+        Dict mapping save_path -> success flag
+    """
+    jobs = list(jobs)
+    session = session or make_session(pool_size=max_workers)
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(download_file, session, url, path, **kwargs): path
+            for url, path in jobs
+        }
+        for future in tqdm(as_completed(futures), total=len(futures),
+                           desc="Downloading", disable=not show_progress):
+            results[futures[future]] = future.result()
+
+    return results
@@ -0,0 +1,213 @@
+"""
+Multi-Checkpoint Evaluation Harness on FLEURS Hindi Test Set
+
+Decodes N Whisper checkpoints against one shared, cached set of FLEURS
+features, streams every prediction to a JSONL file as soon as its batch is
+decoded (re-running the script resumes from it), and prints a consolidated
+WER/CER/RTF table to pick the best checkpoint.
+
+Usage:
+    python evaluate_checkpoints.py --checkpoint_dir ./whisper-small-hi-finetuned --include_baseline
+    python evaluate_checkpoints.py --models openai/whisper-small ./ckpt-a ./ckpt-b
+"""
+
+import argparse
+import json
+import os
+import re
+
+import torch
+import evaluate
+import pandas as pd
+from datasets import load_dataset
+from transformers import WhisperProcessor, WhisperForConditionalGeneration
+
+from batch_eval import iter_predictions, compute_stats, normalize_pairs
+from feature_cache import FeatureCache
+
+
+def find_checkpoints(checkpoint_dir):
+    """List checkpoint-<step> directories in step order, followed by final/ if present"""
+    checkpoints = []
+    for name in os.listdir(checkpoint_dir):
+        match = re.fullmatch(r'checkpoint-(\d+)', name)
+        if match:
+            checkpoints.append((int(match.group(1)), os.path.join(checkpoint_dir, name)))
+    paths = [path for _, path in sorted(checkpoints)]
+
+    final = os.path.join(checkpoint_dir, 'final')
+    if os.path.isdir(final):
+        paths.append(final)
+    return paths
+
+
+def load_model(model_path, processor, language="hi"):
+    """Load a Whisper checkpoint configured for Hindi transcription"""
+    model = WhisperForConditionalGeneration.from_pretrained(model_path)
+    model.config.forced_decoder_ids = processor.get_decoder_prompt_ids(language=language, task="transcribe")
+    return model
+
+
+def load_predictions(predictions_path):
+    """Read already-streamed predictions as {model: {index: record}}"""
+    done = {}
+    if not os.path.exists(predictions_path):
+        return done
+
+    with open(predictions_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Last line may be truncated if the previous run crashed mid-write
+                continue
+            done.setdefault(record['model'], {})[record['index']] = record
+    return done
+
+
+def evaluate_checkpoint(model_path, processor, test_set, predictions_file, done, args):
+    """Decode the rows of test_set not yet in done, streaming each batch to JSONL"""
+    records = done.setdefault(model_path, {})
+    references = test_set['reference']
+
+    # Records from a run over another dataset or --num_samples are decoded
+    # again: drop rows past the end of test_set or with a different reference
+    stale = [i for i, record in records.items()
+             if i >= len(test_set) or record['reference'] != references[i]]
+    for i in stale:
+        del records[i]
+    if stale:
+        print(f"   Ignoring {len(stale)} stored predictions that no longer match the test set")
+
+    pending = [i for i in range(len(test_set)) if i not in records]
+    if not pending:
+        print("   All predictions already on disk, skipping decode")
+        return records
+
+    model = load_model(model_path, processor)
+
+    for indices, transcriptions, elapsed in iter_predictions(
+        model, processor, test_set, args.device, args.batch_size, args.num_workers, indices=pending
+    ):
+        for idx, transcription in zip(indices, transcriptions):
+            record = {
+                'model': model_path,
+                'index': idx,
+                'prediction': transcription,
+                'reference': references[idx],
+                'decode_seconds': elapsed / len(indices),
+            }
+            records[idx] = record
+            predictions_file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        predictions_file.flush()
+
+    del model
+    return records
+
+
+def score(records, durations, wer_metric, cer_metric, normalize=True):
+    """WER, CER (on normalized text unless normalize=False), throughput and RTF for one model's predictions"""
+    indices = sorted(records)
+    predictions = [records[i]['prediction'] for i in indices]
+    references = [records[i]['reference'] for i in indices]
+    if normalize:
+        predictions, references = normalize_pairs(predictions, references)
+    elapsed = sum(records[i]['decode_seconds'] for i in indices)
+    stats = compute_stats(len(indices), elapsed, sum(durations[i] for i in indices))
+
+    return {
+        'WER': wer_metric.compute(predictions=predictions, references=references),
+        'CER': cer_metric.compute(predictions=predictions, references=references),
+        'Samples/sec': stats['samples_per_sec'],
+        'RTF': stats['rtf'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate many Whisper checkpoints on FLEURS Hindi")
+    parser.add_argument("--models", type=str, nargs="*", default=[],
+                        help="Model paths or HuggingFace model names")
+    parser.add_argument("--checkpoint_dir", type=str, default=None,
+                        help="Training output dir; evaluates every checkpoint-<step> and final/")
+    parser.add_argument("--include_baseline", action="store_true",
+                        help="Also evaluate --processor as the pretrained baseline")
+    parser.add_argument("--processor", type=str, default="openai/whisper-small",
+                        help="Processor shared by all checkpoints")
+    parser.add_argument("--device", type=str, default="cuda" if torch.cuda.is_available() else "cpu",
+                        help="Device to run evaluation on")
+    parser.add_argument("--num_samples", type=int, default=None,
+                        help="Number of samples to evaluate (None for all)")
+    parser.add_argument("--batch_size", type=int, default=16,
+                        help="Samples per generate call")
+    parser.add_argument("--num_workers", type=int, default=2,
+                        help="DataLoader workers prefetching features")
+    parser.add_argument("--cache_dir", type=str, default="feature_cache",
+                        help="Directory for cached log-mel features")
+    parser.add_argument("--no_normalize", action="store_true",
+                        help="Score raw text instead of normalized text")
+    parser.add_argument("--predictions", type=str, default="checkpoint_predictions.jsonl",
+                        help="JSONL file predictions are streamed to")
+    parser.add_argument("--output", type=str, default="checkpoint_results.csv",
+                        help="Consolidated results table")
+
+    args = parser.parse_args()
+
+    models = list(args.models)
+    if args.include_baseline:
+        models.insert(0, args.processor)
+    if args.checkpoint_dir:
+        models.extend(find_checkpoints(args.checkpoint_dir))
+    if not models:
+        parser.error("no models given; use --models, --checkpoint_dir or --include_baseline")
+
+    print("="*80)
+    print("Multi-Checkpoint Evaluation on FLEURS Hindi Test Set")
+    print("="*80)
+    print(f"\nModels to evaluate: {len(models)}")
+    for path in models:
+        print(f"  - {path}")
+
+    # Load and featurize FLEURS once for every model
+    print("\n1. Loading FLEURS Hindi test dataset...")
+    fleurs_test = load_dataset("google/fleurs", "hi_in", split="test")
+    if args.num_samples:
+        fleurs_test = fleurs_test.select(range(args.num_samples))
+    print(f"   Test samples: {len(fleurs_test)}")
+
+    processor = WhisperProcessor.from_pretrained(args.processor, language="hi", task="transcribe")
+    test_set = FeatureCache(args.cache_dir, processor.feature_extractor).prepare(fleurs_test)
+
+    # Decode every model, streaming predictions
+    print(f"\n2. Decoding (predictions streamed to {args.predictions})")
+    done = load_predictions(args.predictions)
+    wer_metric = evaluate.load("wer")
+    cer_metric = evaluate.load("cer")
+    rows = []
+
+    with open(args.predictions, 'a', encoding='utf-8') as predictions_file:
+        for path in models:
+            print(f"\n   Model: {path}")
+            records = evaluate_checkpoint(path, processor, test_set, predictions_file, done, args)
+            result = score(records, test_set['duration'], wer_metric, cer_metric,
+                           normalize=not args.no_normalize)
+            print(f"   WER: {result['WER']:.4f}  CER: {result['CER']:.4f}  RTF: {result['RTF']:.3f}")
+            rows.append({'Model': path, **result})
+
+    # Results summary
+    print("\n" + "="*80)
+    print("RESULTS SUMMARY")
+    print("="*80)
+
+    results_df = pd.DataFrame(rows)
+    print(results_df.to_string(index=False))
+    print("="*80)
+
+    best = results_df.loc[results_df['WER'].idxmin()]
+    print(f"\nBest checkpoint: {best['Model']} (WER {best['WER']:.4f})")
+
+    results_df.to_csv(args.output, index=False)
+    print(f"\nResults saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Content-addressed on-disk cache of Whisper log-mel features
+
+Features are keyed by a hash of the raw audio bytes and the decode sampling
+rate, under a directory named by a hash of the feature-extractor config, so
+baseline and fine-tuned Whisper-small (which share the same extractor) reuse
+one set of features across runs and scripts.
+Each utterance is stored as a float16 .npy file and loaded with mmap, so a
+warm cache costs no recomputation and almost no load time.
+
+Layout:
+    <cache_dir>/<extractor_key>/<hh>/<audio_hash>.npy
+    <cache_dir>/<extractor_key>/durations.json
+
+Usage:
+    from feature_cache import FeatureCache
+    cache = FeatureCache("feature_cache", processor.feature_extractor)
+    features = cache.prepare(fleurs_test)   # rows of input_features, reference, duration
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+from datasets import Audio
+from tqdm import tqdm
+
+
+def feature_extractor_key(feature_extractor):
+    """Stable hash of the feature-extractor settings that affect its output"""
+    config = feature_extractor.to_dict()
+    for key in ('processor_class', 'feature_extractor_type'):
+        config.pop(key, None)
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def preprocessing_fingerprint(processor, examples):
+    """
+    Fingerprint of a training preprocessing run
+
+    Combines the feature-extractor config, the tokenizer identity, the
+    example table (audio path, segment bounds, text) and the size and mtime
+    of every audio file, so the persisted Arrow cache is reused only when
+    none of them changed. Audio contents are not hashed: a file rewritten
+    in place with the same size and mtime is not detected.
+    """
+    h = hashlib.sha1()
+    h.update(feature_extractor_key(processor.feature_extractor).encode('utf-8'))
+    tokenizer = processor.tokenizer
+    h.update(f"{tokenizer.name_or_path}|{len(tokenizer)}".encode('utf-8'))
+    h.update(examples.to_csv(index=False).encode('utf-8'))
+    for path in sorted(set(examples['audio'])):
+        stat = os.stat(path)
+        h.update(f"{path}|{stat.st_size}|{stat.st_mtime_ns}".encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+def audio_hash(audio, sampling_rate=None):
+    """
+    Hash an undecoded audio entry ({'bytes', 'path'}) by its file contents and
+    the rate it is decoded at (None: the file's own rate)
+    """
+    h = hashlib.sha1(f"{sampling_rate}|".encode('utf-8'))
+    if audio.get('bytes'):
+        h.update(audio['bytes'])
+    else:
+        with open(audio['path'], 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+    return h.hexdigest()
+
+
+class CachedFeatureSet:
+    """
+    Read-only, memory-mapped view over cached features for one dataset
+
+    Exposes the subset of the datasets.Dataset interface used by
+    batch_eval: len(), integer indexing and column access.
+    """
+
+    column_names = ['input_features', 'reference', 'duration']
+
+    def __init__(self, paths, references, durations):
+        self.paths = paths
+        self.references = references
+        self.durations = durations
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __getitem__(self, key):
+        if key == 'reference':
+            return self.references
+        if key == 'duration':
+            return self.durations
+        if key == 'input_features':
+            return [np.load(p, mmap_mode='r') for p in self.paths]
+        return {'input_features': np.load(self.paths[key], mmap_mode='r')}
+
+
+class FeatureCache:
+    """Compute-once store of log-mel features shared across models and runs"""
+
+    def __init__(self, cache_dir, feature_extractor):
+        self.feature_extractor = feature_extractor
+        self.root = os.path.join(cache_dir, feature_extractor_key(feature_extractor))
+        os.makedirs(self.root, exist_ok=True)
+        self.durations_path = os.path.join(self.root, 'durations.json')
+        self.durations = self._load_durations()
+
+    def _load_durations(self):
+        if not os.path.exists(self.durations_path):
+            return {}
+        with open(self.durations_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def path_for(self, key):
+        return os.path.join(self.root, key[:2], f"{key}.npy")
+
+    def _store(self, key, features):
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+        np.save(tmp_path, np.asarray(features, dtype=np.float16))
+        os.replace(tmp_path, path)
+
+    def _save_durations(self):
+        # Merge with what other processes sharing the cache wrote since we
+        # loaded, so their entries are not dropped by our replace
+        self.durations = {**self._load_durations(), **self.durations}
+        tmp_path = f"{self.durations_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.durations, f)
+        os.replace(tmp_path, self.durations_path)
+
+    def prepare(self, dataset, reference_column='transcription'):
+        """
+        Return cached features for every row of an audio dataset
+
+        Only rows whose audio hash is not yet in the cache are decoded and
+        run through the feature extractor.
+        """
+        sampling_rate = dataset.features['audio'].sampling_rate
+        raw = dataset.cast_column('audio', Audio(decode=False))
+        keys = [audio_hash(audio, sampling_rate) for audio in raw['audio']]
+        self.durations.update(self._load_durations())
+
+        missing = [i for i, key in enumerate(keys)
+                   if key not in self.durations or not os.path.exists(self.path_for(key))]
+
+        for i in tqdm(missing, desc="Extracting features", disable=not missing):
+            audio = dataset[i]['audio']
+            features = self.feature_extractor(
+                audio['array'],
+                sampling_rate=audio['sampling_rate']
+            ).input_features[0]
+            self._store(keys[i], features)
+            self.durations[keys[i]] = len(audio['array']) / audio['sampling_rate']
+
+        if missing:
+            self._save_durations()
+
+        print(f"   Feature cache: {len(keys) - len(missing)} hits, {len(missing)} computed")
+
+        return CachedFeatureSet(
+            paths=[self.path_for(key) for key in keys],
+            references=list(dataset[reference_column]),
+            durations=[self.durations[key] for key in keys],
+        )
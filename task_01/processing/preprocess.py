@@ -5,11 +5,12 @@ Run this to download and prepare the data
 
 import pandas as pd
 import json
-import requests
 import os
 from pathlib import Path
 from tqdm import tqdm
 
+from downloader import download_all
+
 print("="*80)
 print("Hindi ASR Dataset Preprocessing")
 print("="*80)
@@ -36,20 +37,8 @@ os.makedirs('audio', exist_ok=True)
 os.makedirs('transcriptions', exist_ok=True)
 print("   Directories created")
 
-# Step 4: Download function
-def download_file(url, save_path):
-    """Download file from URL"""
-    try:
-        if os.path.exists(save_path):
-            return True
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        with open(save_path, 'wb') as f:
-            f.write(response.content)
-        return True
-    except Exception as e:
-        print(f"   Error downloading {url}: {e}")
-        return False
+# Step 4: Download settings (pooled session, resumable, retried)
+MAX_WORKERS = 16
 
 # Step 5: Process transcription
 def process_transcription(transcription_data):
@@ -60,6 +49,13 @@ def process_transcription(transcription_data):
 
 # Step 6: Download and process
 print("\n4. Downloading and processing files...")
+jobs = []
+for _, row in df.iterrows():
+    recording_id = row['recording_id']
+    jobs.append((row['rec_url_gcp'], f"audio/{recording_id}.wav"))
+    jobs.append((row['transcription_url_gcp'], f"transcriptions/{recording_id}.json"))
+
+downloaded = download_all(jobs, max_workers=MAX_WORKERS)
 processed_data = []
 
 for idx, row in tqdm(df.iterrows(), total=len(df), desc="Processing"):
@@ -67,12 +63,8 @@ for idx, row in tqdm(df.iterrows(), total=len(df), desc="Processing"):
     audio_path = f"audio/{recording_id}.wav"
     trans_path = f"transcriptions/{recording_id}.json"
     
-    # Download audio
-    if not download_file(row['rec_url_gcp'], audio_path):
-        continue
-    
-    # Download transcription
-    if not download_file(row['transcription_url_gcp'], trans_path):
+    # Skip rows whose audio or transcription failed to download
+    if not downloaded.get(audio_path) or not downloaded.get(trans_path):
         continue
     
     # Load and process transcription
@@ -0,0 +1,222 @@
+"""
+Dynamic-Quantized CPU Inference for Whisper Evaluation
+
+Applies int8 dynamic quantization (torch.ao.quantization.quantize_dynamic on
+all nn.Linear layers) to the baseline and fine-tuned Whisper models, and
+optionally exports them to ONNX Runtime through optimum when it is installed.
+Each variant is evaluated on the same cached FLEURS subset and compared to
+fp32: WER delta, latency, throughput, weight size and peak process RSS
+while decoding. Variants are loaded one at a time, so each peak covers only
+the variant being evaluated (plus the shared cached features); DataLoader
+worker processes are not included.
+
+Usage:
+    python quantized_inference.py --model_path ./whisper-small-hi-finetuned/final --num_samples 100
+    python quantized_inference.py --model_path ./whisper-small-hi-finetuned/final --onnx
+"""
+
+import argparse
+import copy
+import gc
+import importlib.util
+import os
+import resource
+import sys
+import threading
+
+import torch
+import pandas as pd
+from datasets import load_dataset
+from transformers import WhisperProcessor
+
+from batch_eval import evaluate_model_batched, format_stats
+from feature_cache import FeatureCache
+from quick_evaluation import load_model_and_processor
+
+
+def quantize_dynamic_int8(model):
+    """Return an int8 dynamically quantized copy of model (Linear layers only)"""
+    model = copy.deepcopy(model).to("cpu").eval()
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def model_size_mb(model):
+    """Size of the model's weights in MB, counting packed int8 Linear weights"""
+    state = model.state_dict()
+    total = 0
+    for value in state.values():
+        if isinstance(value, torch.Tensor):
+            total += value.numel() * value.element_size()
+        elif isinstance(value, tuple):
+            # Quantized Linear stores (packed_weight, bias)
+            for item in value:
+                if isinstance(item, torch.Tensor):
+                    total += item.numel() * item.element_size()
+    return total / (1024 ** 2)
+
+
+def current_rss_bytes():
+    """Resident set size of this process, falling back to the peak where /proc is missing"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class PeakRSS:
+    """Context manager tracking the process's peak RSS in a background thread"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+
+    def _poll(self):
+        while True:
+            self.peak = max(self.peak, current_rss_bytes())
+            if self._stop.wait(self.interval):
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_bytes())
+
+    @property
+    def peak_mb(self):
+        return self.peak / (1024 ** 2)
+
+
+def onnx_available():
+    """True if optimum's ONNX Runtime integration can be imported"""
+    return (importlib.util.find_spec("optimum") is not None
+            and importlib.util.find_spec("onnxruntime") is not None)
+
+
+def export_onnx(model_path):
+    """Export a Whisper checkpoint to ONNX Runtime (CPU) via optimum"""
+    from optimum.onnxruntime import ORTModelForSpeechSeq2Seq
+    return ORTModelForSpeechSeq2Seq.from_pretrained(model_path, export=True, provider="CPUExecutionProvider")
+
+
+def compare_variants(model_path, test_set, args):
+    """Evaluate fp32, int8 and (optionally) ONNX variants of one model"""
+    processor = WhisperProcessor.from_pretrained(model_path, language="hi", task="transcribe")
+
+    # Each variant is built only when its turn comes and released afterwards,
+    # so the peak RSS of one variant never includes another's weights
+    def load_fp32():
+        return load_model_and_processor(model_path)[0]
+
+    variants = [("fp32", load_fp32), ("int8-dynamic", lambda: quantize_dynamic_int8(load_fp32()))]
+
+    if args.onnx:
+        if onnx_available():
+            def onnxruntime():
+                onnx_model = export_onnx(model_path)
+                onnx_model.config.forced_decoder_ids = processor.get_decoder_prompt_ids(
+                    language="hi", task="transcribe")
+                return onnx_model
+            variants.append(("onnxruntime", onnxruntime))
+        else:
+            print("   optimum[onnxruntime] not installed, skipping ONNX export")
+
+    rows = []
+    for name, build in variants:
+        print(f"\n   [{name}] {model_path}")
+        variant = build()
+        with PeakRSS() as memory:
+            wer, _, _, stats = evaluate_model_batched(
+                variant,
+                processor,
+                test_set,
+                device="cpu",
+                batch_size=args.batch_size,
+                num_workers=args.num_workers
+            )
+        print(f"   WER: {wer:.4f}  Throughput: {format_stats(stats)}  Peak RSS: {memory.peak_mb:.0f} MB")
+        rows.append({
+            'Model': model_path,
+            'Variant': name,
+            'Hindi WER': wer,
+            'Latency (s/sample)': stats['elapsed'] / stats['num_samples'],
+            'Samples/sec': stats['samples_per_sec'],
+            'RTF': stats['rtf'],
+            'Size (MB)': model_size_mb(variant) if isinstance(variant, torch.nn.Module) else float('nan'),
+            'Peak RSS (MB)': memory.peak_mb,
+        })
+        del variant
+        gc.collect()
+
+    df = pd.DataFrame(rows)
+    fp32 = df.iloc[0]
+    df['WER delta'] = df['Hindi WER'] - fp32['Hindi WER']
+    df['Speedup'] = df['Samples/sec'] / fp32['Samples/sec']
+    df['Size reduction'] = fp32['Size (MB)'] / df['Size (MB)']
+    df['RSS reduction'] = fp32['Peak RSS (MB)'] / df['Peak RSS (MB)']
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare fp32 and int8 Whisper inference on CPU")
+    parser.add_argument("--model_path", type=str, default="openai/whisper-small",
+                        help="Path to fine-tuned model or HuggingFace model name")
+    parser.add_argument("--baseline", type=str, default="openai/whisper-small",
+                        help="Baseline model for comparison")
+    parser.add_argument("--num_samples", type=int, default=100,
+                        help="Number of FLEURS samples to evaluate (0 for all)")
+    parser.add_argument("--batch_size", type=int, default=8,
+                        help="Samples per generate call")
+    parser.add_argument("--num_workers", type=int, default=2,
+                        help="DataLoader workers prefetching features")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="torch intra-op threads (default: torch's choice)")
+    parser.add_argument("--onnx", action="store_true",
+                        help="Also export and evaluate an ONNX Runtime variant if available")
+    parser.add_argument("--cache_dir", type=str, default="feature_cache",
+                        help="Directory for cached log-mel features")
+    parser.add_argument("--output", type=str, default="quantization_results.csv",
+                        help="Comparison table")
+
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    print("="*80)
+    print("fp32 vs int8 Whisper Inference on FLEURS Hindi (CPU)")
+    print("="*80)
+
+    print("\n1. Loading FLEURS Hindi test dataset...")
+    fleurs_test = load_dataset("google/fleurs", "hi_in", split="test")
+    if args.num_samples:
+        fleurs_test = fleurs_test.select(range(args.num_samples))
+    print(f"   Test samples: {len(fleurs_test)}")
+
+    _, processor = load_model_and_processor(args.baseline)
+    test_set = FeatureCache(args.cache_dir, processor.feature_extractor).prepare(fleurs_test)
+
+    print("\n2. Evaluating variants...")
+    model_paths = [args.baseline] if args.model_path == args.baseline else [args.baseline, args.model_path]
+    results_df = pd.concat([compare_variants(path, test_set, args) for path in model_paths],
+                           ignore_index=True)
+
+    print("\n" + "="*80)
+    print("RESULTS SUMMARY")
+    print("="*80)
+    print(results_df.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
+    print("="*80)
+
+    results_df.to_csv(args.output, index=False)
+    print(f"\nResults saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,17 +5,18 @@ This script provides a streamlined way to evaluate both pretrained and fine-tune
 Whisper-small models on the FLEURS Hindi test dataset.
 
 Usage:
-    python quick_evaluation.py --model_path ./whisper-small-hi-finetuned/final
+    python quick_evaluation.py --model_path ./whisper-small-hi-finetuned/final --batch_size 16
 """
 
 import argparse
 import torch
 from datasets import load_dataset
 from transformers import WhisperProcessor, WhisperForConditionalGeneration
-import evaluate
-from tqdm import tqdm
 import pandas as pd
 
+from batch_eval import evaluate_model_batched, format_stats
+from feature_cache import FeatureCache
+
 
 def load_model_and_processor(model_path, language="hi"):
     """Load Whisper model and processor"""
@@ -25,42 +26,18 @@ def load_model_and_processor(model_path, language="hi"):
     return model, processor
 
 
-def prepare_dataset(dataset, processor):
-    """Prepare FLEURS dataset for evaluation"""
-    def prepare_sample(batch):
-        audio = batch["audio"]
-        batch["input_features"] = processor.feature_extractor(
-            audio["array"], 
-            sampling_rate=audio["sampling_rate"]
-        ).input_features[0]
-        batch["reference"] = batch["transcription"]
-        return batch
-    
-    return dataset.map(prepare_sample)
-
-
-def evaluate_model(model, processor, test_dataset, device="cuda"):
-    """Evaluate model and compute WER"""
-    model.eval()
-    model.to(device)
-    
-    predictions = []
-    references = []
-    
-    wer_metric = evaluate.load("wer")
-    
-    for sample in tqdm(test_dataset, desc="Evaluating"):
-        input_features = torch.tensor(sample["input_features"]).unsqueeze(0).to(device)
-        
-        with torch.no_grad():
-            predicted_ids = model.generate(input_features)
-        
-        transcription = processor.batch_decode(predicted_ids, skip_special_tokens=True)[0]
-        predictions.append(transcription)
-        references.append(sample["reference"])
-    
-    wer = wer_metric.compute(predictions=predictions, references=references)
-    return wer, predictions, references
+def evaluate_model(model, processor, test_dataset, device="cuda", batch_size=16, num_workers=2,
+                   normalize=True):
+    """Evaluate model in length-bucketed batches and compute (normalized) WER, throughput and RTF"""
+    return evaluate_model_batched(
+        model,
+        processor,
+        test_dataset,
+        device=device,
+        batch_size=batch_size,
+        num_workers=num_workers,
+        normalize=normalize
+    )
 
 
 def main():
@@ -73,6 +50,14 @@ def main():
                         help="Device to run evaluation on")
     parser.add_argument("--num_samples", type=int, default=None,
                         help="Number of samples to evaluate (None for all)")
+    parser.add_argument("--batch_size", type=int, default=16,
+                        help="Samples per generate call")
+    parser.add_argument("--num_workers", type=int, default=2,
+                        help="DataLoader workers prefetching features")
+    parser.add_argument("--cache_dir", type=str, default="feature_cache",
+                        help="Directory for cached log-mel features")
+    parser.add_argument("--no_normalize", action="store_true",
+                        help="Score raw text instead of normalized text")
     
     args = parser.parse_args()
     
@@ -92,28 +77,37 @@ def main():
     # Evaluate baseline model
     print(f"\n2. Evaluating baseline model: {args.baseline}")
     baseline_model, baseline_processor = load_model_and_processor(args.baseline)
-    fleurs_prepared = prepare_dataset(fleurs_test, baseline_processor)
+    fleurs_prepared = FeatureCache(args.cache_dir, baseline_processor.feature_extractor).prepare(fleurs_test)
     
-    baseline_wer, _, _ = evaluate_model(
+    baseline_wer, _, _, baseline_stats = evaluate_model(
         baseline_model, 
         baseline_processor, 
         fleurs_prepared, 
-        args.device
+        args.device,
+        args.batch_size,
+        args.num_workers,
+        not args.no_normalize
     )
     print(f"   Baseline WER: {baseline_wer:.4f} ({baseline_wer*100:.2f}%)")
+    print(f"   Throughput: {format_stats(baseline_stats)}")
     
     # Evaluate fine-tuned model
     print(f"\n3. Evaluating fine-tuned model: {args.model_path}")
     finetuned_model, finetuned_processor = load_model_and_processor(args.model_path)
-    fleurs_prepared = prepare_dataset(fleurs_test, finetuned_processor)
+    # Same extractor config as the baseline -> served from the cache, no recomputation
+    fleurs_prepared = FeatureCache(args.cache_dir, finetuned_processor.feature_extractor).prepare(fleurs_test)
     
-    finetuned_wer, predictions, references = evaluate_model(
+    finetuned_wer, predictions, references, finetuned_stats = evaluate_model(
         finetuned_model, 
         finetuned_processor, 
         fleurs_prepared, 
-        args.device
+        args.device,
+        args.batch_size,
+        args.num_workers,
+        not args.no_normalize
     )
     print(f"   Fine-tuned WER: {finetuned_wer:.4f} ({finetuned_wer*100:.2f}%)")
+    print(f"   Throughput: {format_stats(finetuned_stats)}")
     
     # Results summary
     print("\n" + "="*80)
@@ -122,7 +116,9 @@ def main():
     
     results_df = pd.DataFrame({
         'Model': ['Whisper Small (Pretrained)', 'FT Whisper Small (yours)'],
-        'Hindi WER': [baseline_wer, finetuned_wer]
+        'Hindi WER': [baseline_wer, finetuned_wer],
+        'Samples/sec': [baseline_stats['samples_per_sec'], finetuned_stats['samples_per_sec']],
+        'RTF': [baseline_stats['rtf'], finetuned_stats['rtf']]
     })
     
     print(results_df.to_string(index=False))
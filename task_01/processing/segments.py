@@ -0,0 +1,139 @@
+"""
+Segment-level training examples from transcription JSON timestamps
+
+Whisper only sees the first 30 s of its input, so feeding whole recordings
+throws away most of the audio. This module turns each recording into
+per-segment (or <=30 s packed) examples using the `start`/`end` fields of
+the transcription JSON, and reads only the frames of each slice from disk.
+
+Usage:
+    from segments import build_segment_examples, load_segment_audio
+    examples = build_segment_examples(recordings_df, max_duration=30.0)
+    array = load_segment_audio(ex['audio'], ex['start'], ex['end'])
+"""
+
+import json
+import os
+
+import numpy as np
+import soundfile as sf
+
+
+SAMPLING_RATE = 16000
+MAX_DURATION = 30.0
+MAX_GAP = 2.0
+
+
+def load_segments(trans_path):
+    """Load timestamped, non-empty segments from a transcription JSON file"""
+    with open(trans_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    segments = []
+    for seg in data:
+        text = seg.get('text', '').strip()
+        if not text or 'start' not in seg or 'end' not in seg:
+            continue
+        if seg['end'] <= seg['start']:
+            continue
+        segments.append({'start': float(seg['start']), 'end': float(seg['end']), 'text': text})
+
+    return sorted(segments, key=lambda s: s['start'])
+
+
+def pack_segments(segments, max_duration=MAX_DURATION, max_gap=MAX_GAP):
+    """
+    Greedily merge consecutive segments into windows of at most max_duration
+
+    Segments separated by more than max_gap seconds of untranscribed audio
+    are not merged, so windows do not pad out with long silences. Segments
+    that are individually longer than max_duration are dropped, since
+    Whisper cannot attend to audio beyond 30 s.
+    """
+    packed = []
+    current = None
+
+    for seg in segments:
+        if seg['end'] - seg['start'] > max_duration:
+            continue
+        if (current and seg['end'] - current['start'] <= max_duration
+                and seg['start'] - current['end'] <= max_gap):
+            current['end'] = seg['end']
+            current['text'] += ' ' + seg['text']
+        else:
+            if current:
+                packed.append(current)
+            current = dict(seg)
+
+    if current:
+        packed.append(current)
+    return packed
+
+
+def load_segment_audio(audio_path, start, end, sampling_rate=SAMPLING_RATE):
+    """Read only the [start, end) slice of an audio file as mono float32"""
+    info = sf.info(audio_path)
+    start_frame = int(start * info.samplerate)
+    stop_frame = min(int(end * info.samplerate), info.frames)
+
+    audio, sr = sf.read(audio_path, start=start_frame, stop=stop_frame,
+                        dtype='float32', always_2d=True)
+    audio = audio.mean(axis=1)
+
+    if sr != sampling_rate:
+        import librosa
+        audio = librosa.resample(audio, orig_sr=sr, target_sr=sampling_rate)
+
+    return np.ascontiguousarray(audio, dtype=np.float32)
+
+
+def build_segment_examples(recordings, audio_dir='audio', trans_dir='transcriptions',
+                           max_duration=MAX_DURATION, pack=True):
+    """
+    Expand a recordings DataFrame into segment-level training examples
+
+    Args:
+        recordings: DataFrame with recording_id and user_id columns
+        audio_dir: Directory containing <recording_id>.wav
+        trans_dir: Directory containing <recording_id>.json
+        max_duration: Maximum example length in seconds
+        pack: Merge consecutive segments up to max_duration instead of
+              emitting one example per segment
+
+    Returns:
+        List of dicts with audio, start, end, text, recording_id, user_id
+    """
+    examples = []
+    skipped = 0
+
+    for _, row in recordings.iterrows():
+        recording_id = row['recording_id']
+        audio_path = os.path.join(audio_dir, f"{recording_id}.wav")
+        trans_path = os.path.join(trans_dir, f"{recording_id}.json")
+
+        try:
+            segments = load_segments(trans_path)
+        except Exception as e:
+            print(f"Error processing {recording_id}: {e}")
+            continue
+
+        if pack:
+            windows = pack_segments(segments, max_duration)
+        else:
+            windows = [s for s in segments if s['end'] - s['start'] <= max_duration]
+        skipped += len(segments) - sum(1 for s in segments if s['end'] - s['start'] <= max_duration)
+
+        for window in windows:
+            examples.append({
+                'audio': audio_path,
+                'start': window['start'],
+                'end': window['end'],
+                'text': window['text'],
+                'recording_id': recording_id,
+                'user_id': row['user_id'],
+            })
+
+    if skipped:
+        print(f"Skipped {skipped} segments longer than {max_duration:.0f}s")
+
+    return examples
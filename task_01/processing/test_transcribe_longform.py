@@ -0,0 +1,65 @@
+"""
+Tests for long-form chunking and seam stitching
+
+Run from this directory: python -m pytest -q
+"""
+
+import pytest
+
+pytest.importorskip("torch")
+
+from transcribe_longform import fixed_chunks, merge_overlap
+
+
+def test_fixed_chunks_cover_audio_with_overlap():
+    bounds = fixed_chunks(70 * 16000, 16000, 30.0, 5.0)
+    assert bounds == [(0, 480000), (400000, 880000), (800000, 1120000)]
+
+
+@pytest.mark.parametrize("overlap", [30.0, 45.0, -1.0])
+def test_fixed_chunks_reject_bad_overlap(overlap):
+    with pytest.raises(ValueError):
+        fixed_chunks(70 * 16000, 16000, 30.0, overlap)
+
+
+def test_merge_exact_seam():
+    assert merge_overlap("a b c d e", "d e f g", overlap_fraction=2 / 4) == "a b c d e f g"
+
+
+def test_merge_non_identical_seam_words():
+    # The overlap was decoded as "नमस्ते आप कैसे हो" and "नमस्कार आप कैसे हैं"
+    left = "आज हम बात करेंगे नमस्ते आप कैसे हो"
+    right = "नमस्कार आप कैसे हैं मैं ठीक हूँ"
+    merged = merge_overlap(left, right, overlap_fraction=4 / 7)
+    assert merged == "आज हम बात करेंगे नमस्ते आप कैसे हैं मैं ठीक हूँ"
+    assert merged.split().count("आप") == 1
+
+
+def test_merge_ignores_repeated_phrase_away_from_seam():
+    # "मुझे लगता है कि" opens left and recurs in right, far from the 2-word overlap
+    left = "मुझे लगता है कि आज बारिश होगी और हम घर पर रहेंगे"
+    right = "पर रहेंगे क्योंकि मुझे लगता है कि ठंड है"
+    merged = merge_overlap(left, right, overlap_fraction=2 / 9)
+    assert merged == ("मुझे लगता है कि आज बारिश होगी और हम घर पर रहेंगे "
+                      "क्योंकि मुझे लगता है कि ठंड है")
+
+
+def test_merge_rejects_shared_run_off_the_seam():
+    # "x y" is in both search windows, but five words before the end of left
+    # and three words into right: it cannot be the same stretch of a 3-word overlap
+    left = "p q x y r s t"
+    right = "u v w x y z"
+    merged = merge_overlap(left, right, overlap_fraction=3 / 6)
+    assert merged == "p q x y r s w x y z"
+
+
+def test_merge_without_shared_run_splits_overlap():
+    left = "one two three four x1 x2"
+    right = "y1 y2 five six seven eight"
+    merged = merge_overlap(left, right, overlap_fraction=2 / 6)
+    assert merged == "one two three four x1 y2 five six seven eight"
+
+
+def test_merge_empty_sides():
+    assert merge_overlap("", "a b") == "a b"
+    assert merge_overlap("a b", "") == "a b"
@@ -7,9 +7,9 @@ This script handles:
 """
 
 import pandas as pd
-import json
 import os
-from datasets import Dataset, Audio, DatasetDict, load_dataset
+import shutil
+from datasets import Dataset, DatasetDict, load_dataset, load_from_disk
 from transformers import (
     WhisperProcessor,
     WhisperForConditionalGeneration,
@@ -22,6 +22,10 @@ from dataclasses import dataclass
 from typing import Any, Dict, List, Union
 import numpy as np
 
+from segments import build_segment_examples, load_segment_audio, SAMPLING_RATE, MAX_DURATION
+from batch_eval import evaluate_model_batched, format_stats, normalize_pairs
+from feature_cache import FeatureCache, preprocessing_fingerprint
+
 print("="*80)
 print("HINDI ASR TRAINING PIPELINE")
 print("="*80)
@@ -35,8 +39,8 @@ print("\n[STEP 1] Preparing dataset from downloaded files...")
 df = pd.read_csv('../dataset/FT Data - data.csv')
 print(f"Total samples in CSV: {len(df)}")
 
-# Process transcriptions and create dataset
-data_list = []
+# Collect recordings with both audio and transcription available
+recordings = []
 
 for idx, row in df.iterrows():
     recording_id = row['recording_id']
@@ -47,30 +51,18 @@ for idx, row in df.iterrows():
     if not os.path.exists(audio_path) or not os.path.exists(trans_path):
         continue
     
-    # Load transcription
-    try:
-        with open(trans_path, 'r', encoding='utf-8') as f:
-            trans_data = json.load(f)
-        
-        # Combine all text segments
-        text = ' '.join([seg['text'] for seg in trans_data if 'text' in seg])
-        
-        if text.strip():
-            data_list.append({
-                'audio': audio_path,
-                'text': text.strip(),
-                'user_id': row['user_id']
-            })
-    except Exception as e:
-        print(f"Error processing {recording_id}: {e}")
-        continue
+    recordings.append({
+        'recording_id': recording_id,
+        'user_id': row['user_id']
+    })
 
-print(f"Valid samples: {len(data_list)}")
+print(f"Valid recordings: {len(recordings)}")
 
 # Create DataFrame
-df_processed = pd.DataFrame(data_list)
+df_processed = pd.DataFrame(recordings)
 
-# Train/val split (90/10) stratified by user
+# Train/val split (90/10) stratified by user, at recording level so that
+# segments of one recording never end up in both splits
 from sklearn.model_selection import train_test_split
 
 train_df, val_df = train_test_split(
@@ -80,16 +72,18 @@ train_df, val_df = train_test_split(
     stratify=df_processed['user_id']
 )
 
-print(f"Train samples: {len(train_df)}")
-print(f"Validation samples: {len(val_df)}")
+# Expand recordings into <=30s segment-level examples using JSON timestamps
+train_examples = pd.DataFrame(build_segment_examples(train_df, max_duration=MAX_DURATION))
+val_examples = pd.DataFrame(build_segment_examples(val_df, max_duration=MAX_DURATION))
 
-# Create HuggingFace datasets
-train_dataset = Dataset.from_pandas(train_df[['audio', 'text']].reset_index(drop=True))
-val_dataset = Dataset.from_pandas(val_df[['audio', 'text']].reset_index(drop=True))
+print(f"Train samples: {len(train_examples)} segments from {len(train_df)} recordings")
+print(f"Validation samples: {len(val_examples)} segments from {len(val_df)} recordings")
+print(f"Train audio: {(train_examples['end'] - train_examples['start']).sum() / 3600:.2f} hours")
 
-# Cast audio column
-train_dataset = train_dataset.cast_column('audio', Audio(sampling_rate=16000))
-val_dataset = val_dataset.cast_column('audio', Audio(sampling_rate=16000))
+# Create HuggingFace datasets (audio is sliced lazily from disk in STEP 3)
+segment_columns = ['audio', 'start', 'end', 'text']
+train_dataset = Dataset.from_pandas(train_examples[segment_columns].reset_index(drop=True))
+val_dataset = Dataset.from_pandas(val_examples[segment_columns].reset_index(drop=True))
 
 dataset_dict = DatasetDict({
     'train': train_dataset,
@@ -119,22 +113,47 @@ print(f"Parameters: {model.num_parameters() / 1e6:.1f}M")
 # ============================================================================
 print("\n[STEP 3] Preparing features...")
 
+# Use every available core; restarted runs load the persisted Arrow cache
+NUM_PROC = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+PREPROCESS_BATCH_SIZE = 32
+PREPROCESSED_DIR = os.path.join(
+    "preprocessed",
+    preprocessing_fingerprint(processor, pd.concat([train_examples, val_examples])[segment_columns])
+)
+
 def prepare_dataset(batch):
-    """Preprocess audio and text"""
-    audio = batch["audio"]
+    """Preprocess a batch of audio segments and texts"""
+    audios = [
+        load_segment_audio(path, start, end)
+        for path, start, end in zip(batch["audio"], batch["start"], batch["end"])
+    ]
     batch["input_features"] = processor.feature_extractor(
-        audio["array"],
-        sampling_rate=audio["sampling_rate"]
-    ).input_features[0]
+        audios,
+        sampling_rate=SAMPLING_RATE
+    ).input_features
     batch["labels"] = processor.tokenizer(batch["text"]).input_ids
     return batch
 
-# Apply preprocessing
-dataset_dict = dataset_dict.map(
-    prepare_dataset,
-    remove_columns=dataset_dict.column_names["train"],
-    num_proc=1
-)
+if os.path.exists(PREPROCESSED_DIR):
+    print(f"Loading preprocessed features from {PREPROCESSED_DIR}")
+    dataset_dict = load_from_disk(PREPROCESSED_DIR)
+else:
+    # Apply preprocessing
+    dataset_dict = dataset_dict.map(
+        prepare_dataset,
+        batched=True,
+        batch_size=PREPROCESS_BATCH_SIZE,
+        remove_columns=dataset_dict.column_names["train"],
+        num_proc=min(NUM_PROC, len(dataset_dict["train"])),
+        desc="Extracting features"
+    )
+    # Save next to the final location and rename, so a run killed mid-save
+    # never leaves a partial directory that later runs would try to load
+    tmp_dir = PREPROCESSED_DIR + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    dataset_dict.save_to_disk(tmp_dir)
+    os.replace(tmp_dir, PREPROCESSED_DIR)
+    print(f"Preprocessed features saved to {PREPROCESSED_DIR}")
 
 print("Features prepared!")
 
@@ -169,6 +188,10 @@ data_collator = DataCollatorSpeechSeq2SeqWithPadding(processor=processor)
 
 wer_metric = evaluate.load("wer")
 
+# Score WER on normalized text (batch_eval.normalize_pairs); False scores the
+# raw decoded text, both during training and on FLEURS
+NORMALIZE_WER = True
+
 def compute_metrics(pred):
     pred_ids = pred.predictions
     label_ids = pred.label_ids
@@ -178,6 +201,8 @@ def compute_metrics(pred):
     pred_str = processor.tokenizer.batch_decode(pred_ids, skip_special_tokens=True)
     label_str = processor.tokenizer.batch_decode(label_ids, skip_special_tokens=True)
 
+    if NORMALIZE_WER:
+        pred_str, label_str = normalize_pairs(pred_str, label_str)
     wer = wer_metric.compute(predictions=pred_str, references=label_str)
     return {"wer": wer}
 
@@ -236,36 +261,18 @@ print("\n[STEP 7] Evaluating on FLEURS Hindi test set...")
 fleurs_test = load_dataset("google/fleurs", "hi_in", split="test")
 print(f"FLEURS test samples: {len(fleurs_test)}")
 
-def prepare_fleurs(batch):
-    audio = batch["audio"]
-    batch["input_features"] = processor.feature_extractor(
-        audio["array"],
-        sampling_rate=audio["sampling_rate"]
-    ).input_features[0]
-    batch["reference"] = batch["transcription"]
-    return batch
+# Features are shared with quick_evaluation.py through the on-disk cache
+fleurs_test = FeatureCache("feature_cache", processor.feature_extractor).prepare(fleurs_test)
 
-fleurs_test = fleurs_test.map(prepare_fleurs)
+EVAL_BATCH_SIZE = 16
 
 def evaluate_model(model, processor, test_dataset, model_name):
-    model.eval()
     device = "cuda" if torch.cuda.is_available() else "cpu"
-    model.to(device)
-    
-    predictions = []
-    references = []
-    
-    for sample in test_dataset:
-        input_features = torch.tensor(sample["input_features"]).unsqueeze(0).to(device)
-        
-        with torch.no_grad():
-            predicted_ids = model.generate(input_features)
-        
-        transcription = processor.batch_decode(predicted_ids, skip_special_tokens=True)[0]
-        predictions.append(transcription)
-        references.append(sample["reference"])
-    
-    wer = wer_metric.compute(predictions=predictions, references=references)
+    wer, predictions, references, stats = evaluate_model_batched(
+        model, processor, test_dataset, device=device, batch_size=EVAL_BATCH_SIZE,
+        normalize=NORMALIZE_WER
+    )
+    print(f"{model_name} throughput: {format_stats(stats)}")
     return wer, predictions, references
 
 # Evaluate pretrained
@@ -0,0 +1,266 @@
+"""
+Long-Form Transcription for Full Recordings
+
+Whisper only attends to 30 s of audio, so full recordings (e.g. the 7-minute
+files in audio/) are split into chunks, decoded in batches and stitched back
+together. Chunks either overlap by a fixed stride (seams are stitched on the
+longest run of words both chunks transcribed) or, with --cut_at_silence, end
+at the quietest point near the 30 s boundary so no overlap is needed.
+
+Usage:
+    python transcribe_longform.py audio/825780.wav --model_path ./whisper-small-hi-finetuned/final
+    python transcribe_longform.py "audio/*.wav" --cut_at_silence --stream --output longform.csv
+"""
+
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+import soundfile as sf
+import torch
+import pandas as pd
+
+from quick_evaluation import load_model_and_processor
+
+
+SAMPLING_RATE = 16000
+CHUNK_SECONDS = 30.0
+OVERLAP_SECONDS = 5.0
+SILENCE_SEARCH_SECONDS = 5.0
+FRAME_SECONDS = 0.02
+
+
+def load_audio(audio_path, sampling_rate=SAMPLING_RATE):
+    """Load a full recording as mono float32 at sampling_rate"""
+    audio, sr = sf.read(audio_path, dtype='float32', always_2d=True)
+    audio = audio.mean(axis=1)
+    if sr != sampling_rate:
+        import librosa
+        audio = librosa.resample(audio, orig_sr=sr, target_sr=sampling_rate)
+    return audio
+
+
+def fixed_chunks(num_samples, sampling_rate, chunk_seconds, overlap_seconds):
+    """
+    (start, end) sample ranges of chunk_seconds windows overlapping by overlap_seconds
+
+    Raises:
+        ValueError: If overlap_seconds is negative or not shorter than chunk_seconds
+    """
+    if not 0 <= overlap_seconds < chunk_seconds:
+        raise ValueError(f"overlap must be in [0, {chunk_seconds}) seconds, got {overlap_seconds}")
+    chunk = int(chunk_seconds * sampling_rate)
+    step = chunk - int(overlap_seconds * sampling_rate)
+    bounds = []
+    start = 0
+    while start < num_samples:
+        end = min(start + chunk, num_samples)
+        bounds.append((start, end))
+        if end == num_samples:
+            break
+        start += step
+    return bounds
+
+
+def silence_chunks(audio, sampling_rate, chunk_seconds, search_seconds):
+    """
+    (start, end) sample ranges of at most chunk_seconds, cut at the lowest-energy
+    frame within the last search_seconds of each window
+    """
+    frame = int(FRAME_SECONDS * sampling_rate)
+    num_frames = len(audio) // frame
+    energy = np.sqrt(np.mean(audio[:num_frames * frame].reshape(num_frames, frame) ** 2, axis=1))
+
+    chunk = int(chunk_seconds * sampling_rate)
+    search = int(search_seconds * sampling_rate)
+    bounds = []
+    start = 0
+    while start < len(audio):
+        if start + chunk >= len(audio):
+            bounds.append((start, len(audio)))
+            break
+        lo = (start + chunk - search) // frame
+        hi = (start + chunk) // frame
+        cut = (lo + int(np.argmin(energy[lo:hi]))) * frame
+        if cut <= start:
+            cut = start + chunk
+        bounds.append((start, cut))
+        start = cut
+    return bounds
+
+
+def _seam_run(tail, head, overlap, slack):
+    """
+    Longest run of words shared by tail and head that sits at the seam
+
+    A run at tail[a:a+size] / head[b:b+size] sits at the seam when the words of
+    tail from a onwards plus the words of head before b add up to roughly the
+    expected overlap: both decodes then place the run at the same point of the
+    overlapping audio. Returns (a, b, size), with size 0 if there is none.
+    """
+    best = (0, 0, 0)
+    lengths = [0] * (len(head) + 1)
+    for i, word in enumerate(tail):
+        # lengths[j + 1]: shared run ending at tail[i] and head[j]
+        for j in range(len(head) - 1, -1, -1):
+            size = lengths[j] + 1 if head[j] == word else 0
+            lengths[j + 1] = size
+            a, b = i + 1 - size, j + 1 - size
+            if size > best[2] and abs(len(tail) - a + b - overlap) <= slack:
+                best = (a, b, size)
+    return best
+
+
+def merge_overlap(left, right, overlap_fraction=0.0, max_words=20, min_run=2):
+    """
+    Append right to left, transcribing the overlapping audio only once
+
+    The overlap is sized in words from right's speaking rate (overlap_fraction
+    is the overlap's share of right's chunk duration). The two decodes of it
+    rarely agree word for word, so the seam is anchored on the longest run of
+    words that left's tail and right's head share at the same place in the
+    overlap: left is kept up to the run and right from it. Only the overlap
+    plus some slack (at most max_words) is searched, so a phrase repeated
+    away from the seam is never taken as the anchor. Without a shared run of
+    min_run words, the overlap is split at its midpoint.
+    """
+    left_words, right_words = left.split(), right.split()
+    if not left_words or not right_words:
+        return ' '.join(left_words + right_words)
+
+    overlap = min(round(len(right_words) * overlap_fraction), len(left_words), len(right_words))
+    slack = max(min_run, overlap // 2)
+    window = min(max_words, overlap + slack)
+    tail, head = left_words[-window:], right_words[:window]
+    a, b, size = _seam_run(tail, head, overlap, slack)
+    if size and size >= min(min_run, len(tail), len(head)):
+        cut = len(left_words) - len(tail) + a
+        return ' '.join(left_words[:cut] + right_words[b:])
+
+    keep = len(left_words) - overlap // 2
+    return ' '.join(left_words[:keep] + right_words[overlap - overlap // 2:])
+
+
+def transcribe(audio, model, processor, device, batch_size, cut_at_silence,
+               chunk_seconds=CHUNK_SECONDS, overlap_seconds=OVERLAP_SECONDS, on_partial=None):
+    """
+    Transcribe a full recording
+
+    Args:
+        on_partial: Optional callback receiving the stitched text after each batch
+
+    Returns:
+        (text, num_chunks)
+    """
+    if cut_at_silence:
+        bounds = silence_chunks(audio, SAMPLING_RATE, chunk_seconds, SILENCE_SEARCH_SECONDS)
+    else:
+        bounds = fixed_chunks(len(audio), SAMPLING_RATE, chunk_seconds, overlap_seconds)
+
+    text = ''
+    for i in range(0, len(bounds), batch_size):
+        chunks = [audio[start:end] for start, end in bounds[i:i + batch_size]]
+        input_features = processor.feature_extractor(
+            chunks,
+            sampling_rate=SAMPLING_RATE,
+            return_tensors="pt"
+        ).input_features.to(device)
+
+        with torch.inference_mode():
+            predicted_ids = model.generate(input_features)
+        pieces = processor.batch_decode(predicted_ids, skip_special_tokens=True)
+
+        for (start, end), piece in zip(bounds[i:i + batch_size], pieces):
+            piece = piece.strip()
+            if cut_at_silence:
+                text = f"{text} {piece}".strip()
+            else:
+                overlap = min(overlap_seconds * SAMPLING_RATE, end - start)
+                text = merge_overlap(text, piece, overlap / (end - start))
+
+        if on_partial:
+            on_partial(text)
+
+    return text, len(bounds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe full-length recordings with Whisper")
+    parser.add_argument("inputs", type=str, nargs="+",
+                        help="Audio files or glob patterns")
+    parser.add_argument("--model_path", type=str, default="./whisper-small-hi-finetuned/final",
+                        help="Path to fine-tuned model or HuggingFace model name")
+    parser.add_argument("--device", type=str, default="cuda" if torch.cuda.is_available() else "cpu",
+                        help="Device to run inference on")
+    parser.add_argument("--batch_size", type=int, default=8,
+                        help="Chunks per generate call")
+    parser.add_argument("--overlap", type=float, default=OVERLAP_SECONDS,
+                        help="Overlap between fixed chunks in seconds")
+    parser.add_argument("--cut_at_silence", action="store_true",
+                        help="Cut chunks at low-energy points instead of overlapping")
+    parser.add_argument("--stream", action="store_true",
+                        help="Print partial transcripts as batches finish")
+    parser.add_argument("--output", type=str, default="longform_transcriptions.csv",
+                        help="CSV with transcripts and real-time factor per recording")
+
+    args = parser.parse_args()
+    if not 0 <= args.overlap < CHUNK_SECONDS:
+        parser.error(f"--overlap must be at least 0 and less than the {CHUNK_SECONDS:.0f} s chunk length")
+
+    paths = []
+    for pattern in args.inputs:
+        paths.extend(sorted(glob.glob(pattern)) or [pattern])
+
+    print("="*80)
+    print("Long-Form Transcription")
+    print("="*80)
+    print(f"Model: {args.model_path}")
+    print(f"Recordings: {len(paths)}")
+
+    model, processor = load_model_and_processor(args.model_path)
+    model.eval()
+    model.to(args.device)
+
+    on_partial = (lambda text: print(f"   ... {text[-120:]}", flush=True)) if args.stream else None
+
+    rows = []
+    for path in paths:
+        print(f"\n{path}")
+        audio = load_audio(path)
+        duration = len(audio) / SAMPLING_RATE
+
+        start = time.perf_counter()
+        text, num_chunks = transcribe(
+            audio, model, processor, args.device, args.batch_size,
+            args.cut_at_silence, overlap_seconds=args.overlap, on_partial=on_partial
+        )
+        elapsed = time.perf_counter() - start
+
+        rtf = elapsed / duration if duration > 0 else float('nan')
+        print(f"   Duration: {duration:.1f}s  Chunks: {num_chunks}  Time: {elapsed:.1f}s  RTF: {rtf:.3f}")
+        rows.append({
+            'recording_id': os.path.splitext(os.path.basename(path))[0],
+            'duration': duration,
+            'chunks': num_chunks,
+            'elapsed': elapsed,
+            'rtf': rtf,
+            'text': text,
+        })
+
+    results_df = pd.DataFrame(rows)
+
+    print("\n" + "="*80)
+    print("REAL-TIME FACTOR")
+    print("="*80)
+    print(results_df[['recording_id', 'duration', 'chunks', 'elapsed', 'rtf']].to_string(index=False))
+    total_rtf = results_df['elapsed'].sum() / results_df['duration'].sum()
+    print(f"\nOverall RTF: {total_rtf:.3f} ({results_df['duration'].sum() / 3600:.2f} hours of audio)")
+
+    results_df.to_csv(args.output, index=False)
+    print(f"\nResults saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,15 +10,23 @@ It checks for:
 
 Usage:
     python validate_dataset.py --csv_path ../dataset/FT\ Data\ -\ data.csv
+    python validate_dataset.py --fast --workers 8
+    python validate_dataset.py --fast --cache validation_cache.sqlite
+    python validate_dataset.py --cache validation_cache.sqlite --summary_only
 """
 
 import argparse
 import pandas as pd
 import json
 import os
+import sqlite3
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 import librosa
 import numpy as np
+import soundfile as sf
 from tqdm import tqdm
 import matplotlib.pyplot as plt
 
@@ -53,6 +61,102 @@ def validate_audio_file(audio_path):
         }
 
 
+SILENCE_THRESHOLD = 0.001
+FRAME_SECONDS = 0.02
+BLOCK_SECONDS = 60
+
+
+def _wav_data_region(audio_path):
+    """Locate raw sample data in a PCM/float WAV: (offset, nbytes, dtype, scale) or None"""
+    with open(audio_path, 'rb') as f:
+        riff, _, wave_id = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave_id != b'WAVE':
+            return None
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return None
+            chunk_id, size = struct.unpack('<4sI', header)
+            if chunk_id == b'fmt ':
+                fmt_tag, _, _, _, _, bits = struct.unpack('<HHIIHH', f.read(16))
+                f.seek(size - 16 + (size & 1), os.SEEK_CUR)
+                fmt = (fmt_tag, bits)
+            elif chunk_id == b'data':
+                break
+            else:
+                f.seek(size + (size & 1), os.SEEK_CUR)
+        offset = f.tell()
+
+    dtypes = {(1, 16): ('<i2', 32768.0), (1, 32): ('<i4', 2147483648.0), (3, 32): ('<f4', 1.0)}
+    if fmt not in dtypes:
+        return None
+    dtype, scale = dtypes[fmt]
+    nbytes = min(size, os.path.getsize(audio_path) - offset)
+    return offset, nbytes, np.dtype(dtype), scale
+
+
+def _iter_blocks(audio_path, info, block_frames):
+    """Yield float32 (frames, channels) blocks via mmap for PCM WAV, else soundfile streaming"""
+    region = _wav_data_region(audio_path) if info.format == 'WAV' else None
+    if region is None:
+        yield from sf.blocks(audio_path, blocksize=block_frames, dtype='float32', always_2d=True)
+        return
+
+    offset, nbytes, dtype, scale = region
+    frame_count = nbytes // (dtype.itemsize * info.channels)
+    if frame_count == 0:
+        return
+    data = np.memmap(audio_path, dtype=dtype, mode='r', offset=offset,
+                     shape=(frame_count, info.channels))
+    for start in range(0, frame_count, block_frames):
+        yield data[start:start + block_frames].astype(np.float32) / scale
+
+
+def validate_audio_file_fast(audio_path):
+    """
+    Validate audio file from its header plus one streamed block-wise pass
+
+    Duration, sample rate and channels come from the header; peak amplitude
+    and silence ratio are accumulated block by block, so memory stays
+    constant regardless of file length.
+    """
+    try:
+        info = sf.info(audio_path)
+        frame = max(1, int(FRAME_SECONDS * info.samplerate))
+        block_frames = frame * int(BLOCK_SECONDS / FRAME_SECONDS)
+
+        peak = 0.0
+        silent_frames = 0
+        total_frames = 0
+        for block in _iter_blocks(audio_path, info, block_frames):
+            mono = np.abs(block).max(axis=1)
+            if mono.size:
+                peak = max(peak, float(mono.max()))
+            n = len(mono) // frame
+            if n:
+                frame_peaks = mono[:n * frame].reshape(n, frame).max(axis=1)
+                silent_frames += int(np.count_nonzero(frame_peaks < SILENCE_THRESHOLD))
+                total_frames += n
+
+        return {
+            'exists': True,
+            'duration': info.frames / info.samplerate,
+            'sample_rate': info.samplerate,
+            'channels': info.channels,
+            'max_amplitude': peak,
+            'is_silent': peak < SILENCE_THRESHOLD,
+            'silence_ratio': silent_frames / total_frames if total_frames else 1.0,
+            'valid': True
+        }
+    except Exception as e:
+        return {
+            'exists': os.path.exists(audio_path),
+            'error': str(e),
+            'valid': False
+        }
+
+
 def validate_transcription_file(trans_path):
     """Validate transcription file and return statistics"""
     try:
@@ -84,6 +188,92 @@ def validate_transcription_file(trans_path):
         }
 
 
+def validate_row(row, audio_dir, trans_dir, validate_audio=validate_audio_file):
+    """Validate the audio and transcription files of one CSV row"""
+    recording_id, user_id, expected_duration = row
+    audio_path = os.path.join(audio_dir, f"{recording_id}.wav")
+    trans_path = os.path.join(trans_dir, f"{recording_id}.json")
+    
+    result = {
+        'recording_id': recording_id,
+        'user_id': user_id,
+        'expected_duration': expected_duration,
+        'audio_exists': os.path.exists(audio_path),
+        'trans_exists': os.path.exists(trans_path),
+    }
+    
+    # Validate audio
+    if result['audio_exists']:
+        audio_stats = validate_audio(audio_path)
+        result.update({f'audio_{k}': v for k, v in audio_stats.items()})
+    
+    # Validate transcription
+    if result['trans_exists']:
+        trans_stats = validate_transcription_file(trans_path)
+        result.update({f'trans_{k}': v for k, v in trans_stats.items()})
+    
+    return result
+
+
+def file_signature(path):
+    """Cheap change detector for a file: size and mtime, or 'missing'"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return 'missing'
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+class ManifestCache:
+    """
+    Persistent SQLite manifest of per-recording validation results
+
+    Each row is keyed by recording_id and stores the audio/transcription file
+    signatures it was computed from, so later runs only re-validate
+    recordings whose files were added or changed.
+    """
+
+    def __init__(self, db_path):
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS validations (
+                   recording_id TEXT PRIMARY KEY,
+                   audio_sig TEXT NOT NULL,
+                   trans_sig TEXT NOT NULL,
+                   mode TEXT NOT NULL,
+                   result TEXT NOT NULL
+               )"""
+        )
+
+    def lookup(self, recording_id, audio_sig, trans_sig, mode):
+        """Cached result if the files and validation mode are unchanged, else None"""
+        row = self.conn.execute(
+            "SELECT result FROM validations "
+            "WHERE recording_id = ? AND audio_sig = ? AND trans_sig = ? AND mode = ?",
+            (str(recording_id), audio_sig, trans_sig, mode)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def store_many(self, entries):
+        """Upsert (recording_id, audio_sig, trans_sig, mode, result) entries"""
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO validations VALUES (?, ?, ?, ?, ?)",
+            [
+                (str(rid), audio_sig, trans_sig, mode,
+                 json.dumps(result, default=lambda o: o.item() if hasattr(o, 'item') else str(o)))
+                for rid, audio_sig, trans_sig, mode, result in entries
+            ]
+        )
+        self.conn.commit()
+
+    def all_results(self):
+        """Every cached result keyed by recording_id"""
+        return {
+            rid: json.loads(result)
+            for rid, result in self.conn.execute("SELECT recording_id, result FROM validations")
+        }
+
+
 def main():
     parser = argparse.ArgumentParser(description="Validate Hindi ASR dataset")
     parser.add_argument("--csv_path", type=str, default="../dataset/FT Data - data.csv",
@@ -94,6 +284,14 @@ def main():
                         help="Directory containing transcription files")
     parser.add_argument("--download", action="store_true",
                         help="Download missing files")
+    parser.add_argument("--fast", action="store_true",
+                        help="Header-only metadata plus streamed block-wise peak/silence stats")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes validating files")
+    parser.add_argument("--cache", type=str, default=None,
+                        help="SQLite manifest cache; only new or changed files are re-validated")
+    parser.add_argument("--summary_only", action="store_true",
+                        help="Print the summary straight from --cache without checking files")
     
     args = parser.parse_args()
     
@@ -117,32 +315,62 @@ def main():
     
     # Validate files
     print("\n2. Validating files...")
-    validation_results = []
+    validate_audio = validate_audio_file_fast if args.fast else validate_audio_file
+    mode = 'fast' if args.fast else 'full'
+    cache = ManifestCache(args.cache) if args.cache else None
+    rows = [
+        (row['recording_id'], row['user_id'], row['duration'])
+        for _, row in df.iterrows()
+    ]
     
-    for idx, row in tqdm(df.iterrows(), total=len(df)):
-        recording_id = row['recording_id']
-        audio_path = os.path.join(args.audio_dir, f"{recording_id}.wav")
-        trans_path = os.path.join(args.trans_dir, f"{recording_id}.json")
+    if args.summary_only:
+        if cache is None:
+            parser.error("--summary_only requires --cache")
+        cached = cache.all_results()
+        validation_results = [cached[str(row[0])] for row in rows if str(row[0]) in cached]
+        print(f"   Loaded {len(validation_results)}/{len(rows)} results from cache")
+    else:
+        validation_results = [None] * len(rows)
+        signatures = []
+        pending = []
+        for i, row in enumerate(rows):
+            sigs = (
+                file_signature(os.path.join(args.audio_dir, f"{row[0]}.wav")),
+                file_signature(os.path.join(args.trans_dir, f"{row[0]}.json")),
+            )
+            signatures.append(sigs)
+            hit = cache.lookup(row[0], *sigs, mode) if cache else None
+            if hit is None:
+                pending.append(i)
+            else:
+                hit.update({'user_id': row[1], 'expected_duration': row[2]})
+                validation_results[i] = hit
         
-        result = {
-            'recording_id': recording_id,
-            'user_id': row['user_id'],
-            'expected_duration': row['duration'],
-            'audio_exists': os.path.exists(audio_path),
-            'trans_exists': os.path.exists(trans_path),
-        }
+        if cache:
+            print(f"   Cache hits: {len(rows) - len(pending)}, to validate: {len(pending)}")
         
-        # Validate audio
-        if result['audio_exists']:
-            audio_stats = validate_audio_file(audio_path)
-            result.update({f'audio_{k}': v for k, v in audio_stats.items()})
+        worker = partial(validate_row, audio_dir=args.audio_dir, trans_dir=args.trans_dir,
+                         validate_audio=validate_audio)
+        pending_rows = [rows[i] for i in pending]
+        
+        if args.workers > 1 and len(pending_rows) > 1:
+            with ProcessPoolExecutor(max_workers=args.workers) as executor:
+                fresh = list(tqdm(
+                    executor.map(worker, pending_rows,
+                                 chunksize=max(1, len(pending_rows) // (args.workers * 8))),
+                    total=len(pending_rows)
+                ))
+        else:
+            fresh = [worker(row) for row in tqdm(pending_rows)]
         
-        # Validate transcription
-        if result['trans_exists']:
-            trans_stats = validate_transcription_file(trans_path)
-            result.update({f'trans_{k}': v for k, v in trans_stats.items()})
+        for i, result in zip(pending, fresh):
+            validation_results[i] = result
         
-        validation_results.append(result)
+        if cache:
+            cache.store_many(
+                (rows[i][0], *signatures[i], mode, result)
+                for i, result in zip(pending, fresh)
+            )
     
     # Create validation DataFrame
     val_df = pd.DataFrame(validation_results)
@@ -0,0 +1,123 @@
+"""
+Precomputed character classes for Devanagari script checks
+
+Every codepoint in the first two Unicode planes is mapped to one ASCII class
+letter in a bytes table, so `word.translate(CHAR_CLASSES)` classifies a whole
+word in one C-level pass. Script, punctuation, number and structure checks then
+become counts and substring tests on the short class string.
+Codepoints above U+1FFFF pass through translate unchanged and count as
+OTHER; no punctuation is assigned beyond plane 1.
+"""
+
+import re
+import unicodedata
+
+# Class letters
+LETTER = 'L'            # Devanagari consonant, independent vowel, other letter
+VOWEL_SIGN = 'M'        # dependent vowel sign checked for stacking (ा ि ी ु ू ृ े ै ो ौ)
+SIGN = 'm'              # other Devanagari mark: nukta, anusvara, chandrabindu, ॅ ॉ ...
+VIRAMA = 'V'            # halant
+DEVANAGARI_DIGIT = 'D'  # ० - ९
+DANDA = 'p'             # Devanagari punctuation (। ॥ ॰)
+DIGIT = 'd'             # ASCII digit
+SEPARATOR = 's'         # , . - / inside numbers (also punctuation)
+PUNCTUATION = 'P'       # any other Unicode punctuation
+LATIN = 'A'             # Latin letter
+OTHER = 'O'
+
+DEVANAGARI_CLASSES = LETTER + VOWEL_SIGN + SIGN + VIRAMA + DEVANAGARI_DIGIT + DANDA
+PUNCTUATION_CLASSES = DANDA + SEPARATOR + PUNCTUATION
+NUMERIC_CLASSES = DEVANAGARI_DIGIT + DIGIT + SEPARATOR
+
+# Same ranges as HindiSpellingClassifier (U+097F and U+A8FF excluded)
+DEVANAGARI_RANGES = (range(0x0900, 0x097F), range(0xA8E0, 0xA8FF))
+STACKING_VOWEL_SIGNS = 'ािीुूृेैोौ'
+VIRAMA_CHAR = '्'
+NUMBER_SEPARATORS = ',.-/'
+
+TABLE_SIZE = 0x20000
+
+
+def _classify_codepoint(code: int) -> str:
+    char = chr(code)
+    category = unicodedata.category(char)
+    if any(code in block for block in DEVANAGARI_RANGES):
+        if char == VIRAMA_CHAR:
+            return VIRAMA
+        if char in STACKING_VOWEL_SIGNS:
+            return VOWEL_SIGN
+        if category[0] == 'M':
+            return SIGN
+        if category == 'Nd':
+            return DEVANAGARI_DIGIT
+        if category[0] == 'P':
+            return DANDA
+        return LETTER
+    if char in NUMBER_SEPARATORS:
+        return SEPARATOR
+    if category[0] == 'P':
+        return PUNCTUATION
+    if '0' <= char <= '9':
+        return DIGIT
+    if category[0] == 'L' and (code < 0x80 or 0xC0 <= code < 0x250 or 0x1E00 <= code < 0x1F00):
+        return LATIN
+    return OTHER
+
+
+def _build_table() -> bytes:
+    table = bytearray(OTHER.encode() * TABLE_SIZE)
+    categories = map(unicodedata.category, map(chr, range(TABLE_SIZE)))
+    for code, category in enumerate(categories):
+        if category[0] == 'P':
+            table[code] = ord(PUNCTUATION)
+    # Outside these blocks a codepoint is either punctuation or OTHER
+    for block in (range(0x80), range(0xC0, 0x250), range(0x1E00, 0x1F00), *DEVANAGARI_RANGES):
+        for code in block:
+            table[code] = ord(_classify_codepoint(code))
+    return bytes(table)
+
+
+CHAR_CLASSES = _build_table()
+
+
+def char_class(char: str) -> str:
+    """Class letter of one character"""
+    code = ord(char)
+    return chr(CHAR_CLASSES[code]) if code < TABLE_SIZE else OTHER
+
+
+def classes_of(word: str) -> str:
+    """Class string of a word, one letter per character"""
+    return word.translate(CHAR_CLASSES)
+
+
+def count_classes(classes: str, members: str) -> int:
+    """Number of characters in a class string belonging to any of members"""
+    return sum(map(classes.count, members))
+
+
+def regex_class(members: str, negate: bool = False) -> str:
+    """
+    Regex character class matching every codepoint whose class is in members
+
+    The result is compatible with Python's re and with RE2 (pyarrow kernels),
+    so vectorized checks use exactly the same definitions as the table.
+    """
+    targets = {ord(member) for member in members}
+    ranges = []
+    start = None
+    for code, value in enumerate(CHAR_CLASSES):
+        if value in targets:
+            if start is None:
+                start = code
+        elif start is not None:
+            ranges.append((start, code - 1))
+            start = None
+    if start is not None:
+        ranges.append((start, TABLE_SIZE - 1))
+    body = ''.join(
+        re.escape(chr(low)) if low == high else f'{re.escape(chr(low))}-{re.escape(chr(high))}'
+        for low, high in ranges
+    )
+    return f"[{'^' if negate else ''}{body}]"
+
@@ -3,21 +3,80 @@ Hindi Spelling Classifier - Complete Solution
 Classifies ~177K unique Hindi words as correct or incorrect spelling
 """
 
+import argparse
+import numpy as np
 import pandas as pd
 import re
-import unicodedata
+import sys
+import time
 import os
 from pathlib import Path
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # classify_batch falls back to pandas object strings
+    pa = None
+
+if __name__ == '__main__':
+    # Shared Hindi text code lives in task_04/src (see task_04/README.md)
+    sys.path.append(str(Path(__file__).resolve().parents[2] / 'task_04' / 'src'))
+
+from lexicon import INVISIBLE, SortedLexicon, load_lexicon, normalize_word
+from suggest import SuggestionIndex, unit_distance
+from char_classes import (
+    DEVANAGARI_CLASSES, DEVANAGARI_RANGES, NUMERIC_CLASSES, PUNCTUATION_CLASSES,
+    VIRAMA, VOWEL_SIGN, classes_of, count_classes, regex_class,
+)
+from tokenization import aksaras
+
+REPETITION = re.compile(r'(.)\1{3,}')
+
+# Regex versions of the character classes for classify_batch(). Escapes are
+# resolved by Python so they also work with pyarrow's RE2 string kernels.
+PUNCTUATION_CHARS = regex_class(PUNCTUATION_CLASSES)
+NUMERIC_CHARS = regex_class(NUMERIC_CLASSES) + '+'
+NON_DEVANAGARI_CHARS = regex_class(DEVANAGARI_CLASSES, negate=True) + '+'
+# Invalid structure: double virama, leading virama, two vowel signs in a row
+# (anusvara and chandrabindu excluded) or 4+ repetitions of one character
+BAD_SIGNS = (f"{regex_class(VIRAMA)}{{2}}|^{regex_class(VIRAMA)}"
+             f"|{regex_class(VOWEL_SIGN)}{{2}}")
+# RE2 has no backreferences, so the batch path spells out repetition for
+# ASCII and Devanagari and uses Python's re for words with other characters
+COMMON_CHARS = ''.join(chr(code) for code in [*range(0x20, 0x7f), *range(0x0900, 0x0980)])
+COMMON_REPETITION = '|'.join(re.escape(char) + '{4}' for char in COMMON_CHARS)
+UNCOMMON = '[^' + re.escape(COMMON_CHARS) + ']'
+
 class HindiSpellingClassifier:
-    def __init__(self):
-        # Devanagari Unicode ranges
-        self.devanagari_range = range(0x0900, 0x097F)
-        self.devanagari_extended = range(0xA8E0, 0xA8FF)
+    def __init__(self, lexicon=None, frequencies=None, rare_count=2, neighbour_ratio=50,
+                 flag_unseen=False):
+        # Devanagari Unicode ranges (baked into char_classes.CHAR_CLASSES)
+        self.devanagari_range, self.devanagari_extended = DEVANAGARI_RANGES
         
         # Load Hindi dictionary
         self.hindi_dict = self._load_dictionary()
         
+        # Optional large lexicon: a lexicon.Lexicon, or a path to a .lex file
+        # or plain word list
+        if isinstance(lexicon, (str, Path)):
+            lexicon = load_lexicon(str(lexicon))
+        self.lexicon = lexicon
+        self._suggestions = None
+        
+        # Optional corpus count table from word_frequency.py: words seen at
+        # most rare_count times that are one aksara away from a word seen
+        # neighbour_ratio times as often are flagged as misspellings. Words
+        # the table never saw only count as rare with flag_unseen
+        if isinstance(frequencies, (str, Path)):
+            frequencies = SortedLexicon(str(frequencies))
+        if frequencies is not None and frequencies.counts is None:
+            raise ValueError("Frequency table has no counts (build it with word_frequency.py)")
+        self.frequencies = frequencies
+        self.rare_count = rare_count
+        self.neighbour_ratio = neighbour_ratio
+        self.flag_unseen = flag_unseen
+        self._neighbours = None
+        
         # Statistics
         self.stats = {'correct': 0, 'incorrect': 0, 'total': 0}
     
@@ -87,106 +146,229 @@ class HindiSpellingClassifier:
         
         return words
     
+    def in_dictionary(self, word):
+        """Check the core dictionary, then the large lexicon if one is loaded"""
+        return word in self.hindi_dict or (self.lexicon is not None and word in self.lexicon)
+    
+    def _frequent_words(self):
+        """Corpus words common enough to be a rare word's frequent neighbour"""
+        counts = self.frequencies.counts
+        return [self.frequencies[int(index)]
+                for index in np.flatnonzero(counts >= self.neighbour_ratio)]
+    
+    def suggestion_index(self, max_distance=2):
+        """
+        Symmetric-delete index over the dictionary, lexicon and frequent
+        corpus words, built on first use
+        """
+        if self._suggestions is None or self._suggestions.max_distance != max_distance:
+            words = set(self.hindi_dict)
+            if self.lexicon is not None:
+                words.update(self.lexicon)
+            counts = None
+            if self.frequencies is not None:
+                words.update(self._frequent_words())
+            words = sorted(words)
+            if self.frequencies is not None:
+                counts = self.frequencies.frequency_batch(words)
+            self._suggestions = SuggestionIndex(words, max_distance=max_distance, counts=counts)
+        return self._suggestions
+    
+    def frequency(self, word):
+        """Corpus count of a normalized word (0 without a frequency table)"""
+        return self.frequencies.frequency(word) if self.frequencies is not None else 0
+    
+    def has_frequent_neighbour(self, word, count=None):
+        """
+        Check whether a word is a rare variant of a much more frequent word
+        one aksara away (needs a frequency table)
+        """
+        if self.frequencies is None:
+            return False
+        count = self.frequency(word) if count is None else count
+        return bool(self.frequent_neighbours([word], [count])[0])
+    
+    def frequent_neighbours(self, words, counts):
+        """
+        has_frequent_neighbour() for many normalized words and their corpus
+        counts, with one candidate search for the whole batch
+        """
+        words = words.tolist() if hasattr(words, 'tolist') else list(words)
+        counts = np.asarray(counts, dtype=np.int64)
+        found = np.zeros(len(words), dtype=bool)
+        rare = (counts <= self.rare_count) & ((counts > 0) | self.flag_unseen)
+        if self.frequencies is None or not rare.any():
+            return found
+        if self._neighbours is None:
+            frequent = self._frequent_words()
+            self._neighbours = SuggestionIndex(frequent, max_distance=1,
+                                               counts=self.frequencies.frequency_batch(frequent))
+        index = self._neighbours
+        queries = np.flatnonzero(rare)
+        positions, ids = index.candidate_pairs([words[query] for query in queries])
+        
+        # Only candidates neighbour_ratio times as frequent matter, which
+        # leaves few pairs for the exact aksara distance check
+        threshold = np.maximum(counts[queries[positions]], 1) * self.neighbour_ratio
+        keep = index.counts[ids] >= threshold
+        for query, word_id in zip(queries[positions[keep]].tolist(), ids[keep].tolist()):
+            if found[query]:
+                continue
+            word, candidate = words[query], index.words[word_id]
+            if candidate != word and unit_distance(aksaras(word), aksaras(candidate), 1) <= 1:
+                found[query] = True
+        return found
+    
+    def suggest(self, word, top_k=5):
+        """Nearest valid spellings of a word as (suggestion, aksara distance) pairs"""
+        return self.suggestion_index().lookup(self.normalize(word), top_k)
+    
     def is_devanagari_char(self, char):
         """Check if character is Devanagari"""
         if not char:
             return False
-        code = ord(char)
-        return code in self.devanagari_range or code in self.devanagari_extended
+        return classes_of(char) in DEVANAGARI_CLASSES
     
-    def is_hindi_word(self, word):
+    def is_hindi_word(self, word, classes=None):
         """Check if word is primarily Devanagari"""
         if not word:
             return False
-        dev_count = sum(1 for c in word if self.is_devanagari_char(c))
-        non_punct = len([c for c in word if not unicodedata.category(c).startswith('P')])
+        classes = classes_of(word) if classes is None else classes
+        dev_count = count_classes(classes, DEVANAGARI_CLASSES)
+        non_punct = len(classes) - count_classes(classes, PUNCTUATION_CLASSES)
         return non_punct > 0 and dev_count / non_punct > 0.5
     
     def normalize(self, word):
         """Normalize word"""
-        word = unicodedata.normalize('NFC', word)
-        word = re.sub(r'[\u200b-\u200f\u202a-\u202e]', '', word)
-        return word.strip()
+        return normalize_word(word)
     
-    def has_invalid_structure(self, word):
+    def has_invalid_structure(self, word, classes=None):
         """Check for invalid Devanagari structure"""
-        # Multiple consecutive virama (halant)
-        if '्' in word and re.search(r'्{2,}', word):
-            return True
-        # Virama at start
-        if word.startswith('्'):
-            return True
-        # Multiple consecutive vowel signs (excluding anusvara ं and chandrabindu ँ)
-        vowel_signs = 'ािीुूृेैोौ'
-        for i in range(len(word) - 1):
-            if word[i] in vowel_signs and word[i+1] in vowel_signs:
-                return True
-        # Excessive repetition (4+ same chars to be more lenient)
-        if re.search(r'(.)\1{3,}', word):
-            return True
-        return False
-    
-    def is_punctuation_only(self, word):
+        classes = classes_of(word) if classes is None else classes
+        return (VIRAMA * 2 in classes or classes.startswith(VIRAMA)
+                or VOWEL_SIGN * 2 in classes or REPETITION.search(word) is not None)
+    
+    def is_punctuation_only(self, word, classes=None):
         """Check if only punctuation"""
-        return all(unicodedata.category(c).startswith('P') for c in word)
+        classes = classes_of(word) if classes is None else classes
+        return not classes.strip(PUNCTUATION_CLASSES)
     
-    def is_number(self, word):
+    def is_number(self, word, classes=None):
         """Check if numeric"""
-        cleaned = re.sub(r'[०-९0-9,.\-/]+', '', word)
-        return len(cleaned) < len(word) * 0.3
+        classes = classes_of(word) if classes is None else classes
+        cleaned = len(classes) - count_classes(classes, NUMERIC_CLASSES)
+        return cleaned < len(word) * 0.3
     
     def classify(self, word):
         """Classify word as correct or incorrect"""
         word = self.normalize(word)
+        classes = classes_of(word)
         
-        if not word or self.is_punctuation_only(word):
+        if not word or self.is_punctuation_only(word, classes):
             return 'correct_spelling'  # Punctuation is not a spelling error
         
-        if self.is_number(word):
+        if self.is_number(word, classes):
             return 'correct_spelling'  # Numbers are not spelling errors
         
-        if not self.is_hindi_word(word):
+        if not self.is_hindi_word(word, classes):
             # English/mixed - consider as correct (English transliterations)
             return 'correct_spelling'
         
         # Check dictionary
-        if word in self.hindi_dict:
+        if self.in_dictionary(word):
             return 'correct_spelling'
         
         # Check for structural errors
-        if self.has_invalid_structure(word):
+        if self.has_invalid_structure(word, classes):
             return 'incorrect_spelling'
         
         # Single character - likely correct if valid Devanagari
         if len(word) == 1:
             return 'correct_spelling' if self.is_devanagari_char(word) else 'incorrect_spelling'
         
+        # Rare variant of a much more frequent word (frequency table only)
+        if self.has_frequent_neighbour(word):
+            return 'incorrect_spelling'
+        
         # Default: assume correct (conservative approach)
         # Most words not in dictionary are still valid Hindi words
         return 'correct_spelling'
     
-    def process_file(self, input_path, output_path):
+    def classify_batch(self, words):
+        """
+        Classify a whole column of words at once
+        
+        Same rules and labels as classify(), applied as pandas string
+        operations over the column instead of one Python call per word.
+        With pyarrow installed these run as Arrow compute kernels.
+        """
+        words = pd.Series(words).fillna('')
+        if pa is not None:
+            nfc = pc.utf8_normalize(pa.array(words, type=pa.string()), 'NFC')
+            normalized = pd.Series(pd.arrays.ArrowStringArray(nfc), index=words.index)
+        else:
+            normalized = words.astype(object).str.normalize('NFC')
+        normalized = normalized.str.replace(INVISIBLE, '', regex=True).str.strip()
+        lengths = normalized.str.len()
+        
+        non_punct = lengths - normalized.str.count(PUNCTUATION_CHARS)
+        numeric = normalized.str.replace(NUMERIC_CHARS, '', regex=True).str.len() < lengths * 0.3
+        dev_count = normalized.str.replace(NON_DEVANAGARI_CHARS, '', regex=True).str.len()
+        hindi = (non_punct > 0) & (dev_count > non_punct * 0.5)
+        
+        # Punctuation-only (including empty), numeric and non-Hindi words are
+        # never errors. A single character that passes as Hindi is always
+        # Devanagari, so only the structure check is left.
+        candidates = ((non_punct > 0) & ~numeric & hindi
+                      & ~normalized.isin(self.hindi_dict)).astype(bool)
+        if self.lexicon is not None and candidates.any():
+            known = self.lexicon.contains_batch(normalized[candidates])
+            candidates[candidates] = ~np.asarray(known, dtype=bool)
+        invalid = candidates & (
+            normalized.str.contains(BAD_SIGNS, regex=True)
+            | normalized.str.contains(COMMON_REPETITION, regex=True)
+        ).astype(bool)
+        rest = candidates & ~invalid & normalized.str.contains(UNCOMMON, regex=True).astype(bool)
+        invalid[rest] = normalized[rest].map(REPETITION.search).notna()
+        
+        # Only rare multi-character words need the neighbour search
+        if self.frequencies is not None:
+            rest = candidates & ~invalid & (lengths > 1).astype(bool)
+            counts = self.frequencies.frequency_batch(normalized[rest])
+            invalid[rest] = self.frequent_neighbours(normalized[rest], counts)
+        return invalid.map({False: 'correct_spelling', True: 'incorrect_spelling'}).astype(object)
+    
+    def process_file(self, input_path, output_path, vectorized=True):
         """Process CSV file and classify all words"""
         print(f"Reading words from: {input_path}")
         df = pd.read_csv(input_path, encoding='utf-8')
         
         print(f"Total unique words: {len(df)}")
         
-        # Classify each word
-        classifications = []
-        for idx, row in df.iterrows():
-            word = row['word']
-            classification = self.classify(word)
-            classifications.append(classification)
-            
-            if classification == 'correct_spelling':
-                self.stats['correct'] += 1
-            else:
-                self.stats['incorrect'] += 1
-            self.stats['total'] += 1
-            
-            if (idx + 1) % 10000 == 0:
-                print(f"Processed {idx + 1} words...")
+        start = time.perf_counter()
+        if vectorized:
+            classifications = self.classify_batch(df['word'])
+            counts = classifications.value_counts()
+            self.stats['correct'] += int(counts.get('correct_spelling', 0))
+            self.stats['incorrect'] += int(counts.get('incorrect_spelling', 0))
+            self.stats['total'] += len(classifications)
+        else:
+            # Classify each word
+            classifications = []
+            for idx, row in df.iterrows():
+                word = row['word']
+                classification = self.classify(word)
+                classifications.append(classification)
+                
+                if classification == 'correct_spelling':
+                    self.stats['correct'] += 1
+                else:
+                    self.stats['incorrect'] += 1
+                self.stats['total'] += 1
+                
+                if (idx + 1) % 10000 == 0:
+                    print(f"Processed {idx + 1} words...")
+        print(f"Classified in {time.perf_counter() - start:.2f}s")
         
         # Add classification column
         df['classification'] = classifications
@@ -207,6 +389,15 @@ class HindiSpellingClassifier:
         return df
 
 def main():
+    parser = argparse.ArgumentParser(description='Classify unique Hindi words by spelling')
+    parser.add_argument('--lexicon', type=str, default=None,
+                        help='Large lexicon: .lex file from lexicon.py build, or a word list')
+    parser.add_argument('--frequencies', type=str, default=None,
+                        help='Corpus count table from word_frequency.py')
+    parser.add_argument('--flag_unseen', action='store_true',
+                        help='Treat words missing from the count table as rare')
+    args = parser.parse_args()
+    
     # Setup paths
     base_dir = Path(__file__).parent.parent
     input_file = base_dir / 'dataset' / 'Unique Words Data - Sheet1.csv'
@@ -222,7 +413,8 @@ def main():
     print("="*60)
     
     # Create classifier and process
-    classifier = HindiSpellingClassifier()
+    classifier = HindiSpellingClassifier(lexicon=args.lexicon, frequencies=args.frequencies,
+                                         flag_unseen=args.flag_unseen)
     results = classifier.process_file(input_file, output_file)
     
     print("\n✓ Classification complete!")
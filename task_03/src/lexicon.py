@@ -0,0 +1,339 @@
+"""
+Pluggable Hindi lexicon backends
+
+- SetLexicon: an in-memory Python set (the inline core dictionary)
+- SortedLexicon: a sorted word array in a binary file, memory-mapped read-only.
+  Opening it only parses a 24-byte header, and the pages are shared through
+  the OS page cache by every classifier worker that maps the same file.
+
+Both support `word in lexicon`, len(), prefix queries and batch membership.
+A SortedLexicon file can also carry a count per word (a corpus frequency
+table, see word_frequency.py).
+
+File layout (native little-endian):
+    magic b'HLX1' | flags u32 | count u64 | end u64
+    offsets: (count + 1) x i64, absolute file positions of each word
+    data: UTF-8 words sorted by codepoint (= UTF-8 byte order), no separators
+    counts (flags & HAS_COUNTS): count x u32, starting at end rounded up to 8
+
+The offsets + data pair is an Arrow large_string array, so with pyarrow
+installed batch membership runs as one Arrow kernel over the mapped file.
+
+Usage:
+    python lexicon.py build words.txt hindi.lex
+    python lexicon.py lookup hindi.lex भारत भारात
+    python lexicon.py prefix hindi.lex भार
+"""
+
+import argparse
+import array
+import mmap
+import os
+import re
+import struct
+import sys
+import unicodedata
+from typing import Iterable, Iterator, List, Mapping, Optional
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # batch membership falls back to one lookup per word
+    pa = None
+
+MAGIC = b'HLX1'
+HEADER = struct.Struct('<4sIQQ')
+HAS_COUNTS = 1
+MAX_COUNT = 2 ** 32 - 1
+
+INVISIBLE = '[\u200b-\u200f\u202a-\u202e]'
+INVISIBLE_RE = re.compile(INVISIBLE)
+
+
+def normalize_word(word: str) -> str:
+    """NFC, zero-width/bidi character removal and strip (the key for lookups and counts)"""
+    word = unicodedata.normalize('NFC', word)
+    word = INVISIBLE_RE.sub('', word)
+    return word.strip()
+
+
+def _counts_start(end: int) -> int:
+    return (end + 7) // 8 * 8
+
+
+class Lexicon:
+    """Interface shared by lexicon backends"""
+
+    def __contains__(self, word: str) -> bool:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def prefix(self, prefix: str) -> Iterator[str]:
+        """Words starting with prefix, in sorted order"""
+        return iter(sorted(word for word in self if word.startswith(prefix)))
+
+    def contains_batch(self, words: Iterable[str]) -> List[bool]:
+        """Membership of many words at once"""
+        return [word in self for word in words]
+
+
+class SetLexicon(Lexicon):
+    """Lexicon held in a Python set"""
+
+    def __init__(self, words: Iterable[str]):
+        self.words = set(words)
+
+    def __contains__(self, word):
+        return word in self.words
+
+    def __len__(self):
+        return len(self.words)
+
+    def __iter__(self):
+        return iter(self.words)
+
+
+class SortedLexicon(Lexicon):
+    """Memory-mapped sorted word array with binary-search lookups"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, flags, count, end = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a lexicon file")
+        counts_end = _counts_start(end) + 4 * count if flags & HAS_COUNTS else end
+        if counts_end > len(self._mm):
+            raise ValueError(f"{path} is truncated")
+        self.count = count
+        self._offsets = memoryview(self._mm)[HEADER.size:HEADER.size + 8 * (count + 1)].cast('q')
+        self.counts: Optional[np.ndarray] = None
+        if flags & HAS_COUNTS:
+            self.counts = np.frombuffer(self._mm, dtype=np.uint32, count=count,
+                                        offset=_counts_start(end))
+        self._arrow = None
+
+    def _word_bytes(self, index: int) -> bytes:
+        return self._mm[self._offsets[index]:self._offsets[index + 1]]
+
+    def _bisect(self, key: bytes) -> int:
+        """Index of the first word >= key"""
+        lo, hi = 0, self.count
+        mm, offsets = self._mm, self._offsets
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if mm[offsets[mid]:offsets[mid + 1]] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def index(self, word: str) -> int:
+        """Position of word in the sorted array, or -1"""
+        key = word.encode('utf-8')
+        index = self._bisect(key)
+        return index if index < self.count and self._word_bytes(index) == key else -1
+
+    def __contains__(self, word):
+        return self.index(word) >= 0
+
+    def _require_counts(self) -> None:
+        if self.counts is None:
+            raise ValueError(f"{self.path} has no counts (build it with build_count_table)")
+
+    def frequency(self, word: str) -> int:
+        """
+        Stored count of word (0 if absent)
+
+        Raises:
+            ValueError: If the file was built without counts
+        """
+        self._require_counts()
+        index = self.index(word)
+        return int(self.counts[index]) if index >= 0 else 0
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index: int) -> str:
+        return self._word_bytes(index).decode('utf-8')
+
+    def __iter__(self):
+        return (self[index] for index in range(self.count))
+
+    def prefix(self, prefix):
+        key = prefix.encode('utf-8')
+        index = self._bisect(key)
+        while index < self.count:
+            word = self._word_bytes(index)
+            if not word.startswith(key):
+                break
+            yield word.decode('utf-8')
+            index += 1
+
+    def arrow(self):
+        """The word array as a zero-copy Arrow large_string array"""
+        if self._arrow is None:
+            offsets = pa.py_buffer(self._offsets)
+            data = pa.py_buffer(self._mm)
+            self._arrow = pa.Array.from_buffers(pa.large_string(), self.count, [None, offsets, data])
+        return self._arrow
+
+    def index_batch(self, words) -> np.ndarray:
+        """
+        Positions of many words at once (-1 where absent)
+
+        Large batches hash the queries (not the lexicon, so memory follows the
+        batch size) and stream the mapped word array past them once; small
+        batches use binary search.
+        """
+        words = list(words) if not hasattr(words, '__len__') else words
+        if pa is None or len(words) * 64 < self.count:
+            return np.array([self.index(word) for word in words], dtype=np.int64)
+        queries = pa.array(words, type=pa.large_string())
+        lexicon = self.arrow()
+        mask = pc.is_in(lexicon, value_set=queries)
+        positions = np.flatnonzero(mask.to_numpy(zero_copy_only=False))
+        found = pc.index_in(queries, value_set=lexicon.filter(mask))
+        found = found.fill_null(-1).to_numpy(zero_copy_only=False).astype(np.int64)
+        if not len(positions):
+            return found
+        return np.where(found >= 0, positions[np.maximum(found, 0)], -1)
+
+    def contains_batch(self, words):
+        return self.index_batch(words) >= 0
+
+    def frequency_batch(self, words) -> np.ndarray:
+        """Stored counts of many words (0 where absent); see frequency()"""
+        self._require_counts()
+        indices = self.index_batch(words)
+        frequencies = np.zeros(len(indices), dtype=np.uint32)
+        present = indices >= 0
+        frequencies[present] = self.counts[indices[present]]
+        return frequencies
+
+    def close(self) -> None:
+        """
+        Unmap the file. If an array from arrow() is still referenced elsewhere,
+        the mapping stays open until that array is garbage-collected.
+        """
+        # The Arrow array exports self._offsets and the map, so drop it first
+        self._arrow = None
+        self.counts = None
+        try:
+            self._offsets.release()
+            self._mm.close()
+        except BufferError:
+            pass
+
+
+def build_lexicon(words: Iterable[str], path: str) -> int:
+    """
+    Write a SortedLexicon file from any iterable of words
+
+    Words go through normalize_word, the same key queries use, and are
+    deduplicated. Returns the number of distinct words written.
+    """
+    unique = {normalize_word(word) for word in words}
+    unique.discard('')
+    _write_lexicon(sorted(unique), path)
+    return len(unique)
+
+
+def build_count_table(counts: Mapping[str, int], path: str) -> int:
+    """
+    Write a SortedLexicon file that also stores a count per word
+
+    Keys are written as given (normalize them while counting); counts above
+    2**32 - 1 are clamped. Returns the number of words written.
+    """
+    words = sorted(word for word in counts if word)
+    _write_lexicon(words, path, [min(counts[word], MAX_COUNT) for word in words])
+    return len(words)
+
+
+def _write_lexicon(words: List[str], path: str, counts: Optional[List[int]] = None) -> None:
+    encoded = [word.encode('utf-8') for word in words]
+    data_start = HEADER.size + 8 * (len(encoded) + 1)
+    offsets = [data_start]
+    for word in encoded:
+        offsets.append(offsets[-1] + len(word))
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, HAS_COUNTS if counts is not None else 0,
+                            len(encoded), offsets[-1]))
+        f.write(array.array('q', offsets).tobytes())
+        f.writelines(encoded)
+        if counts is not None:
+            f.write(b'\0' * (_counts_start(offsets[-1]) - offsets[-1]))
+            f.write(np.asarray(counts, dtype=np.uint32).tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_word_list(path: str) -> Iterator[str]:
+    """First whitespace-separated field of each line (word lists, 'word count' files)"""
+    with open(path, encoding='utf-8-sig') as f:
+        for line in f:
+            fields = line.split()
+            if fields:
+                yield fields[0]
+
+
+def load_lexicon(path: str) -> Lexicon:
+    """Open a .lex file as a SortedLexicon, or read a plain word list into a SetLexicon"""
+    with open(path, 'rb') as f:
+        is_binary = f.read(len(MAGIC)) == MAGIC
+    if is_binary:
+        return SortedLexicon(path)
+    return SetLexicon(normalize_word(word) for word in read_word_list(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build and query Hindi lexicon files')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help='Build a .lex file from word lists')
+    build.add_argument('inputs', nargs='+', help='Word list files (one word per line)')
+    build.add_argument('output', help='Output .lex path')
+
+    lookup = subparsers.add_parser('lookup', help='Check words against a lexicon')
+    lookup.add_argument('lexicon')
+    lookup.add_argument('words', nargs='+')
+
+    prefix = subparsers.add_parser('prefix', help='List words with a prefix')
+    prefix.add_argument('lexicon')
+    prefix.add_argument('prefix')
+    prefix.add_argument('--limit', type=int, default=20)
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        words = (word for path in args.inputs for word in read_word_list(path))
+        count = build_lexicon(words, args.output)
+        size = os.path.getsize(args.output)
+        print(f"Wrote {count:,} words to {args.output} ({size / 1e6:.1f} MB)")
+    elif args.command == 'lookup':
+        lexicon = load_lexicon(args.lexicon)
+        for word in args.words:
+            word = normalize_word(word)
+            print(f"{word}\t{'yes' if word in lexicon else 'no'}")
+    else:
+        lexicon = load_lexicon(args.lexicon)
+        for index, word in enumerate(lexicon.prefix(normalize_word(args.prefix))):
+            if index >= args.limit:
+                break
+            print(word)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""
+Spelling suggestions for flagged words (SymSpell-style symmetric delete)
+
+Every lexicon word is split into aksaras, so a matra, nukta or halant cluster
+counts as one unit, and all variants with up to `max_distance` aksaras
+deleted from its prefix are hashed into one sorted array. A query generates
+its own deletes, finds candidate words with one vectorized searchsorted, and
+ranks them by aksara edit distance. No scan over the lexicon is needed.
+
+Usage:
+    python suggest.py --input ../output/Final_Hindi_Words_Classification.csv
+    python suggest.py --lexicon hindi.lex --words केे हिंदि
+"""
+
+import argparse
+import sys
+import time
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+if __name__ == '__main__':
+    # Shared Hindi text code lives in task_04/src (see task_04/README.md)
+    sys.path.append(str(Path(__file__).resolve().parents[2] / 'task_04' / 'src'))
+
+from tokenization import aksaras
+
+try:
+    import editdistance
+except ImportError:  # unit_distance falls back to a Python DP
+    editdistance = None
+
+
+# Two-sign spellings that render like a single vowel sign (ताे looks like तो)
+VISUAL_FOLDS = (('ाे', 'ो'), ('ाै', 'ौ'))
+
+
+def _deletes(units: Tuple[str, ...], max_distance: int) -> set:
+    """The unit sequence with 0..max_distance units removed"""
+    variants = {units}
+    for removed in range(1, min(max_distance, len(units)) + 1):
+        variants.update(combinations(units, len(units) - removed))
+    return variants
+
+
+def distance_limit(units: Sequence[str], max_distance: int) -> int:
+    """Edit budget for a word: one edit for words of up to three aksaras"""
+    return min(max_distance, 1 if len(units) <= 3 else max_distance)
+
+
+def unit_distance(a: Sequence[str], b: Sequence[str], limit: int) -> int:
+    """Levenshtein distance between unit sequences, or limit + 1 once it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if editdistance is not None:
+        return min(editdistance.eval(a, b), limit + 1)
+    previous = list(range(len(b) + 1))
+    for i, unit in enumerate(a, 1):
+        current = [i]
+        for j, other in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (unit != other)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class SuggestionIndex:
+    """
+    Symmetric-delete index over a word list
+
+    Args:
+        words: Valid spellings (a list or a lexicon.SortedLexicon)
+        max_distance: Largest aksara edit distance to suggest
+        prefix_length: Only the first prefix_length aksaras are indexed,
+            which bounds the index size for long words (SymSpell's trick)
+        counts: Optional corpus frequency of each word, used to rank ties
+    """
+
+    def __init__(self, words: Sequence[str], max_distance: int = 2, prefix_length: int = 6,
+                 counts: Sequence[int] = None):
+        self.words = words
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.counts = np.zeros(len(words), dtype=np.int64) if counts is None \
+            else np.asarray(counts, dtype=np.int64)
+
+        # Tuple hashes are only stable within a process, which is all an
+        # in-memory index needs
+        keys: List[int] = []
+        ids: List[int] = []
+        lengths = np.zeros(len(words), dtype=np.int16)
+        for word_id, word in enumerate(words):
+            units = aksaras(word)
+            lengths[word_id] = len(units)
+            variants = _deletes(units[:prefix_length], distance_limit(units, max_distance))
+            keys.extend(map(hash, variants))
+            ids.extend([word_id] * len(variants))
+        keys = np.array(keys, dtype=np.int64)
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.ids = np.array(ids, dtype=np.int32)[order]
+        self.lengths = lengths
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def candidate_pairs(self, words: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Candidates of many words at once as (query position, word ID) arrays
+
+        The delete variants of every query go through one searchsorted, and
+        each (query, word) pair appears once, sorted by query position.
+        """
+        hashes: List[int] = []
+        variant_counts = np.zeros(len(words), dtype=np.int64)
+        for position, word in enumerate(words):
+            units = aksaras(word)
+            variants = _deletes(units[:self.prefix_length], distance_limit(units, self.max_distance))
+            hashes.extend(map(hash, variants))
+            variant_counts[position] = len(variants)
+        hashes = np.array(hashes, dtype=np.int64)
+        starts = np.searchsorted(self.keys, hashes, side='left')
+        sizes = np.searchsorted(self.keys, hashes, side='right') - starts
+
+        # Expand every [start, start + size) run of the sorted keys in one go
+        queries = np.repeat(np.repeat(np.arange(len(words)), variant_counts), sizes)
+        slots = np.arange(sizes.sum()) + np.repeat(starts - (np.cumsum(sizes) - sizes), sizes)
+        pairs = np.unique(queries * len(self.words) + self.ids[slots])
+        return pairs // len(self.words), (pairs % len(self.words)).astype(np.int32)
+
+    def candidates(self, word: str) -> np.ndarray:
+        """IDs of indexed words sharing a delete variant with word"""
+        return self.candidate_pairs([word])[1]
+
+    def neighbours(self, word: str, max_distance: int = None) -> List[Tuple[int, int]]:
+        """(word ID, aksara distance) of every indexed word within the edit budget"""
+        units = aksaras(word)
+        limit = distance_limit(units, self.max_distance if max_distance is None
+                               else min(max_distance, self.max_distance))
+        candidates = self.candidates(word)
+        candidates = candidates[np.abs(self.lengths[candidates] - len(units)) <= limit]
+        found = []
+        for word_id in candidates:
+            candidate = self.words[word_id]
+            if candidate == word:
+                continue
+            distance = unit_distance(units, aksaras(candidate), limit)
+            if distance <= limit:
+                found.append((int(word_id), distance))
+        return found
+
+    def lookup(self, word: str, top_k: int = 5,
+               max_distance: int = None) -> List[Tuple[str, int]]:
+        """
+        Nearest valid spellings of word
+
+        Returns:
+            Up to top_k (suggestion, aksara distance) pairs, closest first;
+            ties go to the smaller character edit distance (a wrong matra
+            beats a wrong consonant, VISUAL_FOLDS applied), then the more
+            frequent word, then alphabetical order
+        """
+        folded = word
+        for signs, sign in VISUAL_FOLDS:
+            folded = folded.replace(signs, sign)
+        scored = []
+        for word_id, distance in self.neighbours(word, max_distance):
+            candidate = self.words[word_id]
+            char_distance = unit_distance(folded, candidate, len(folded) + len(candidate))
+            scored.append((distance, char_distance, -self.counts[word_id], candidate))
+        scored.sort()
+        return [(candidate, distance) for distance, _, _, candidate in scored[:top_k]]
+
+    def lookup_batch(self, words: Iterable[str], top_k: int = 5) -> Dict[str, List[Tuple[str, int]]]:
+        """Suggestions for many words, each distinct word looked up once"""
+        return {word: self.lookup(word, top_k) for word in dict.fromkeys(words)}
+
+
+def annotate(df: pd.DataFrame, index: SuggestionIndex, top_k: int = 3,
+             flag: str = 'incorrect_spelling', normalize=None) -> pd.DataFrame:
+    """
+    Add suggestion columns to a classification table
+
+    Rows whose classification is `flag` get `suggestion` (best fix) and
+    `suggestions` ('|'-joined top_k); other rows are left empty. Words are
+    passed through normalize (e.g. HindiSpellingClassifier.normalize) first.
+    """
+    df = df.copy()
+    flagged = df['classification'] == flag
+    words = df.loc[flagged, 'word'].astype(str)
+    if normalize is not None:
+        words = words.map(normalize)
+    found = index.lookup_batch(words, top_k)
+    suggestions = words.map(lambda word: found[word])
+    df['suggestion'] = ''
+    df['suggestions'] = ''
+    df.loc[flagged, 'suggestion'] = suggestions.map(lambda pairs: pairs[0][0] if pairs else '')
+    df.loc[flagged, 'suggestions'] = suggestions.map(lambda pairs: '|'.join(word for word, _ in pairs))
+    return df
+
+
+def main():
+    from classify_words import HindiSpellingClassifier
+
+    base_dir = Path(__file__).parent.parent
+    parser = argparse.ArgumentParser(description='Suggest corrections for flagged Hindi words')
+    parser.add_argument('--input', type=str,
+                        default=str(base_dir / 'output' / 'Final_Hindi_Words_Classification.csv'),
+                        help='Classification CSV (word, classification)')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Annotated CSV (default: <input>_suggestions.csv)')
+    parser.add_argument('--lexicon', type=str, default=None,
+                        help='Large lexicon (.lex file or word list)')
+    parser.add_argument('--frequencies', type=str, default=None,
+                        help='Corpus count table from word_frequency.py (ranks ties, adds frequent words)')
+    parser.add_argument('--words', nargs='+', default=None,
+                        help='Look up these words instead of annotating a CSV')
+    parser.add_argument('--top_k', type=int, default=3)
+    parser.add_argument('--max_distance', type=int, default=2)
+    args = parser.parse_args()
+
+    classifier = HindiSpellingClassifier(lexicon=args.lexicon, frequencies=args.frequencies)
+    start = time.perf_counter()
+    index = classifier.suggestion_index(max_distance=args.max_distance)
+    print(f"Indexed {len(index.words):,} words ({len(index):,} deletes) in {time.perf_counter() - start:.1f}s")
+
+    if args.words:
+        for word in args.words:
+            word = classifier.normalize(word)
+            pairs = index.lookup(word, args.top_k)
+            print(f"{word}\t" + ', '.join(f"{fix} ({distance})" for fix, distance in pairs))
+        return
+
+    df = pd.read_csv(args.input, encoding='utf-8-sig')
+    start = time.perf_counter()
+    annotated = annotate(df, index, args.top_k, normalize=classifier.normalize)
+    flagged = (df['classification'] == 'incorrect_spelling').sum()
+    with_fix = (annotated['suggestion'] != '').sum()
+    print(f"Suggested fixes for {with_fix:,} of {flagged:,} flagged words "
+          f"in {time.perf_counter() - start:.2f}s")
+
+    output = args.output or str(Path(args.input).with_name(Path(args.input).stem + '_suggestions.csv'))
+    annotated.to_csv(output, index=False, encoding='utf-8-sig')
+    print(f"Results saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,129 +1,91 @@
 """
-Test script for Hindi spelling classifier
-Tests classification logic with sample words
+Tests for the Hindi spelling classifier
+
+Run from this directory: python -m pytest -q
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
-from hindi_spelling_checker import HindiSpellingChecker
-
-def test_classifier():
-    """Test classification with sample words"""
-    
-    print("=" * 60)
-    print("Hindi Spelling Classifier - Test")
-    print("=" * 60)
-    
-    # Initialize checker (without dataset)
-    checker = HindiSpellingChecker(
-        dataset_path='',
-        output_dir=''
-    )
-    
-    # Load dictionary
-    checker.valid_hindi_words = checker.load_hindi_dictionary()
-    print(f"\nLoaded {len(checker.valid_hindi_words)} dictionary words")
-    
-    # Test samples
-    test_words = [
-        # Correct words (in dictionary)
-        ('मैं', 10, 'correct - pronoun'),
-        ('है', 50, 'correct - verb'),
-        ('और', 30, 'correct - conjunction'),
-        ('अच्छा', 15, 'correct - adjective'),
-        ('हम्म', 8, 'correct - filler'),
-        
-        # Correct words (not in dictionary but valid)
-        ('भारत', 5, 'correct - proper noun'),
-        ('कंप्यूटर', 3, 'correct - English transliteration'),
-        ('विश्वविद्यालय', 2, 'correct - compound word'),
-        
-        # Incorrect words
-        ('अअअअ', 1, 'incorrect - repetition'),
-        ('क्््त', 1, 'incorrect - multiple virama'),
-        ('्अब', 1, 'incorrect - virama at start'),
-        ('ािी', 1, 'incorrect - consecutive vowel signs'),
-        
-        # Numbers
-        ('123', 5, 'number'),
-        ('१२३', 3, 'number - Devanagari'),
-        
-        # English
-        ('OK', 10, 'english'),
-        ('yes', 5, 'english'),
-        
-        # Punctuation
-        ('।', 20, 'punctuation'),
-        ('...', 5, 'punctuation'),
-    ]
-    
-    print("\n" + "=" * 60)
-    print("Testing Classification")
-    print("=" * 60)
-    
-    correct_count = 0
-    total_count = len(test_words)
-    
-    for word, frequency, expected in test_words:
-        classification, reason, confidence = checker.classify_word(word, frequency, set())
-        
-        # Check if classification matches expectation
-        expected_class = expected.split(' - ')[0]
-        is_correct = expected_class in classification or classification in expected_class
-        
-        status = "✓" if is_correct else "✗"
-        if is_correct:
-            correct_count += 1
-        
-        print(f"\n{status} Word: '{word}'")
-        print(f"  Frequency: {frequency}")
-        print(f"  Expected: {expected}")
-        print(f"  Classification: {classification}")
-        print(f"  Reason: {reason}")
-        print(f"  Confidence: {confidence:.2f}")
-    
-    print("\n" + "=" * 60)
-    print(f"Test Results: {correct_count}/{total_count} correct ({correct_count/total_count*100:.1f}%)")
-    print("=" * 60)
-    
-    # Test character analysis
-    print("\n" + "=" * 60)
-    print("Testing Character Analysis")
-    print("=" * 60)
-    
-    test_chars = [
-        ('क', True, 'Devanagari consonant'),
-        ('अ', True, 'Devanagari vowel'),
-        ('a', False, 'Latin letter'),
-        ('1', False, 'Digit'),
-        ('।', False, 'Punctuation'),
-    ]
-    
-    for char, expected, description in test_chars:
-        result = checker.is_devanagari(char)
-        status = "✓" if result == expected else "✗"
-        print(f"{status} '{char}' ({description}): {result} (expected: {expected})")
-    
-    # Test word validation
-    print("\n" + "=" * 60)
-    print("Testing Word Validation")
-    print("=" * 60)
-    
-    test_validation = [
-        ('मैं', True, 'Pure Hindi'),
-        ('कंप्यूटर', True, 'Hindi with conjuncts'),
-        ('OK', False, 'Pure English'),
-        ('मैंOK', False, 'Mixed script'),
-    ]
-    
-    for word, expected, description in test_validation:
-        result = checker.is_hindi_word(word)
-        status = "✓" if result == expected else "✗"
-        print(f"{status} '{word}' ({description}): {result} (expected: {expected})")
-    
-    print("\n✓ All tests completed!")
-
-if __name__ == "__main__":
-    test_classifier()
+import random
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from classify_words import HindiSpellingClassifier
+from lexicon import build_lexicon
+
+DATASET = Path(__file__).parent.parent / 'dataset' / 'Unique Words Data - Sheet1.csv'
+
+SAMPLES = [
+    # Correct words (in dictionary)
+    ('मैं', 'correct_spelling'),
+    ('है', 'correct_spelling'),
+    ('और', 'correct_spelling'),
+    ('अच्छा', 'correct_spelling'),
+    ('हम्म', 'correct_spelling'),
+    # Correct words (not in dictionary but valid)
+    ('भारत', 'correct_spelling'),
+    ('कंप्यूटर', 'correct_spelling'),
+    ('विश्वविद्यालय', 'correct_spelling'),
+    # Incorrect words
+    ('अअअअ', 'incorrect_spelling'),          # repetition
+    ('क्््त', 'incorrect_spelling'),          # multiple virama
+    ('्अब', 'incorrect_spelling'),           # virama at start
+    ('ािी', 'incorrect_spelling'),           # consecutive vowel signs
+    # Numbers, English and punctuation are never spelling errors
+    ('123', 'correct_spelling'),
+    ('१२३', 'correct_spelling'),
+    ('OK', 'correct_spelling'),
+    ('yes', 'correct_spelling'),
+    ('।', 'correct_spelling'),
+    ('...', 'correct_spelling'),
+]
+
+# Words that exercise every rule, including invisible characters, non-NFC
+# input, empty strings and repetition outside ASCII/Devanagari
+EDGE_CASES = ['', ' ', '​भारत‌', 'क़िताब', 'क़िताब', 'ककककक', 'ααααα',
+              'हिंदीOK', '12,000', '१२.५', '॥', 'ँ', 'ा', 'ह्', 'क्क्', 'ाे', 'नहीं!!!!']
+
+
+@pytest.fixture(scope='module')
+def classifier():
+    return HindiSpellingClassifier()
+
+
+@pytest.mark.parametrize('word, expected', SAMPLES)
+def test_classify(classifier, word, expected):
+    assert classifier.classify(word) == expected
+
+
+@pytest.mark.parametrize('char, expected', [('क', True), ('अ', True), ('।', True),
+                                            ('a', False), ('1', False), ('', False)])
+def test_is_devanagari_char(classifier, char, expected):
+    assert classifier.is_devanagari_char(char) == expected
+
+
+@pytest.mark.parametrize('word, expected', [('मैं', True), ('कंप्यूटर', True), ('OK', False),
+                                            ('मैंOK', True), ('helloमैं', False)])
+def test_is_hindi_word(classifier, word, expected):
+    assert classifier.is_hindi_word(word) == expected
+
+
+def test_batch_matches_scalar_on_samples(classifier):
+    words = [word for word, _ in SAMPLES] + EDGE_CASES
+    assert classifier.classify_batch(words).tolist() == [classifier.classify(word) for word in words]
+
+
+@pytest.mark.skipif(not DATASET.exists(), reason='word sheet not available')
+def test_batch_matches_scalar_on_sheet(classifier):
+    words = pd.read_csv(DATASET, encoding='utf-8')['word'].fillna('').astype(str).tolist()
+    words = random.Random(0).sample(words, 20000)
+    assert classifier.classify_batch(words).tolist() == [classifier.classify(word) for word in words]
+
+
+def test_batch_matches_scalar_with_lexicon(tmp_path):
+    path = str(tmp_path / 'words.lex')
+    build_lexicon(['ककककक', 'अअअअ', 'भारात'], path)
+    classifier = HindiSpellingClassifier(lexicon=path)
+    words = ['ककककक', 'अअअअ', 'भारात', 'भारत', 'क्््त'] * 50
+    labels = classifier.classify_batch(words).tolist()
+    assert labels == [classifier.classify(word) for word in words]
+    assert labels[:5] == ['correct_spelling', 'correct_spelling', 'correct_spelling',
+                          'correct_spelling', 'incorrect_spelling']
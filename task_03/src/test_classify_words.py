@@ -0,0 +1,42 @@
+"""
+Tests for HindiSpellingClassifier
+
+Run from this directory: python -m pytest -q
+"""
+
+import pytest
+
+from classify_words import HindiSpellingClassifier
+from lexicon import build_count_table
+
+
+@pytest.fixture
+def count_table(tmp_path):
+    path = str(tmp_path / 'counts.lex')
+    build_count_table({'बातचीत': 500, 'बातचात': 2, 'बतचीत': 4,
+                       'किताबें': 1, 'कमरा': 1}, path)
+    return path
+
+
+def test_rare_variant_of_frequent_word_is_flagged(count_table):
+    classifier = HindiSpellingClassifier(frequencies=count_table)
+    assert classifier.has_frequent_neighbour('बातचात')
+    assert not classifier.has_frequent_neighbour('बतचीत')    # seen 4 times, not rare
+    assert not classifier.has_frequent_neighbour('किताबें')   # no frequent neighbour
+    assert not classifier.has_frequent_neighbour('बातचीत')    # the frequent word itself
+
+
+def test_unseen_words_are_not_rare_by_default(count_table):
+    assert not HindiSpellingClassifier(frequencies=count_table).has_frequent_neighbour('बातचीट')
+    assert HindiSpellingClassifier(frequencies=count_table,
+                                   flag_unseen=True).has_frequent_neighbour('बातचीट')
+
+
+@pytest.mark.parametrize('flag_unseen', [False, True])
+def test_batch_frequency_rule_matches_scalar(count_table, flag_unseen):
+    classifier = HindiSpellingClassifier(frequencies=count_table, flag_unseen=flag_unseen)
+    words = ['बातचीत', 'बातचात', 'बतचीत', 'बातचीट', 'किताबें', 'कमरा', 'बातचीतें', 'क', '']
+    batch = classifier.classify_batch(words).tolist()
+    assert batch == [classifier.classify(word) for word in words]
+    assert batch[1] == 'incorrect_spelling'
+    assert batch[3] == ('incorrect_spelling' if flag_unseen else 'correct_spelling')
@@ -0,0 +1,92 @@
+"""
+Tests for the lexicon backends
+
+Run from this directory: python -m pytest -q
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from lexicon import (
+    SetLexicon, SortedLexicon, build_count_table, build_lexicon, load_lexicon, normalize_word,
+)
+
+WORDS = ['भारत', 'भारतीय', 'भार', 'हिंदी', 'हिन्दी', 'का', 'की', 'के', 'apple', 'ा']
+
+
+@pytest.fixture
+def lexicon(tmp_path):
+    path = str(tmp_path / 'words.lex')
+    build_lexicon(WORDS + ['  भारत ', ''], path)
+    lexicon = SortedLexicon(path)
+    yield lexicon
+    lexicon.close()
+
+
+def test_round_trip(lexicon):
+    assert len(lexicon) == len(WORDS)
+    assert list(lexicon) == sorted(WORDS)
+    assert all(word in lexicon for word in WORDS)
+    assert 'भारात' not in lexicon and '' not in lexicon
+    assert [lexicon[lexicon.index(word)] for word in WORDS] == WORDS
+
+
+def test_build_normalizes_like_queries(tmp_path):
+    path = str(tmp_path / 'words.lex')
+    assert build_lexicon(['हि\u200dंदी', '\u200bभारत', 'भारत'], path) == 2
+    lexicon = SortedLexicon(path)
+    assert normalize_word('हिंदी\u200c') in lexicon
+    assert list(lexicon) == ['भारत', 'हिंदी']
+    lexicon.close()
+
+
+def test_prefix_matches_set_backend(lexicon):
+    reference = SetLexicon(WORDS)
+    for prefix in ['भार', 'हि', 'क', 'z', '']:
+        assert list(lexicon.prefix(prefix)) == list(reference.prefix(prefix))
+
+
+def test_batch_lookup_matches_scalar(lexicon):
+    rng = random.Random(0)
+    queries = [rng.choice(WORDS + ['भारात', 'x', '']) for _ in range(5000)]
+    expected = np.array([lexicon.index(word) for word in queries])
+    assert np.array_equal(lexicon.index_batch(queries), expected)
+    assert np.array_equal(lexicon.contains_batch(queries), expected >= 0)
+
+
+def test_close_after_batch_lookup(lexicon):
+    lexicon.contains_batch(['भारत'] * 10000)
+    lexicon.close()
+    assert lexicon._mm.closed
+
+
+def test_close_while_arrow_array_is_alive(lexicon):
+    array = lexicon.arrow()
+    lexicon.close()
+    assert array.to_pylist() == sorted(WORDS)
+
+
+def test_frequency_needs_counts(lexicon):
+    with pytest.raises(ValueError):
+        lexicon.frequency('भारत')
+    with pytest.raises(ValueError):
+        lexicon.frequency_batch(['भारत'])
+
+
+def test_count_table_frequencies(tmp_path):
+    path = str(tmp_path / 'counts.lex')
+    build_count_table({'का': 7, 'की': 3}, path)
+    table = load_lexicon(path)
+    assert table.frequency('का') == 7 and table.frequency('के') == 0
+    assert table.frequency_batch(['की', 'के', 'का']).tolist() == [3, 0, 7]
+    table.close()
+
+
+def test_plain_word_list_loads_as_set(tmp_path):
+    path = tmp_path / 'words.txt'
+    path.write_text('भारत 12\nहिंदी\n\n', encoding='utf-8')
+    lexicon = load_lexicon(str(path))
+    assert isinstance(lexicon, SetLexicon)
+    assert 'भारत' in lexicon and len(lexicon) == 2
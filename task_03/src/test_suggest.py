@@ -0,0 +1,58 @@
+"""
+Tests for the symmetric-delete suggestion index
+
+Run from this directory: python -m pytest -q
+"""
+
+import random
+
+import numpy as np
+
+from suggest import SuggestionIndex, distance_limit, unit_distance
+from tokenization import aksaras
+
+SYLLABLES = ['क', 'का', 'कि', 'की', 'के', 'को', 'र', 'रा', 'री', 'म', 'मे', 'न', 'नं',
+             'स', 'स्त', 'त्र', 'द', 'दि', 'ह', 'है', 'ड़', 'ज़']
+
+
+def _vocabulary(seed, size):
+    rng = random.Random(seed)
+    words = {''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 9))) for _ in range(size)}
+    return sorted(words)
+
+
+def test_matra_errors_are_one_aksara_edit():
+    assert aksaras('स्त्री') == ('स्त्री',)
+    assert unit_distance(aksaras('केे'), aksaras('के'), 2) == 1
+    assert unit_distance(aksaras('हिंदि'), aksaras('हिंदी'), 2) == 1
+    assert unit_distance(aksaras('स्त्रि'), aksaras('स्त्री'), 2) == 1
+    assert unit_distance(aksaras('भारात'), aksaras('भारत'), 2) == 1
+
+
+def test_neighbours_are_complete():
+    words = _vocabulary(0, 2000)
+    index = SuggestionIndex(words, max_distance=2, prefix_length=4)
+    units = [aksaras(word) for word in words]
+    rng = random.Random(1)
+    queries = rng.sample(words, 100) + _vocabulary(2, 100)
+    for query in queries:
+        query_units = aksaras(query)
+        limit = distance_limit(query_units, 2)
+        expected = {word_id for word_id, other in enumerate(units)
+                    if words[word_id] != query and unit_distance(query_units, other, limit) <= limit}
+        assert {word_id for word_id, _ in index.neighbours(query)} == expected, query
+
+
+def test_candidate_pairs_match_single_lookups():
+    words = _vocabulary(3, 500)
+    index = SuggestionIndex(words, max_distance=1)
+    queries = _vocabulary(4, 50) + ['']
+    positions, ids = index.candidate_pairs(queries)
+    for position, query in enumerate(queries):
+        assert np.array_equal(ids[positions == position], index.candidates(query))
+
+
+def test_lookup_ranks_matra_fixes_first():
+    index = SuggestionIndex(['के', 'का', 'की', 'दें', 'तो', 'को'], counts=[90, 80, 70, 5, 50, 60])
+    assert index.lookup('केे', top_k=1) == [('के', 1)]
+    assert index.lookup('ताे', top_k=1) == [('तो', 1)]
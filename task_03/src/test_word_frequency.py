@@ -0,0 +1,55 @@
+"""
+Tests for corpus word counting
+
+Run from this directory: python -m pytest -q
+"""
+
+import json
+
+from lexicon import SortedLexicon, build_count_table
+from word_frequency import count_corpus, count_files
+
+
+def _write(path, text):
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_invalid_records_are_skipped_not_fatal(tmp_path):
+    jsonl = _write(tmp_path / 'a.jsonl',
+                   '{"text": "नमस्ते दुनिया"}\n[1, 2]\n{"text": null}\n"x"\n\n{"text": "दुनिया"}\n')
+    segments = _write(tmp_path / 'b.json', json.dumps([{'text': 'नमस्ते'}, {'text': 5}, 3]))
+    counts, valid, invalid, skipped = count_files([jsonl, segments])
+    assert counts == {'नमस्ते': 2, 'दुनिया': 2}
+    assert (valid, invalid, skipped) == (3, 5, 0)
+
+
+def test_non_transcription_files_are_skipped(tmp_path):
+    _write(tmp_path / 'error.json', '<html>Access denied</html>')
+    _write(tmp_path / 'object.json', '{"error": "not found"}')
+    _write(tmp_path / 'ok.json', json.dumps({'segments': [{'text': 'भारत भारत'}]}))
+    counts, stats = count_corpus([str(tmp_path)], workers=1)
+    assert counts == {'भारत': 2}
+    assert stats['files'] == 3 and stats['skipped'] == 2 and stats['tokens'] == 2
+
+
+def test_parallel_count_matches_serial(tmp_path):
+    for i in range(6):
+        _write(tmp_path / f'{i}.jsonl', ''.join(
+            json.dumps({'text': 'मैं ' * i + 'घर जा रहा हूँ'}) + '\n' for _ in range(i + 1)))
+    _write(tmp_path / 'bad.jsonl', '[1, 2]\n{"text": null}\n')
+    serial = count_corpus([str(tmp_path)], workers=1)
+    parallel = count_corpus([str(tmp_path)], workers=2, files_per_task=2)
+    assert serial == parallel
+    assert serial[1]['invalid'] == 2
+
+
+def test_count_table_round_trip_clamps_counts(tmp_path):
+    path = str(tmp_path / 'counts.lex')
+    build_count_table({'का': 2 ** 40, 'घर': 3, '': 7}, path)
+    table = SortedLexicon(path)
+    assert list(table) == ['का', 'घर']
+    assert table.frequency('का') == 2 ** 32 - 1
+    assert table.frequency('घर') == 3
+    assert table.frequency('नहीं') == 0
+    table.close()
@@ -0,0 +1,186 @@
+"""
+Streaming corpus word frequencies
+
+Scans transcription JSON files (lists of {"start", "end", "text"} segments, as
+downloaded by task_01/processing/preprocess.py) and JSONL files (one segment
+per line) in parallel. It counts normalized words and writes a compact count
+table: a lexicon.SortedLexicon file with a uint32 count per word.
+
+Files are read one at a time in the workers and JSONL is streamed line by
+line, so memory follows the vocabulary, not the corpus. Files that are not
+valid transcriptions (e.g. failed-download error pages) are skipped and
+reported.
+
+Usage:
+    python word_frequency.py                          # task_01 transcriptions
+    python word_frequency.py /data/corpus --workers 16 --output counts.lex
+    python word_frequency.py --top 20 --output counts.lex
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from lexicon import SortedLexicon, build_count_table, normalize_word
+
+BASE_DIR = Path(__file__).parent.parent
+TASK_01 = BASE_DIR.parent / 'task_01'
+DEFAULT_INPUTS = [TASK_01 / 'processing' / 'transcriptions', TASK_01 / 'dataset']
+DEFAULT_OUTPUT = BASE_DIR / 'output' / 'word_counts.lex'
+EXTENSIONS = ('.json', '.jsonl')
+
+
+def iter_corpus_files(inputs: Iterable[str]) -> Iterator[str]:
+    """JSON/JSONL files under each input directory (recursively), or the inputs themselves"""
+    for path in inputs:
+        path = str(path)
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.endswith(EXTENSIONS):
+                        yield os.path.join(root, name)
+        elif os.path.exists(path):
+            yield path
+
+
+def _segment_text(record) -> Optional[str]:
+    """Text of a segment record, or None if the record is not a segment"""
+    if not isinstance(record, dict):
+        return None
+    text = record.get('text', '')
+    return text if isinstance(text, str) else None
+
+
+def iter_segments(path: str) -> Iterator[Optional[str]]:
+    """
+    Segment texts of one transcription file (None for records that are not
+    segments, e.g. a JSONL line holding a list or a segment with "text": null)
+
+    Raises:
+        ValueError: If the file is not a transcription (not JSON, or no
+            segment list)
+    """
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield _segment_text(json.loads(line))
+            return
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get('segments')
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: no segment list")
+    for segment in data:
+        yield _segment_text(segment)
+
+
+def count_files(paths: List[str]) -> Tuple[Counter, int, int, int]:
+    """
+    Count normalized words in a batch of files
+
+    Returns:
+        (counts, segments, invalid segments, skipped files)
+    """
+    raw = Counter()
+    segments = invalid = skipped = 0
+    for path in paths:
+        try:
+            for text in iter_segments(path):
+                if text is None:
+                    invalid += 1
+                    continue
+                raw.update(text.split())
+                segments += 1
+        except (ValueError, UnicodeDecodeError):  # JSONDecodeError is a ValueError
+            skipped += 1
+
+    # Normalize each distinct token once, merging spellings that normalize alike
+    counts = Counter()
+    for token, count in raw.items():
+        word = normalize_word(token)
+        if word:
+            counts[word] += count
+    return counts, segments, invalid, skipped
+
+
+def count_corpus(inputs: Iterable[str], workers: int = 4,
+                 files_per_task: int = 64) -> Tuple[Counter, Dict[str, int]]:
+    """
+    Count words over every transcription file under inputs
+
+    Args:
+        inputs: Directories and/or files
+        workers: Worker processes (1 = count in this process)
+        files_per_task: Files counted per worker task before merging
+
+    Returns:
+        (counts, stats with files, segments, invalid segments, skipped
+         files and tokens)
+    """
+    paths = list(iter_corpus_files(inputs))
+    chunks = [paths[i:i + files_per_task] for i in range(0, len(paths), files_per_task)]
+
+    counts = Counter()
+    stats = {'files': len(paths), 'segments': 0, 'invalid': 0, 'skipped': 0}
+
+    def merge(results):
+        for chunk_counts, segments, invalid, skipped in results:
+            counts.update(chunk_counts)
+            stats['segments'] += segments
+            stats['invalid'] += invalid
+            stats['skipped'] += skipped
+
+    if workers > 1 and len(chunks) > 1:
+        with Pool(workers) as pool:
+            merge(pool.imap_unordered(count_files, chunks))
+    else:
+        merge(map(count_files, chunks))
+    stats['tokens'] = sum(counts.values())
+    return counts, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Count word frequencies over transcription files')
+    parser.add_argument('inputs', nargs='*', default=[str(path) for path in DEFAULT_INPUTS],
+                        help='Corpus directories or files (default: task_01 transcriptions)')
+    parser.add_argument('--output', type=str, default=str(DEFAULT_OUTPUT),
+                        help='Count table to write (.lex)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--files_per_task', type=int, default=64)
+    parser.add_argument('--top', type=int, default=0,
+                        help='Print the most frequent words of an existing table and exit')
+    args = parser.parse_args()
+
+    if args.top:
+        table = SortedLexicon(args.output)
+        order = table.counts.argsort()[::-1][:args.top]
+        for index in order:
+            print(f"{table[int(index)]}\t{int(table.counts[index])}")
+        return
+
+    print("=" * 60)
+    print("Word Frequency Count")
+    print("=" * 60)
+    start = time.perf_counter()
+    counts, stats = count_corpus(args.inputs, args.workers, args.files_per_task)
+    elapsed = time.perf_counter() - start
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    words = build_count_table(counts, args.output)
+    print(f"Files: {stats['files']:,} ({stats['skipped']:,} skipped, not transcriptions)")
+    print(f"Segments: {stats['segments']:,} ({stats['invalid']:,} invalid records skipped)")
+    print(f"Tokens: {stats['tokens']:,}")
+    print(f"Distinct words: {words:,}")
+    print(f"Counted in {elapsed:.2f}s")
+    print(f"Count table: {args.output} ({os.path.getsize(args.output) / 1e3:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
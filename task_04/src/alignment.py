@@ -0,0 +1,492 @@
+"""
+Array-backed alignment engine for lattice WER
+Interns tokens to integer IDs once and fills the edit-distance DP row by row
+with NumPy, keeping only two int32 cost rows plus a uint8 operation matrix
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Operation codes stored in the packed operation matrix
+MATCH, SUBSTITUTE, DELETE, INSERT = 0, 1, 2, 3
+OP_NAMES = ('match', 'substitute', 'delete', 'insert')
+
+
+class TokenInterner:
+    """
+    Maps tokens to dense integer IDs
+    Comparison is case-insensitive, so each distinct token is lower-cased once
+    and its surface form is cached, letting already-seen tokens be looked up
+    with one dict access each
+    """
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.tokens: List[str] = []
+        self.surface_ids: Dict[str, int] = {}
+
+    def intern(self, tokens: Sequence[str]) -> np.ndarray:
+        """Convert a token sequence to an int32 ID array"""
+        surface_ids = self.surface_ids
+        try:
+            return np.array([surface_ids[token] for token in tokens], dtype=np.int32)
+        except KeyError:
+            pass
+
+        ids = self.ids
+        out = np.empty(len(tokens), dtype=np.int32)
+        for k, token in enumerate(tokens):
+            token_id = surface_ids.get(token)
+            if token_id is None:
+                key = token.lower()
+                token_id = ids.get(key)
+                if token_id is None:
+                    token_id = len(self.tokens)
+                    ids[key] = token_id
+                    self.tokens.append(key)
+                surface_ids[token] = token_id
+            out[k] = token_id
+        return out
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+
+def edit_operations_batch(seqs_a: Sequence[np.ndarray],
+                          seqs_b: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fill the Levenshtein DP for many (a, b) ID-array pairs at once
+
+    All pairs advance one DP row per step on a (batch, n + 1) array, so the
+    per-row NumPy overhead is shared across the batch. Within a row, the
+    diagonal and vertical candidates are independent of the current row, and
+    the horizontal (insertion) dependency is resolved with a running minimum
+    of candidate[k] - k, since cost[j] = min_k(candidate[k] + j - k).
+    Padding never leaks into a pair's result because cell (i, j) only
+    depends on cells with smaller indices.
+
+    Ties are broken match > substitute > delete > insert.
+
+    Returns:
+        (int32 edit distances of shape (batch,),
+         uint8 operation matrices of shape (batch, max_m + 1, max_n + 1))
+    """
+    size = len(seqs_a)
+    len_a = np.array([len(a) for a in seqs_a], dtype=np.int64)
+    len_b = np.array([len(b) for b in seqs_b], dtype=np.int64)
+    m, n = int(len_a.max(initial=0)), int(len_b.max(initial=0))
+
+    # Distinct pad values so padding never matches
+    a_pad = np.full((size, m), -1, dtype=np.int32)
+    b_pad = np.full((size, n), -2, dtype=np.int32)
+    for k in range(size):
+        a_pad[k, :len_a[k]] = seqs_a[k]
+        b_pad[k, :len_b[k]] = seqs_b[k]
+
+    ops = np.empty((size, m + 1, n + 1), dtype=np.uint8)
+    ops[:, 0, :] = INSERT
+    ops[:, :, 0] = DELETE
+    ops[:, 0, 0] = MATCH
+
+    rows = np.arange(size)
+    cols = np.arange(n + 1, dtype=np.int32)
+    prev = np.tile(cols, (size, 1))
+    cand = np.empty((size, n + 1), dtype=np.int32)
+    distances = prev[rows, len_b].copy()
+
+    for i in range(1, m + 1):
+        eq = b_pad == a_pad[:, i - 1:i]
+        diag = prev[:, :-1] + (~eq)
+        up = prev[:, 1:] + 1
+
+        cand[:, 0] = i
+        np.minimum(diag, up, out=cand[:, 1:])
+        cur = np.minimum.accumulate(cand - cols, axis=1) + cols
+
+        block = ops[:, i, 1:]
+        block[:] = INSERT
+        core = cur[:, 1:]
+        block[core == up] = DELETE
+        block[core == diag] = SUBSTITUTE
+        block[eq] = MATCH
+
+        done = len_a == i
+        distances[done] = cur[done, len_b[done]]
+        prev = cur
+
+    return distances, ops
+
+
+def edit_operations(a: np.ndarray, b: np.ndarray) -> Tuple[int, np.ndarray]:
+    """
+    Fill the Levenshtein DP between two ID arrays
+
+    Returns:
+        (edit distance, uint8 operation matrix of shape (m + 1, n + 1))
+    """
+    m, n = len(a), len(b)
+    ops = np.empty((m + 1, n + 1), dtype=np.uint8)
+    ops[0, :] = INSERT
+    ops[:, 0] = DELETE
+    ops[0, 0] = MATCH
+
+    cols = np.arange(n + 1, dtype=np.int32)
+    prev = cols.copy()
+    cand = np.empty(n + 1, dtype=np.int32)
+
+    # Same recurrence as edit_operations_batch on 1-D rows, which avoids
+    # the padding and masking overhead when aligning a single long pair
+    for i in range(1, m + 1):
+        eq = b == a[i - 1]
+        diag = prev[:-1] + (~eq)
+        up = prev[1:] + 1
+
+        cand[0] = i
+        np.minimum(diag, up, out=cand[1:])
+        cur = np.minimum.accumulate(cand - cols) + cols
+
+        row = ops[i, 1:]
+        row[:] = INSERT
+        core = cur[1:]
+        row[core == up] = DELETE
+        row[core == diag] = SUBSTITUTE
+        row[eq] = MATCH
+
+        prev = cur
+
+    return int(prev[n]), ops
+
+
+def edit_operations_banded(a: np.ndarray, b: np.ndarray, band: int) -> Tuple[int, np.ndarray]:
+    """
+    Levenshtein DP restricted to the diagonals |j - i| <= band (Ukkonen)
+
+    Cells outside the band are treated as unreachable, so the result is an
+    upper bound on the edit distance; when it is <= band it is exact, and the
+    operations along the backtracked path match edit_operations, because any
+    path leaving the band costs more than band. Requires band >= |m - n|.
+    Every row is the same 2 * band + 1 cells wide, so rows are filled with
+    the same running-minimum recurrence without reallocating.
+
+    Returns:
+        (banded distance, uint8 operation matrix of shape (m + 1, 2 * band + 1)
+         where cell (i, j) is stored at column j - i + band)
+    """
+    m, n = len(a), len(b)
+    width = 2 * band + 1
+    unreachable = m + n + 1
+    ops = np.empty((m + 1, width), dtype=np.uint8)
+    ops[0] = INSERT
+    ops[0, band] = MATCH
+
+    # b_pad[i - 1 + t] is the column token of band cell t in row i
+    b_pad = np.full(n + 3 * band + 1, -2, dtype=np.int32)
+    b_pad[band:band + n] = b
+
+    offsets = np.arange(width, dtype=np.int32)
+    # prev[t] is cell (i - 1, i - 1 + t - band); prev[width] stays unreachable
+    prev = np.full(width + 1, unreachable, dtype=np.int32)
+    first = min(n, band)
+    prev[band:band + first + 1] = np.arange(first + 1)
+    cur = prev.copy()
+    cand = np.empty(width, dtype=np.int32)
+
+    for i in range(1, m + 1):
+        eq = b_pad[i - 1:i - 1 + width] == a[i - 1]
+        diag = prev[:width] + (~eq)
+        up = prev[1:] + 1
+        np.minimum(diag, up, out=cand)
+        core = cur[:width]
+        np.minimum.accumulate(cand - offsets, out=core)
+        core += offsets
+
+        # Cells left of column 0 or right of column n are unreachable
+        if i < band:
+            core[:band - i] = unreachable
+        if n - i + band + 1 < width:
+            core[max(0, n - i + band + 1):] = unreachable
+
+        on_diag = core == diag
+        ops[i] = np.where(on_diag, np.where(eq, MATCH, SUBSTITUTE),
+                          np.where(core == up, DELETE, INSERT))
+        prev, cur = cur, prev
+
+    return int(prev[n - m + band]), ops
+
+
+def common_affixes(a: np.ndarray, b: np.ndarray) -> Tuple[int, int]:
+    """Lengths of the common prefix and (non-overlapping) common suffix of two ID arrays"""
+    shortest = min(len(a), len(b))
+    mismatch = a[:shortest] != b[:shortest]
+    prefix = int(mismatch.argmax()) if mismatch.any() else shortest
+
+    rest = shortest - prefix
+    if not rest:
+        return prefix, 0
+    mismatch = a[len(a) - rest:][::-1] != b[len(b) - rest:][::-1]
+    suffix = int(mismatch.argmax()) if mismatch.any() else rest
+    return prefix, suffix
+
+
+def bag_distance(a: np.ndarray, b: np.ndarray) -> int:
+    """Multiset lower bound on the edit distance of two ID arrays"""
+    if not len(a) or not len(b):
+        return max(len(a), len(b))
+    size = int(max(a.max(), b.max())) + 1
+    common = np.minimum(np.bincount(a, minlength=size), np.bincount(b, minlength=size)).sum()
+    return max(len(a), len(b)) - int(common)
+
+
+def align_core(a: np.ndarray, b: np.ndarray,
+               band: int = 8) -> Tuple[int, List[Tuple[int, int, int]]]:
+    """
+    Banded alignment with automatic widening
+
+    The band starts at twice a bag-distance lower bound (so one pass is
+    usually enough) and doubles until the banded distance fits inside it,
+    falling back to the full DP once the band covers the whole table.
+    """
+    m, n = len(a), len(b)
+    band = max(1, band, abs(m - n), 2 * bag_distance(a, b))
+    while band < max(m, n):
+        distance, ops = edit_operations_banded(a, b, band)
+        if distance <= band:
+            return distance, backtrack(ops, m, n, band=band)
+        band *= 2
+    distance, ops = edit_operations(a, b)
+    return distance, backtrack(ops)
+
+
+def align_banded(a: np.ndarray, b: np.ndarray,
+                 band: int = 8) -> Tuple[int, List[Tuple[int, int, int]]]:
+    """
+    Edit distance and path for near-identical sequences in close to O(n)
+
+    Identical sequences short-circuit, the common prefix and suffix are
+    matched without any DP, and only the remaining core goes through the
+    banded DP (align_core).
+
+    Returns:
+        (edit distance, forward-ordered (op, i, j) path as from backtrack)
+    """
+    m, n = len(a), len(b)
+    prefix, suffix = common_affixes(a, b)
+    if prefix == m == n:
+        return 0, [(MATCH, k, k) for k in range(1, m + 1)]
+
+    distance, core = align_core(a[prefix:m - suffix], b[prefix:n - suffix], band)
+    return distance, _extend_path(core, m, n, prefix, suffix)
+
+
+def _extend_path(core: List[Tuple[int, int, int]], m: int, n: int,
+                 prefix: int, suffix: int) -> List[Tuple[int, int, int]]:
+    """Full-sequence path from a trimmed core path plus the matched prefix and suffix"""
+    path = [(MATCH, k, k) for k in range(1, prefix + 1)]
+    path.extend((op, i + prefix, j + prefix) for op, i, j in core)
+    path.extend((MATCH, m - suffix + k, n - suffix + k) for k in range(1, suffix + 1))
+    return path
+
+
+def edit_operations_weighted(sub_cost: np.ndarray,
+                             del_cost: np.ndarray) -> Tuple[int, np.ndarray]:
+    """
+    Edit-distance DP with per-cell substitution and per-row deletion costs
+    (insertions cost 1), used to align a sequence against confusion-network
+    slots
+
+    Args:
+        sub_cost: int32 (m, n) cost of aligning row item i with column item j
+            (0 marks a match)
+        del_cost: int32 (m,) cost of leaving row item i unaligned
+
+    Returns:
+        (distance, uint8 operation matrix of shape (m + 1, n + 1))
+    """
+    m, n = sub_cost.shape
+    ops = np.empty((m + 1, n + 1), dtype=np.uint8)
+    ops[0, :] = INSERT
+    ops[:, 0] = DELETE
+    ops[0, 0] = MATCH
+
+    cols = np.arange(n + 1, dtype=np.int32)
+    prev = cols.copy()
+    cand = np.empty(n + 1, dtype=np.int32)
+
+    for i in range(1, m + 1):
+        zero = sub_cost[i - 1] == 0
+        diag = prev[:-1] + sub_cost[i - 1]
+        up = prev[1:] + del_cost[i - 1]
+
+        cand[0] = prev[0] + del_cost[i - 1]
+        np.minimum(diag, up, out=cand[1:])
+        cur = np.minimum.accumulate(cand - cols) + cols
+
+        row = ops[i, 1:]
+        row[:] = INSERT
+        core = cur[1:]
+        row[core == up] = DELETE
+        on_diag = core == diag
+        row[on_diag] = SUBSTITUTE
+        row[on_diag & zero] = MATCH
+
+        prev = cur
+
+    return int(prev[n]), ops
+
+
+def backtrack(ops: np.ndarray, i: Optional[int] = None,
+              j: Optional[int] = None, band: Optional[int] = None) -> List[Tuple[int, int, int]]:
+    """
+    Walk the operation matrix back from cell (i, j), by default the
+    bottom-right corner (pass band for matrices from edit_operations_banded)
+
+    Returns:
+        Forward-ordered list of (op, i, j) where i and j are the 1-based DP
+        coordinates the operation was read from
+    """
+    if i is None:
+        i = ops.shape[0] - 1
+    if j is None:
+        j = ops.shape[1] - 1
+    path = []
+
+    while i > 0 or j > 0:
+        if i == 0:
+            op = INSERT
+        elif j == 0:
+            op = DELETE
+        elif band is None:
+            op = int(ops[i, j])
+        else:
+            op = int(ops[i, j - i + band])
+        path.append((op, i, j))
+
+        if op == MATCH or op == SUBSTITUTE:
+            i -= 1
+            j -= 1
+        elif op == DELETE:
+            i -= 1
+        else:
+            j -= 1
+
+    path.reverse()
+    return path
+
+
+def count_operations(path: List[Tuple[int, int, int]]) -> Dict[str, int]:
+    """Count substitutions, deletions and insertions along a backtracked path"""
+    ops = [op for op, _, _ in path]
+    return {
+        'substitutions': ops.count(SUBSTITUTE),
+        'deletions': ops.count(DELETE),
+        'insertions': ops.count(INSERT)
+    }
+
+
+def score_pairs(pairs: Sequence[Tuple[np.ndarray, np.ndarray]], with_path: bool = False,
+                batch_size: int = 64, banded: bool = False) -> List[Dict]:
+    """
+    Single-pass alignment scoring for many (reference, hypothesis) ID pairs
+
+    One DP per pair yields the distance, and one backtrack over its
+    operation matrix yields the S/D/I counts (and optionally the path).
+    Pairs are sorted by length and processed in batches so padding stays
+    small. With banded=True each pair goes through align_banded instead,
+    which is faster when most hypotheses are close to the reference.
+
+    Returns:
+        One dict per pair, in input order, with distance, substitutions,
+        deletions, insertions and (if with_path) path
+    """
+    if banded:
+        return _score_pairs_trimmed(pairs, with_path, batch_size)
+
+    order = sorted(range(len(pairs)), key=lambda k: (len(pairs[k][0]), len(pairs[k][1])))
+    results: List[Optional[Dict]] = [None] * len(pairs)
+
+    for start in range(0, len(order), batch_size):
+        chunk = order[start:start + batch_size]
+        distances, ops = edit_operations_batch([pairs[k][0] for k in chunk],
+                                               [pairs[k][1] for k in chunk])
+        for slot, k in enumerate(chunk):
+            ref, hyp = pairs[k]
+            path = backtrack(ops[slot], len(ref), len(hyp))
+            result = {'distance': int(distances[slot]), **count_operations(path)}
+            if with_path:
+                result['path'] = path
+            results[k] = result
+
+    return results
+
+
+def _score_pairs_trimmed(pairs: Sequence[Tuple[np.ndarray, np.ndarray]], with_path: bool,
+                         batch_size: int, long_core: int = 256) -> List[Dict]:
+    """
+    score_pairs for mostly near-identical pairs
+
+    Identical pairs cost one comparison, every other pair is trimmed to the
+    core between its common prefix and suffix, short cores are aligned
+    together with the batched full DP and long ones with the banded DP.
+    """
+    results: List[Optional[Dict]] = [None] * len(pairs)
+    short = []
+    for k, (ref, hyp) in enumerate(pairs):
+        prefix, suffix = common_affixes(ref, hyp)
+        if prefix == len(ref) == len(hyp):
+            path = [(MATCH, t, t) for t in range(1, prefix + 1)]
+            results[k] = (0, path, 0, 0)
+            continue
+        core_ref = ref[prefix:len(ref) - suffix]
+        core_hyp = hyp[prefix:len(hyp) - suffix]
+        if max(len(core_ref), len(core_hyp)) > long_core:
+            distance, core = align_core(core_ref, core_hyp)
+            results[k] = (distance, core, prefix, suffix)
+        else:
+            short.append((k, prefix, suffix, core_ref, core_hyp))
+
+    short.sort(key=lambda item: (len(item[3]), len(item[4])))
+    for start in range(0, len(short), batch_size):
+        chunk = short[start:start + batch_size]
+        distances, ops = edit_operations_batch([item[3] for item in chunk],
+                                               [item[4] for item in chunk])
+        for slot, (k, prefix, suffix, core_ref, core_hyp) in enumerate(chunk):
+            core = backtrack(ops[slot], len(core_ref), len(core_hyp))
+            results[k] = (int(distances[slot]), core, prefix, suffix)
+
+    scored = []
+    for (ref, hyp), (distance, core, prefix, suffix) in zip(pairs, results):
+        path = _extend_path(core, len(ref), len(hyp), prefix, suffix) if with_path else core
+        result = {'distance': distance, **count_operations(path)}
+        if with_path:
+            result['path'] = path
+        scored.append(result)
+    return scored
+
+
+def align_sequences(seq1: Sequence[str], seq2: Sequence[str],
+                    interner: Optional[TokenInterner] = None,
+                    banded: bool = False) -> List[Tuple]:
+    """
+    Align seq2 against seq1 (with align_banded if banded)
+
+    Returns:
+        List of (position, word, operation) in the format produced by
+        WordLattice._align_pair
+    """
+    interner = interner or TokenInterner()
+    a, b = interner.intern(seq1), interner.intern(seq2)
+    if banded:
+        _, path = align_banded(a, b)
+    else:
+        path = backtrack(edit_operations(a, b)[1])
+
+    alignment = []
+    for op, i, j in path:
+        if op == DELETE:
+            alignment.append((i - 1, seq1[i - 1], 'delete'))
+        elif op == INSERT:
+            alignment.append((j - 1, seq2[j - 1], 'insert'))
+        else:
+            alignment.append((i - 1, seq2[j - 1], OP_NAMES[op]))
+
+    return alignment
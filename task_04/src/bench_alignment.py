@@ -0,0 +1,203 @@
+"""
+Benchmark the array-backed alignment engine against the original
+pure-Python list-of-tuples DP on long conversational segments, the
+single-pass batched WER scoring against editdistance + a second DP, and
+banded alignment against the full DP on near-identical hypotheses
+"""
+
+import csv
+import os
+import random
+import time
+import tracemalloc
+
+import editdistance
+
+from alignment import align_sequences
+from lattice_wer import LatticeWER
+from tokenization import split_units
+
+
+def legacy_align_pair(seq1, seq2):
+    """Original WordLattice._align_pair implementation, kept for comparison"""
+    m, n = len(seq1), len(seq2)
+    dp = [[None for _ in range(n + 1)] for _ in range(m + 1)]
+
+    for i in range(m + 1):
+        dp[i][0] = (i, 'delete')
+    for j in range(n + 1):
+        dp[0][j] = (j, 'insert')
+    dp[0][0] = (0, 'start')
+
+    for i in range(1, m + 1):
+        for j in range(1, n + 1):
+            if seq1[i-1].lower() == seq2[j-1].lower():
+                dp[i][j] = (dp[i-1][j-1][0], 'match')
+            else:
+                sub_cost = dp[i-1][j-1][0] + 1
+                del_cost = dp[i-1][j][0] + 1
+                ins_cost = dp[i][j-1][0] + 1
+                min_cost = min(sub_cost, del_cost, ins_cost)
+                if min_cost == sub_cost:
+                    dp[i][j] = (sub_cost, 'substitute')
+                elif min_cost == del_cost:
+                    dp[i][j] = (del_cost, 'delete')
+                else:
+                    dp[i][j] = (ins_cost, 'insert')
+
+    alignment = []
+    i, j = m, n
+    while i > 0 or j > 0:
+        if i == 0:
+            alignment.append((j-1, seq2[j-1], 'insert'))
+            j -= 1
+        elif j == 0:
+            alignment.append((i-1, seq1[i-1], 'delete'))
+            i -= 1
+        else:
+            op = dp[i][j][1]
+            if op in ('match', 'substitute'):
+                alignment.append((i-1, seq2[j-1], op))
+                i -= 1
+                j -= 1
+            elif op == 'delete':
+                alignment.append((i-1, seq1[i-1], 'delete'))
+                i -= 1
+            else:
+                alignment.append((j-1, seq2[j-1], 'insert'))
+                j -= 1
+
+    alignment.reverse()
+    return alignment
+
+
+def legacy_standard_wer(hyp, ref):
+    """Original compute_standard_wer: editdistance plus a second full DP for S/D/I"""
+    distance = editdistance.eval(hyp, ref)
+    alignment = legacy_align_pair(hyp, ref)
+    return distance, sum(1 for _, _, op in alignment if op != 'match')
+
+
+def load_rows():
+    """(reference, [hypotheses]) token lists from the real Question 4 dataset"""
+    csv_path = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                            'dataset', 'Question 4 - Task.csv')
+    rows = []
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            hyps = [row[key].split() for key in
+                    ('Model H', 'Model i', 'Model k', 'Model l', 'Model m', 'Model n')]
+            rows.append((row['Human'].split(), hyps))
+    return rows
+
+
+def load_vocabulary():
+    """Vocabulary of the real Question 4 dataset"""
+    vocab = set()
+    for ref, hyps in load_rows():
+        vocab.update(ref)
+        for hyp in hyps:
+            vocab.update(hyp)
+    return sorted(vocab)
+
+
+def bench_dataset_scoring(repeats=20):
+    """Score every (model, reference) pair of the dataset both ways"""
+    pairs = [(hyp, ref) for ref, hyps in load_rows() for hyp in hyps] * repeats
+    wer_calculator = LatticeWER()
+
+    start = time.perf_counter()
+    for hyp, ref in pairs:
+        legacy_standard_wer(hyp, ref)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    wer_calculator.compute_standard_wer_batch(pairs)
+    batch_time = time.perf_counter() - start
+
+    print(f"\nDataset scoring ({len(pairs)} pairs): legacy {legacy_time:.3f}s, "
+          f"single-pass batch {batch_time:.3f}s ({legacy_time / batch_time:.1f}x)")
+
+
+def bench_banded(repeats=20):
+    """Full vs banded scoring of every (model, reference) pair of the dataset"""
+    print(f"\n{'Unit':<12} {'Pairs':<8} {'Full (s)':<10} {'Banded (s)':<12} {'Speedup':<9} {'Same':<6}")
+    print("-" * 60)
+    for unit in ('word', 'character'):
+        pairs = [(split_units(hyp, unit), split_units(ref, unit))
+                 for ref, hyps in load_rows() for hyp in hyps] * repeats
+        full, full_time = timed(LatticeWER().compute_standard_wer_batch, pairs)
+        banded, banded_time = timed(LatticeWER(banded=True).compute_standard_wer_batch, pairs)
+        print(f"{unit:<12} {len(pairs):<8} {full_time:<10.3f} {banded_time:<12.3f} "
+              f"{full_time / banded_time:<9.1f} {str(full == banded):<6}")
+
+    # Long segments with 2% word errors
+    rng = random.Random(1)
+    vocab = load_vocabulary()
+    for length in (1000, 5000, 20000):
+        ref, hyp = make_pair(vocab, length, 0.02, rng)
+        full, full_time = timed(align_sequences, ref, hyp)
+        banded, banded_time = timed(align_sequences, ref, hyp, None, True)
+        print(f"{length:<6} words {1:<8} {full_time:<10.3f} {banded_time:<12.3f} "
+              f"{full_time / banded_time:<9.1f} {str(full == banded):<6}")
+
+
+def make_pair(vocab, length, error_rate, rng):
+    """Reference segment and a hypothesis with random substitutions/insertions/deletions"""
+    ref = [rng.choice(vocab) for _ in range(length)]
+    hyp = []
+    for word in ref:
+        r = rng.random()
+        if r < error_rate / 3:
+            hyp.append(rng.choice(vocab))
+        elif r < 2 * error_rate / 3:
+            continue
+        elif r < error_rate:
+            hyp.extend([word, rng.choice(vocab)])
+        else:
+            hyp.append(word)
+    return ref, hyp
+
+
+def timed(fn, *args):
+    """Result and wall time of one call"""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def measure(fn, *args):
+    """Wall time and peak traced memory of one call"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    rng = random.Random(0)
+    vocab = load_vocabulary()
+
+    print("=" * 80)
+    print("ALIGNMENT BENCHMARK: legacy Python DP vs array-backed engine")
+    print("=" * 80)
+    print(f"{'Words':<8} {'Legacy (s)':<12} {'Array (s)':<12} {'Speedup':<10} "
+          f"{'Legacy MB':<12} {'Array MB':<12} {'Same':<6}")
+    print("-" * 80)
+
+    for length in (250, 500, 1000, 2000):
+        ref, hyp = make_pair(vocab, length, 0.15, rng)
+        legacy, legacy_time, legacy_mem = measure(legacy_align_pair, ref, hyp)
+        fast, fast_time, fast_mem = measure(align_sequences, ref, hyp)
+        print(f"{length:<8} {legacy_time:<12.3f} {fast_time:<12.3f} {legacy_time / fast_time:<10.1f} "
+              f"{legacy_mem / 1e6:<12.1f} {fast_mem / 1e6:<12.1f} {str(legacy == fast):<6}")
+
+    bench_dataset_scoring()
+    bench_banded()
+
+
+if __name__ == "__main__":
+    main()
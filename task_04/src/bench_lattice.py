@@ -0,0 +1,95 @@
+"""
+Benchmark oracle (best-path) lattice WER: the DP over (lattice slot x
+hypothesis position) against enumerating every lattice path, on lattices
+with wide disagreement slots
+"""
+
+import itertools
+import math
+import random
+import time
+
+import editdistance
+
+from bench_alignment import load_vocabulary
+from confusion_network import EPSILON
+from lattice_wer import WordLattice
+
+
+def enumerate_best_path(network, hypothesis, exclude):
+    """Minimum edit distance over every path through the network, by brute force"""
+    ids = network.interner.intern(hypothesis).tolist()
+    choices = [[token_id for token_id, sources in slot.items() if not sources <= {exclude}]
+               for slot in network.slots]
+    best = None
+    for combo in itertools.product(*choices):
+        distance = editdistance.eval([token_id for token_id in combo if token_id != EPSILON], ids)
+        best = distance if best is None else min(best, distance)
+    return best
+
+
+def build_lattice(vocab, length, num_models, error_rate, rng):
+    """Lattice over a random reference and num_models noisy copies of it"""
+    ref = [rng.choice(vocab) for _ in range(length)]
+    hypotheses = {f"model_{k}": make_noisy(ref, vocab, error_rate, rng)
+                  for k in range(num_models)}
+    lattice = WordLattice()
+    lattice.build_from_hypotheses(hypotheses, ref)
+    return lattice, hypotheses
+
+
+def make_noisy(ref, vocab, error_rate, rng):
+    """Copy of ref with random substitutions, deletions and insertions"""
+    hyp = []
+    for word in ref:
+        r = rng.random()
+        if r < error_rate / 3:
+            hyp.append(rng.choice(vocab))
+        elif r < 2 * error_rate / 3:
+            continue
+        elif r < error_rate:
+            hyp.extend([word, rng.choice(vocab)])
+        else:
+            hyp.append(word)
+    return hyp
+
+
+def log10_paths(lattice):
+    """log10 of the number of distinct paths through the lattice"""
+    return sum(math.log10(len(slot)) for slot in lattice.network.slots)
+
+
+def main():
+    rng = random.Random(0)
+    vocab = load_vocabulary()
+
+    print("=" * 80)
+    print("ORACLE LATTICE WER: path enumeration vs DP")
+    print("=" * 80)
+    print(f"{'Words':<8} {'Models':<8} {'Slots':<8} {'log10 paths':<13} "
+          f"{'Enumerate (s)':<15} {'DP (s)':<10} {'Same':<6}")
+    print("-" * 80)
+
+    for length, num_models, error_rate in ((6, 4, 0.5), (10, 6, 0.5), (14, 6, 0.5),
+                                           (100, 6, 0.5), (500, 12, 0.5), (1000, 24, 0.6)):
+        lattice, hypotheses = build_lattice(vocab, length, num_models, error_rate, rng)
+        name, hypothesis = next(iter(hypotheses.items()))
+        paths = log10_paths(lattice)
+
+        start = time.perf_counter()
+        best = lattice.best_path(hypothesis, exclude=name)
+        dp_time = time.perf_counter() - start
+
+        if paths <= 6:
+            start = time.perf_counter()
+            same = enumerate_best_path(lattice.network, hypothesis, name) == best['distance']
+            enum_time = f"{time.perf_counter() - start:.3f}"
+        else:
+            same, enum_time = '-', '-'
+
+        print(f"{length:<8} {num_models:<8} {len(lattice.network):<8} {paths:<13.1f} "
+              f"{enum_time:<15} {dp_time:<10.4f} {str(same):<6}")
+
+
+if __name__ == "__main__":
+    main()
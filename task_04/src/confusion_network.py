@@ -0,0 +1,146 @@
+"""
+Progressive (ROVER-style) confusion network construction
+Sequences are aligned one at a time against the growing network, so each
+hypothesis is aligned once and every slot position is shared by all of them
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Set
+
+from alignment import (TokenInterner, edit_operations_weighted, backtrack,
+                       MATCH, SUBSTITUTE, DELETE, INSERT)
+
+# Token ID of the epsilon (no word) arc
+EPSILON = -1
+EPSILON_WORD = '<eps>'
+
+
+class ConfusionNetwork:
+    """
+    Confusion network stored as an indexed slot array
+
+    Each slot maps a token ID (or EPSILON) to the set of sequence names that
+    put that word in the slot, so a word shared by many hypotheses is stored
+    once per slot.
+    """
+
+    def __init__(self, interner: TokenInterner = None):
+        self.interner = interner or TokenInterner()
+        self.slots: List[Dict[int, Set[str]]] = []
+        self.names: List[str] = []
+
+    def add(self, name: str, tokens: Sequence[str]) -> None:
+        """
+        Align a sequence to the network and merge it in
+
+        Aligning a word to a slot costs 0 if the slot already holds that word
+        and 1 otherwise; leaving a slot unaligned costs 0 if the slot already
+        has an epsilon arc and 1 otherwise; a word aligned to no slot opens a
+        new slot, with epsilon arcs for every earlier sequence.
+        """
+        ids = self.interner.intern(tokens)
+
+        if not self.names:
+            self.slots = [{int(token_id): {name}} for token_id in ids]
+            self.names.append(name)
+            return
+
+        sub_cost, del_cost = self._alignment_costs(ids)
+        _, ops = edit_operations_weighted(sub_cost, del_cost)
+
+        slots = []
+        for op, i, j in backtrack(ops):
+            if op == MATCH or op == SUBSTITUTE:
+                slot = self.slots[i - 1]
+                slot.setdefault(int(ids[j - 1]), set()).add(name)
+            elif op == DELETE:
+                slot = self.slots[i - 1]
+                slot.setdefault(EPSILON, set()).add(name)
+            else:
+                slot = {int(ids[j - 1]): {name}, EPSILON: set(self.names)}
+            slots.append(slot)
+
+        self.slots = slots
+        self.names.append(name)
+
+    def best_path(self, tokens: Sequence[str], exclude: Optional[str] = None) -> Dict:
+        """
+        Oracle alignment of a sequence against every path through the network
+
+        A path picks one entry (a word or epsilon) from each slot, so there
+        are exponentially many of them, but the cheapest one is found by the
+        same slot-by-token DP used in add(): passing a slot through epsilon
+        is free, dropping a word from it is a deletion, and aligning a token
+        to it is free only if the slot holds that token. Entries supported
+        by nobody but exclude are ignored, so a sequence already merged into
+        the network is scored against the other sequences' paths only.
+
+        Returns:
+            Dict with distance, substitutions, deletions, insertions,
+            reference_length (real words on the chosen path) and path (those
+            words)
+        """
+        ids = self.interner.intern(tokens)
+        sub_cost, del_cost = self._alignment_costs(ids, exclude)
+        distance, ops = edit_operations_weighted(sub_cost, del_cost)
+
+        counts = {SUBSTITUTE: 0, DELETE: 0, INSERT: 0}
+        path = []
+        for op, i, j in backtrack(ops):
+            if op == MATCH:
+                path.append(tokens[j - 1])
+            elif op == INSERT:
+                counts[INSERT] += 1
+            elif op == SUBSTITUTE or del_cost[i - 1]:
+                word = self._top_word(self.slots[i - 1], exclude)
+                if word == EPSILON_WORD:
+                    # Token aligned to an epsilon-only slot: an insertion
+                    counts[INSERT] += 1
+                else:
+                    counts[op] += 1
+                    path.append(word)
+
+        return {
+            'distance': distance,
+            'substitutions': counts[SUBSTITUTE],
+            'deletions': counts[DELETE],
+            'insertions': counts[INSERT],
+            'reference_length': len(path),
+            'path': path
+        }
+
+    def _top_word(self, slot: Dict[int, Set[str]], exclude: Optional[str]) -> str:
+        """Most supported real word in a slot"""
+        best_id, best_votes = EPSILON, 0
+        for token_id, sources in slot.items():
+            votes = len(sources - {exclude})
+            if token_id != EPSILON and votes > best_votes:
+                best_id, best_votes = token_id, votes
+        return self.word(best_id)
+
+    def _alignment_costs(self, ids: np.ndarray, exclude: Optional[str] = None):
+        """Per-(slot, token) substitution costs and per-slot deletion costs"""
+        positions: Dict[int, List[int]] = {}
+        for j, token_id in enumerate(ids.tolist()):
+            positions.setdefault(token_id, []).append(j)
+
+        sub_cost = np.ones((len(self.slots), len(ids)), dtype=np.int32)
+        del_cost = np.ones(len(self.slots), dtype=np.int32)
+        for s, slot in enumerate(self.slots):
+            for token_id, sources in slot.items():
+                if exclude is not None and sources <= {exclude}:
+                    continue
+                if token_id == EPSILON:
+                    del_cost[s] = 0
+                    continue
+                for j in positions.get(token_id, ()):
+                    sub_cost[s, j] = 0
+
+        return sub_cost, del_cost
+
+    def word(self, token_id: int) -> str:
+        """Surface form of a slot entry"""
+        return EPSILON_WORD if token_id == EPSILON else self.interner.tokens[token_id]
+
+    def __len__(self) -> int:
+        return len(self.slots)
@@ -5,14 +5,19 @@ Handles multiple ASR model outputs with potentially erroneous reference transcri
 
 import numpy as np
 from typing import List, Dict, Tuple, Set
-from collections import defaultdict, Counter
+from collections import Counter
 import json
 from dataclasses import dataclass
-import editdistance
+
+from alignment import TokenInterner, align_sequences, score_pairs
+from confusion_network import ConfusionNetwork, EPSILON_WORD
+from tokenization import UNITS, split_units, join_units
+from text_normalizer import HindiNormalizer
 
 @dataclass
 class LatticeNode:
     """Node in the word lattice"""
+    __slots__ = ('position', 'word', 'sources', 'confidence')
     position: int
     word: str
     sources: Set[str]  # Which models contributed this word
@@ -21,6 +26,7 @@ class LatticeNode:
 @dataclass
 class LatticeEdge:
     """Edge connecting lattice nodes"""
+    __slots__ = ('start_pos', 'end_pos', 'word', 'sources', 'weight')
     start_pos: int
     end_pos: int
     word: str
@@ -41,9 +47,14 @@ class WordLattice:
             alignment_unit: 'word', 'subword', or 'phrase'
         """
         self.alignment_unit = alignment_unit
-        self.nodes = []  # List of LatticeNode
+        self.nodes = []  # List of LatticeNode, grouped by position
+        self.slot_offsets = [0]  # Nodes of position p are nodes[slot_offsets[p]:slot_offsets[p + 1]]
+        self.slot_best = []  # Per position: index of the highest-confidence node
+        self.slot_reference = []  # Per position: index of the reference's node
         self.edges = []  # List of LatticeEdge
         self.paths = []  # All possible paths through lattice
+        self.interner = TokenInterner()  # Shared token -> ID map for alignment
+        self.network = None  # ConfusionNetwork the nodes were built from
         
     def build_from_hypotheses(self, hypotheses: Dict[str, List[str]], 
                               reference: List[str]) -> None:
@@ -54,33 +65,27 @@ class WordLattice:
             hypotheses: Dict mapping model_name -> list of words
             reference: Reference transcription (may contain errors)
         """
-        # Align all hypotheses using dynamic programming
-        alignments = self._align_all_sequences(hypotheses, reference)
+        # Progressively align reference and hypotheses into one network
+        self.network = self._build_confusion_network(hypotheses, reference)
         
-        # Build lattice structure from alignments
-        self._construct_lattice(alignments, reference)
+        # Build lattice structure from the network slots
+        self._construct_lattice(self.network)
         
-    def _align_all_sequences(self, hypotheses: Dict[str, List[str]], 
-                            reference: List[str]) -> Dict:
-        """
-        Align all hypotheses to each other and to reference
-        Uses multiple sequence alignment approach
+    def _build_confusion_network(self, hypotheses: Dict[str, List[str]], 
+                                 reference: List[str]) -> ConfusionNetwork:
         """
-        all_sequences = {**hypotheses, 'reference': reference}
-        
-        # Find longest sequence as anchor
-        anchor_name = max(all_sequences.keys(), key=lambda k: len(all_sequences[k]))
-        anchor_seq = all_sequences[anchor_name]
-        
-        # Align each sequence to anchor
-        alignments = {}
-        for name, seq in all_sequences.items():
-            if name == anchor_name:
-                alignments[name] = [(i, word, 'match') for i, word in enumerate(seq)]
-            else:
-                alignments[name] = self._align_pair(anchor_seq, seq, name)
+        Multiple sequence alignment by growing a confusion network
         
-        return alignments
+        The reference seeds the network and each hypothesis is aligned once
+        against all slots built so far (ROVER-style), so insertions get their
+        own slots instead of colliding with unrelated positions, and the
+        cost grows linearly with the number of models.
+        """
+        network = ConfusionNetwork(self.interner)
+        network.add('reference', reference)
+        for name, seq in hypotheses.items():
+            network.add(name, seq)
+        return network
     
     def _align_pair(self, seq1: List[str], seq2: List[str], 
                    name: str) -> List[Tuple]:
@@ -88,91 +93,26 @@ class WordLattice:
         Align two sequences using dynamic programming
         Returns alignment with positions and operations
         """
-        m, n = len(seq1), len(seq2)
-        
-        # DP table: dp[i][j] = (cost, operation)
-        dp = [[None for _ in range(n + 1)] for _ in range(m + 1)]
-        
-        # Initialize
-        for i in range(m + 1):
-            dp[i][0] = (i, 'delete')
-        for j in range(n + 1):
-            dp[0][j] = (j, 'insert')
-        dp[0][0] = (0, 'start')
-        
-        # Fill DP table
-        for i in range(1, m + 1):
-            for j in range(1, n + 1):
-                # Match/substitute
-                if seq1[i-1].lower() == seq2[j-1].lower():
-                    match_cost = dp[i-1][j-1][0]
-                    dp[i][j] = (match_cost, 'match')
-                else:
-                    sub_cost = dp[i-1][j-1][0] + 1
-                    del_cost = dp[i-1][j][0] + 1
-                    ins_cost = dp[i][j-1][0] + 1
-                    
-                    min_cost = min(sub_cost, del_cost, ins_cost)
-                    if min_cost == sub_cost:
-                        dp[i][j] = (sub_cost, 'substitute')
-                    elif min_cost == del_cost:
-                        dp[i][j] = (del_cost, 'delete')
-                    else:
-                        dp[i][j] = (ins_cost, 'insert')
-        
-        # Backtrack to get alignment
-        alignment = []
-        i, j = m, n
-        pos = max(m, n)
-        
-        while i > 0 or j > 0:
-            if i == 0:
-                alignment.append((j-1, seq2[j-1], 'insert'))
-                j -= 1
-            elif j == 0:
-                alignment.append((i-1, seq1[i-1], 'delete'))
-                i -= 1
-            else:
-                op = dp[i][j][1]
-                if op == 'match':
-                    alignment.append((i-1, seq2[j-1], 'match'))
-                    i -= 1
-                    j -= 1
-                elif op == 'substitute':
-                    alignment.append((i-1, seq2[j-1], 'substitute'))
-                    i -= 1
-                    j -= 1
-                elif op == 'delete':
-                    alignment.append((i-1, seq1[i-1], 'delete'))
-                    i -= 1
-                elif op == 'insert':
-                    alignment.append((j-1, seq2[j-1], 'insert'))
-                    j -= 1
-        
-        alignment.reverse()
-        return alignment
+        return align_sequences(seq1, seq2, self.interner)
     
-    def _construct_lattice(self, alignments: Dict, reference: List[str]) -> None:
-        """
-        Construct lattice structure from alignments
+    def _construct_lattice(self, network: ConfusionNetwork) -> None:
         """
-        # Group words by position
-        position_words = defaultdict(lambda: defaultdict(set))
-        
-        for model_name, alignment in alignments.items():
-            for pos, word, op in alignment:
-                if op != 'delete':  # Skip deletions
-                    position_words[pos][word.lower()].add(model_name)
+        Construct lattice structure from confusion network slots
         
-        # Create nodes and edges
-        positions = sorted(position_words.keys())
+        Slot i becomes lattice position i; each distinct word in it (epsilon
+        included) is one node and one arc from state i to state i + 1.
+        Nodes are stored contiguously per position, and the offsets plus the
+        per-position best and reference node indices are recorded as the
+        nodes are created, so later position queries never scan the lattice.
+        """
+        num_sequences = len(network.names)
         
-        for i, pos in enumerate(positions):
-            words_at_pos = position_words[pos]
-            
-            for word, sources in words_at_pos.items():
+        for pos, slot in enumerate(network.slots):
+            best = reference = -1
+            for token_id, sources in slot.items():
                 # Calculate confidence based on model agreement
-                confidence = len(sources) / (len(alignments))
+                confidence = len(sources) / num_sequences
+                word = network.word(token_id)
                 
                 node = LatticeNode(
                     position=pos,
@@ -180,19 +120,42 @@ class WordLattice:
                     sources=sources,
                     confidence=confidence
                 )
+                index = len(self.nodes)
                 self.nodes.append(node)
                 
-                # Create edges to next position
-                if i < len(positions) - 1:
-                    next_pos = positions[i + 1]
-                    edge = LatticeEdge(
-                        start_pos=pos,
-                        end_pos=next_pos,
-                        word=word,
-                        sources=sources,
-                        weight=1.0 - confidence  # Lower weight = higher confidence
-                    )
-                    self.edges.append(edge)
+                # Highest confidence wins; ties go to real words over epsilon
+                if best < 0 or self._node_rank(node) > self._node_rank(self.nodes[best]):
+                    best = index
+                if 'reference' in sources:
+                    reference = index
+                
+                edge = LatticeEdge(
+                    start_pos=pos,
+                    end_pos=pos + 1,
+                    word=word,
+                    sources=sources,
+                    weight=1.0 - confidence  # Lower weight = higher confidence
+                )
+                self.edges.append(edge)
+            
+            self.slot_offsets.append(len(self.nodes))
+            self.slot_best.append(best)
+            self.slot_reference.append(reference)
+    
+    @staticmethod
+    def _node_rank(node: LatticeNode) -> Tuple[float, bool]:
+        """Sort key for picking a position's winner"""
+        return node.confidence, node.word != EPSILON_WORD
+    
+    def num_positions(self) -> int:
+        """Number of positions (confusion network slots) in the lattice"""
+        return len(self.slot_best)
+    
+    def nodes_at(self, position: int) -> List[LatticeNode]:
+        """Nodes at a lattice position"""
+        if not 0 <= position < len(self.slot_best):
+            return []
+        return self.nodes[self.slot_offsets[position]:self.slot_offsets[position + 1]]
     
     def get_consensus_transcription(self, strategy: str = 'voting') -> List[str]:
         """
@@ -213,33 +176,23 @@ class WordLattice:
     
     def _voting_consensus(self) -> List[str]:
         """Get consensus using majority voting at each position"""
-        position_words = defaultdict(list)
-        
-        for node in self.nodes:
-            position_words[node.position].append((node.word, len(node.sources)))
-        
         consensus = []
-        for pos in sorted(position_words.keys()):
-            words = position_words[pos]
-            # Pick word with most sources (votes)
-            best_word = max(words, key=lambda x: x[1])[0]
-            consensus.append(best_word)
+        for pos in range(len(self.slot_best)):
+            # Pick word with most sources (votes); ties go to real words over epsilon
+            best = max(self.nodes_at(pos),
+                       key=lambda n: (len(n.sources), n.word != EPSILON_WORD))
+            if best.word != EPSILON_WORD:
+                consensus.append(best.word)
         
         return consensus
     
     def _confidence_consensus(self) -> List[str]:
         """Get consensus using highest confidence path"""
-        position_words = defaultdict(list)
-        
-        for node in self.nodes:
-            position_words[node.position].append((node.word, node.confidence))
-        
         consensus = []
-        for pos in sorted(position_words.keys()):
-            words = position_words[pos]
-            # Pick word with highest confidence
-            best_word = max(words, key=lambda x: x[1])[0]
-            consensus.append(best_word)
+        for index in self.slot_best:
+            word = self.nodes[index].word
+            if word != EPSILON_WORD:
+                consensus.append(word)
         
         return consensus
     
@@ -255,29 +208,52 @@ class WordLattice:
         Returns:
             True if models agree strongly and differ from reference
         """
-        nodes_at_pos = [n for n in self.nodes if n.position == position]
-        
-        if not nodes_at_pos:
+        if not 0 <= position < len(self.slot_best):
             return False
         
-        # Check if models agree (high confidence)
-        max_confidence = max(n.confidence for n in nodes_at_pos)
+        consensus = self.nodes[self.slot_best[position]]
+        reference = self.slot_reference[position]
+        reference_word = self.nodes[reference].word if reference >= 0 else None
         
-        # Check if reference differs from consensus
-        reference_word = None
-        consensus_word = None
+        # Trust models if they agree strongly and differ from reference
+        return consensus.confidence >= threshold and reference_word != consensus.word
+    
+    def best_path(self, hypothesis: List[str], exclude: str = None) -> Dict:
+        """
+        Minimum edit distance between a hypothesis and any lattice path
         
-        for node in nodes_at_pos:
-            if 'reference' in node.sources:
-                reference_word = node.word
-            if node.confidence == max_confidence:
-                consensus_word = node.word
+        Args:
+            hypothesis: Word sequence to score
+            exclude: Sequence whose own arcs are ignored (the model being
+                scored, so it is not compared against itself)
         
-        # Trust models if they agree strongly and differ from reference
-        if max_confidence >= threshold and reference_word != consensus_word:
-            return True
+        Returns:
+            Dict with distance, S/D/I counts, reference_length and the words
+            of the best path
+        """
+        return self.network.best_path(hypothesis, exclude)
+    
+    def node_columns(self) -> Tuple[List[str], List[int], List[str], List[int]]:
+        """
+        Flatten the nodes into picklable columns (for result_store)
         
-        return False
+        Returns:
+            (source names, position per node, word per node, sources bitmask
+             per node) where bit k of the mask stands for names[k]
+        """
+        names = list(self.network.names)
+        bits = {name: 1 << k for k, name in enumerate(names)}
+        positions, words, masks = [], [], []
+        for node in self.nodes:
+            positions.append(node.position)
+            words.append(node.word)
+            masks.append(sum(bits[name] for name in node.sources))
+        return names, positions, words, masks
+    
+    def trusted_positions(self, threshold: float = 0.8) -> List[int]:
+        """Positions where models should be trusted over the reference"""
+        return [pos for pos in range(len(self.slot_best))
+                if self.should_trust_models_over_reference(pos, threshold)]
 
 
 class LatticeWER:
@@ -286,15 +262,26 @@ class LatticeWER:
     Handles cases where reference may be incorrect
     """
     
-    def __init__(self, alignment_unit: str = 'word'):
+    def __init__(self, alignment_unit: str = 'word', banded: bool = False,
+                 normalize: bool = False):
         """
         Initialize WER calculator
         
         Args:
-            alignment_unit: 'word', 'subword', or 'phrase'
+            alignment_unit: 'word', 'subword', 'character', or 'phrase'
+            banded: Score pairs with the banded, prefix/suffix-trimming
+                aligner, which is faster when hypotheses are close to the
+                reference (distances are identical)
+            normalize: Normalize words with HindiNormalizer (punctuation,
+                nukta, chandrabindu/anusvara, digits) before alignment
         """
+        if alignment_unit not in UNITS:
+            raise ValueError(f"Unknown alignment unit: {alignment_unit}")
         self.alignment_unit = alignment_unit
         self.alignment_justification = self._justify_alignment_unit()
+        self.banded = banded
+        self.normalizer = HindiNormalizer() if normalize else None
+        self.interner = TokenInterner()
     
     def _justify_alignment_unit(self) -> str:
         """Provide justification for chosen alignment unit"""
@@ -314,7 +301,17 @@ class LatticeWER:
             1. More granular than words, captures partial matches
             2. Better for morphologically rich languages
             3. Handles OOV words more gracefully
-            4. Aligns with modern tokenization (BPE, WordPiece)
+            4. Aksara units keep conjuncts and vowel signs intact, and the
+               word-start marker still counts word boundary errors
+            """
+        elif self.alignment_unit == 'character':
+            return """
+            Character-level alignment chosen because:
+            1. Aksaras (grapheme clusters) are the smallest units a Hindi
+               reader perceives as one character
+            2. Spelling variants cost one unit instead of a whole word
+            3. Ignores word boundaries, so joined/split compounds
+               (e.g. खेतीबाड़ी vs खेती बाड़ी) are not penalised
             """
         elif self.alignment_unit == 'phrase':
             return """
@@ -335,96 +332,85 @@ class LatticeWER:
         Returns:
             Dict with WER, substitutions, deletions, insertions
         """
-        # Use edit distance
-        distance = editdistance.eval(hypothesis, reference)
-        
-        # Get detailed alignment
-        alignment = self._get_alignment_details(hypothesis, reference)
+        return self.compute_standard_wer_batch([(self._prepare(hypothesis),
+                                                 self._prepare(reference))])[0]
+    
+    def _prepare(self, words: List[str]) -> List[str]:
+        """Normalize words (if enabled) and split them into alignment units"""
+        if self.normalizer:
+            words = self.normalizer.normalize_tokens(words)
+        return split_units(words, self.alignment_unit)
+    
+    def compute_standard_wer_batch(self, pairs: List[Tuple[List[str], List[str]]]) -> List[Dict]:
+        """
+        Compute standard WER for many (hypothesis, reference) pairs of
+        alignment units (already normalized and split)
         
-        wer = distance / len(reference) if len(reference) > 0 else 0.0
+        Each pair is aligned exactly once; distance and S/D/I counts come
+        from the same DP. Deletions are reference words missing from the
+        hypothesis, insertions are extra hypothesis words. In banded mode,
+        hypotheses identical to their reference are scored without
+        interning or alignment.
         
-        return {
-            'wer': wer,
-            'distance': distance,
-            'reference_length': len(reference),
-            'substitutions': alignment['substitutions'],
-            'deletions': alignment['deletions'],
-            'insertions': alignment['insertions']
-        }
+        Returns:
+            List of dicts with WER, substitutions, deletions, insertions
+        """
+        if self.banded:
+            exact = {'distance': 0, 'substitutions': 0, 'deletions': 0, 'insertions': 0}
+            todo = [k for k, (hypothesis, reference) in enumerate(pairs)
+                    if hypothesis != reference]
+            scores = [exact] * len(pairs)
+        else:
+            todo = range(len(pairs))
+            scores = [None] * len(pairs)
+        
+        aligned = score_pairs([
+            (self.interner.intern(pairs[k][1]), self.interner.intern(pairs[k][0]))
+            for k in todo
+        ], banded=self.banded)
+        for k, score in zip(todo, aligned):
+            scores[k] = score
+        
+        results = []
+        for (_, reference), score in zip(pairs, scores):
+            results.append({
+                'wer': score['distance'] / len(reference) if len(reference) > 0 else 0.0,
+                'distance': score['distance'],
+                'reference_length': len(reference),
+                'substitutions': score['substitutions'],
+                'deletions': score['deletions'],
+                'insertions': score['insertions']
+            })
+        return results
     
-    def _get_alignment_details(self, hyp: List[str], 
-                              ref: List[str]) -> Dict:
-        """Get detailed alignment with operation counts"""
-        m, n = len(hyp), len(ref)
-        
-        # DP for edit distance with backtracking
-        dp = [[0 for _ in range(n + 1)] for _ in range(m + 1)]
-        ops = [['' for _ in range(n + 1)] for _ in range(m + 1)]
-        
-        for i in range(m + 1):
-            dp[i][0] = i
-            ops[i][0] = 'D'
-        for j in range(n + 1):
-            dp[0][j] = j
-            ops[0][j] = 'I'
-        ops[0][0] = ''
-        
-        for i in range(1, m + 1):
-            for j in range(1, n + 1):
-                if hyp[i-1].lower() == ref[j-1].lower():
-                    dp[i][j] = dp[i-1][j-1]
-                    ops[i][j] = 'M'
-                else:
-                    sub = dp[i-1][j-1] + 1
-                    delete = dp[i-1][j] + 1
-                    insert = dp[i][j-1] + 1
-                    
-                    min_cost = min(sub, delete, insert)
-                    dp[i][j] = min_cost
-                    
-                    if min_cost == sub:
-                        ops[i][j] = 'S'
-                    elif min_cost == delete:
-                        ops[i][j] = 'D'
-                    else:
-                        ops[i][j] = 'I'
-        
-        # Count operations
-        i, j = m, n
-        subs, dels, ins = 0, 0, 0
-        
-        while i > 0 or j > 0:
-            if i == 0:
-                ins += 1
-                j -= 1
-            elif j == 0:
-                dels += 1
-                i -= 1
-            else:
-                op = ops[i][j]
-                if op == 'M':
-                    i -= 1
-                    j -= 1
-                elif op == 'S':
-                    subs += 1
-                    i -= 1
-                    j -= 1
-                elif op == 'D':
-                    dels += 1
-                    i -= 1
-                else:  # I
-                    ins += 1
-                    j -= 1
+    def compute_cer_batch(self, pairs: List[Tuple[List[str], List[str]]]) -> List[Dict]:
+        """
+        Aksara-level CER for many (hypothesis, reference) pairs of units
         
-        return {
-            'substitutions': subs,
-            'deletions': dels,
-            'insertions': ins
-        }
+        Sequences are re-split into aksaras without word boundaries, so
+        spacing differences are left to WER.
+        
+        Returns:
+            List of dicts with CER, substitutions, deletions, insertions
+        """
+        scores = self.compute_standard_wer_batch([
+            (self._characters(hypothesis), self._characters(reference))
+            for hypothesis, reference in pairs
+        ])
+        for score in scores:
+            score['cer'] = score.pop('wer')
+        return scores
+    
+    def _characters(self, units: List[str]) -> List[str]:
+        """Aksara sequence of a unit sequence"""
+        return split_units(join_units(units, self.alignment_unit).split(), 'character')
     
     def compute_lattice_wer(self, hypotheses: Dict[str, List[str]], 
                            reference: List[str],
-                           trust_threshold: float = 0.8) -> Dict:
+                           trust_threshold: float = 0.8,
+                           mode: str = 'consensus',
+                           report_cer: bool = False,
+                           return_lattice: bool = False):
         """
         Compute WER using lattice-based approach
         
@@ -432,10 +418,25 @@ class LatticeWER:
             hypotheses: Dict mapping model_name -> transcription
             reference: Reference transcription (may have errors)
             trust_threshold: Threshold for trusting models over reference
+            mode: 'consensus' (score against the voted consensus) or 'oracle'
+                (score against the closest path through the lattice built
+                from the reference and the other models)
+            report_cer: Also report aksara-level CER against the reference
+                and against the lattice reference
+            return_lattice: Also return the WordLattice (e.g. to store it)
         
         Returns:
-            Dict with WER for each model using lattice-based reference
+            Dict with WER for each model using lattice-based reference, or
+            (results, lattice) if return_lattice
         """
+        if mode not in ('consensus', 'oracle'):
+            raise ValueError(f"Unknown mode: {mode}")
+        
+        # Normalize and re-split words into the chosen alignment unit
+        original_reference = reference
+        reference = self._prepare(reference)
+        hypotheses = {name: self._prepare(seq) for name, seq in hypotheses.items()}
+        
         # Build lattice
         lattice = WordLattice(alignment_unit=self.alignment_unit)
         lattice.build_from_hypotheses(hypotheses, reference)
@@ -443,15 +444,40 @@ class LatticeWER:
         # Get consensus transcription
         consensus = lattice.get_consensus_transcription(strategy='voting')
         
-        # Compute WER for each model against both reference and consensus
+        model_names = list(hypotheses.keys())
+        if mode == 'oracle':
+            scores = self.compute_standard_wer_batch(
+                [(hypotheses[name], reference) for name in model_names]
+            )
+            scores += [self._oracle_wer(lattice, hypotheses[name], name, reference)
+                       for name in model_names]
+        else:
+            # Compute WER for each model against both reference and consensus,
+            # scoring all 2 x models pairs in one batch
+            scores = self.compute_standard_wer_batch(
+                [(hypotheses[name], reference) for name in model_names] +
+                [(hypotheses[name], consensus) for name in model_names]
+            )
+        
+        if report_cer:
+            lattice_refs = [scores[len(model_names) + k].get('best_path', consensus)
+                            for k in range(len(model_names))]
+            cer_scores = self.compute_cer_batch(
+                [(hypotheses[name], reference) for name in model_names] +
+                [(hypotheses[name], lattice_ref)
+                 for name, lattice_ref in zip(model_names, lattice_refs)]
+            )
+        
         results = {}
         
-        for model_name, hypothesis in hypotheses.items():
+        for k, model_name in enumerate(model_names):
+            hypothesis = hypotheses[model_name]
+            
             # Standard WER (against original reference)
-            standard_wer = self.compute_standard_wer(hypothesis, reference)
+            standard_wer = scores[k]
             
             # Lattice WER (against consensus)
-            lattice_wer = self.compute_standard_wer(hypothesis, consensus)
+            lattice_wer = scores[len(model_names) + k]
             
             # Determine if lattice improved WER
             improvement = standard_wer['wer'] - lattice_wer['wer']
@@ -463,19 +489,48 @@ class LatticeWER:
                 'improved': improvement > 0,
                 'hypothesis_length': len(hypothesis)
             }
+            
+            if report_cer:
+                results[model_name]['standard_cer'] = cer_scores[k]
+                results[model_name]['lattice_cer'] = cer_scores[len(model_names) + k]
         
         # Add consensus and lattice info
         results['_meta'] = {
-            'original_reference': reference,
+            'original_reference': original_reference,
+            'reference': reference,
             'consensus_transcription': consensus,
             'reference_length': len(reference),
             'consensus_length': len(consensus),
             'alignment_unit': self.alignment_unit,
-            'trust_threshold': trust_threshold
+            'trust_threshold': trust_threshold,
+            'mode': mode
         }
         
+        if return_lattice:
+            return results, lattice
         return results
     
+    def _oracle_wer(self, lattice: WordLattice, hypothesis: List[str], name: str,
+                    reference: List[str]) -> Dict:
+        """
+        WER of a model against its best path through the lattice
+        
+        Normalised by the reference length, so it is directly comparable
+        with (and never above) the standard WER, since the reference itself
+        is one of the lattice paths.
+        """
+        best = lattice.best_path(hypothesis, exclude=name)
+        return {
+            'wer': best['distance'] / len(reference) if len(reference) > 0 else 0.0,
+            'distance': best['distance'],
+            'reference_length': len(reference),
+            'path_length': best['reference_length'],
+            'substitutions': best['substitutions'],
+            'deletions': best['deletions'],
+            'insertions': best['insertions'],
+            'best_path': best['path']
+        }
+    
     def generate_report(self, results: Dict) -> str:
         """Generate human-readable report"""
         report = []
@@ -486,8 +541,9 @@ class LatticeWER:
         meta = results.get('_meta', {})
         
         report.append(f"\nAlignment Unit: {meta.get('alignment_unit', 'word')}")
-        report.append(f"Reference Length: {meta.get('reference_length', 0)} words")
-        report.append(f"Consensus Length: {meta.get('consensus_length', 0)} words")
+        units = 'words' if meta.get('alignment_unit', 'word') in ('word', 'phrase') else 'units'
+        report.append(f"Reference Length: {meta.get('reference_length', 0)} {units}")
+        report.append(f"Consensus Length: {meta.get('consensus_length', 0)} {units}")
         
         report.append("\n" + "-" * 80)
         report.append("WER COMPARISON")
@@ -529,6 +585,10 @@ class LatticeWER:
             report.append(f"    Substitutions: {lat['substitutions']}")
             report.append(f"    Deletions: {lat['deletions']}")
             report.append(f"    Insertions: {lat['insertions']}")
+            
+            if 'standard_cer' in model_results:
+                report.append(f"  Standard CER: {model_results['standard_cer']['cer']:.2%}")
+                report.append(f"  Lattice CER: {model_results['lattice_cer']['cer']:.2%}")
         
         report.append("\n" + "=" * 80)
         
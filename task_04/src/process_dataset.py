@@ -1,16 +1,31 @@
 """
 Process the actual dataset from Question 4 - Task.csv
+
+Usage:
+    python process_dataset.py
+    python process_dataset.py --batch --workers 8 --csv corpus.csv --output results.jsonl
 """
 
+import argparse
 import csv
+import itertools
 import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
 from lattice_wer import LatticeWER
 
+MODELS = ['Model_H', 'Model_i', 'Model_k', 'Model_l', 'Model_m', 'Model_n']
+DATASET_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dataset')
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
+
 def load_csv_data(csv_path):
     """Load data from CSV file"""
-    data = []
-    
+    return list(iter_csv_data(csv_path))
+
+def iter_csv_data(csv_path):
+    """Stream samples from a CSV file one row at a time"""
     with open(csv_path, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
@@ -26,85 +41,290 @@ def load_csv_data(csv_path):
                 'Model_n': row['Model n'].strip(),
             }
             
-            data.append({
+            yield {
                 'audio_url': row['segment_url_link'],
                 'reference': reference,
                 'hypotheses': hypotheses
-            })
-    
-    return data
+            }
 
 def tokenize(text):
     """Simple word tokenization"""
     return text.split()
 
+def score_sample(wer_calculator, sample_id, sample, mode='consensus', report_cer=False,
+                 with_lattice=False):
+    """
+    Lattice WER results for one sample, in the saved record format
+    
+    Returns:
+        record, or (record, lattice node columns) if with_lattice
+    """
+    reference_tokens = tokenize(sample['reference'])
+    hypotheses_tokens = {
+        model: tokenize(hyp) 
+        for model, hyp in sample['hypotheses'].items()
+    }
+    
+    results, lattice = wer_calculator.compute_lattice_wer(
+        hypotheses_tokens,
+        reference_tokens,
+        mode=mode,
+        report_cer=report_cer,
+        return_lattice=True
+    )
+    
+    # Add metadata
+    results['_meta']['audio_url'] = sample['audio_url']
+    results['_meta']['original_reference_text'] = sample['reference']
+    
+    record = {
+        'sample_id': sample_id,
+        'audio_url': sample['audio_url'],
+        'results': results
+    }
+    if with_lattice:
+        return record, lattice.node_columns()
+    return record
+
+class JsonlWriter:
+    """One JSON record per line; same add/close interface as result_store.ResultWriter"""
+    
+    def __init__(self, output_file):
+        self.file = open(output_file, 'w', encoding='utf-8')
+    
+    def add(self, record, nodes=None):
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+    
+    def close(self):
+        self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+def open_writer(output, output_format):
+    """JsonlWriter or (for parquet) a result_store.ResultWriter directory"""
+    if output_format == 'parquet':
+        # pyarrow is only needed for the columnar format
+        from result_store import ResultWriter
+        return ResultWriter(output)
+    return JsonlWriter(output)
+
+class ImprovementSummary:
+    """Running per-model WER improvement totals, updated one record at a time"""
+    
+    def __init__(self, models=MODELS):
+        self.samples = 0
+        self.totals = {model: [0.0, 0, 0] for model in models}  # sum, count, improved
+    
+    def add(self, record):
+        self.samples += 1
+        for model, total in self.totals.items():
+            if model in record['results']:
+                improvement = record['results'][model]['improvement']
+                total[0] += improvement
+                total[1] += 1
+                total[2] += improvement > 0
+    
+    def print_table(self):
+        print(f"\nTotal samples processed: {self.samples}")
+        print(f"\nAverage WER Improvement by Model:")
+        print(f"{'Model':<15} {'Avg Improvement':<20} {'Samples Improved':<20}")
+        print(f"{'-' * 55}")
+        
+        for model, (improvement_sum, count, samples_improved) in self.totals.items():
+            if count:
+                avg_improvement = improvement_sum / count
+                print(f"{model:<15} {avg_improvement:>18.4f} {samples_improved:>19}/{count}")
+
+# Per-process calculator for batch workers
+_worker_calculator = None
+
+def _init_worker(alignment_unit, banded, normalize):
+    global _worker_calculator
+    _worker_calculator = LatticeWER(alignment_unit=alignment_unit, banded=banded,
+                                    normalize=normalize)
+
+def _score_chunk(chunk, mode, report_cer, with_lattice, verbose):
+    """Score a list of (sample_id, sample) in a worker process"""
+    scored = []
+    for sample_id, sample in chunk:
+        scored_sample = score_sample(_worker_calculator, sample_id, sample, mode, report_cer,
+                                     with_lattice)
+        record, nodes = scored_sample if with_lattice else (scored_sample, None)
+        report = _worker_calculator.generate_report(record['results']) if verbose else None
+        scored.append((record, nodes, report))
+    return scored
+
+def run_batch(samples, writer, workers, chunk_size=256, mode='consensus',
+              alignment_unit='word', report_cer=False, banded=False, normalize=False,
+              with_lattice=False, verbose=False, progress_every=10000):
+    """
+    Score samples on a process pool, streaming records to writer (a
+    JsonlWriter or result_store.ResultWriter, with lattices if with_lattice)
+    
+    Samples are read lazily and at most 2 x workers chunks are in flight, so
+    memory stays flat however large the corpus is. Records are written in
+    completion order (each carries its sample_id) and folded into the
+    summary as they arrive.
+    
+    Returns:
+        ImprovementSummary over all samples
+    """
+    summary = ImprovementSummary()
+    chunks = iter(lambda: list(itertools.islice(samples, chunk_size)), [])
+    start = time.perf_counter()
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(alignment_unit, banded, normalize)) as executor:
+        pending = set()
+        
+        def fill():
+            while len(pending) < 2 * workers:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                pending.add(executor.submit(_score_chunk, chunk, mode, report_cer,
+                                            with_lattice, verbose))
+        
+        fill()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for record, nodes, report in future.result():
+                    writer.add(record, nodes)
+                    summary.add(record)
+                    if report:
+                        print(f"\n{'=' * 80}")
+                        print(f"RESULTS FOR SAMPLE {record['sample_id']}")
+                        print(f"{'=' * 80}")
+                        print(report)
+                    if progress_every and summary.samples % progress_every == 0:
+                        elapsed = time.perf_counter() - start
+                        print(f"   {summary.samples} samples ({summary.samples / elapsed:.0f}/s)", flush=True)
+            fill()
+    
+    return summary
+
 def main():
+    parser = argparse.ArgumentParser(description="Lattice WER over the Question 4 dataset")
+    parser.add_argument("--csv", type=str, default=os.path.join(DATASET_DIR, 'Question 4 - Task.csv'),
+                        help="CSV with Human and Model columns")
+    parser.add_argument("--batch", action="store_true",
+                        help="Score rows on a process pool and stream results to JSONL")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Worker processes in batch mode")
+    parser.add_argument("--chunk_size", type=int, default=256,
+                        help="Rows per worker task in batch mode")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Output file (default: output/dataset_lattice_wer_results.json, "
+                             ".jsonl in batch mode, or a directory for parquet)")
+    parser.add_argument("--format", type=str, default='json', choices=['json', 'parquet'],
+                        help="json (JSON, or JSONL in batch mode) or parquet (columnar "
+                             "scores plus binary lattices, read back with result_store.ResultStore)")
+    parser.add_argument("--mode", type=str, default='consensus', choices=['consensus', 'oracle'],
+                        help="Score models against the voted consensus or their best lattice path")
+    parser.add_argument("--unit", type=str, default='word',
+                        choices=['word', 'subword', 'character', 'phrase'],
+                        help="Alignment unit (subword/character split words into aksaras)")
+    parser.add_argument("--cer", action="store_true",
+                        help="Also report aksara-level CER")
+    parser.add_argument("--banded", action="store_true",
+                        help="Use the banded aligner (faster when models mostly agree with the reference)")
+    parser.add_argument("--normalize", action="store_true",
+                        help="Normalize punctuation, nukta, nasalisation and digits before scoring")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Print per-sample reports in batch mode")
+    
+    args = parser.parse_args()
+    parquet = args.format == 'parquet'
+    
+    if args.batch:
+        output_file = args.output or os.path.join(
+            OUTPUT_DIR, 'dataset_lattice_wer_results' + ('' if parquet else '.jsonl'))
+        os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+        
+        print("=" * 80)
+        print("BATCH LATTICE WER")
+        print("=" * 80)
+        print(f"\nInput: {args.csv}")
+        print(f"Workers: {args.workers}  Chunk size: {args.chunk_size}  "
+              f"Mode: {args.mode}  Unit: {args.unit}")
+        
+        start = time.perf_counter()
+        samples = ((idx + 1, sample) for idx, sample in enumerate(iter_csv_data(args.csv)))
+        with open_writer(output_file, args.format) as writer:
+            summary = run_batch(samples, writer, args.workers, args.chunk_size,
+                                args.mode, args.unit, args.cer, args.banded, args.normalize,
+                                parquet, args.verbose)
+        elapsed = time.perf_counter() - start
+        
+        print(f"\n{'=' * 80}")
+        print(f"SUMMARY STATISTICS")
+        print(f"{'=' * 80}")
+        summary.print_table()
+        print(f"\nTime: {elapsed:.1f}s ({summary.samples / elapsed:.0f} samples/s)")
+        print(f"Results saved to: {output_file}")
+        return
+    
     print("=" * 80)
     print("PROCESSING REAL DATASET: Question 4 - Task.csv")
     print("=" * 80)
     
     # Load data
-    csv_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 
-                            'dataset', 'Question 4 - Task.csv')
+    csv_path = args.csv
     
     print(f"\nLoading data from: {csv_path}")
     data = load_csv_data(csv_path)
     print(f"Loaded {len(data)} audio samples")
     
     # Initialize WER calculator
-    wer_calculator = LatticeWER(alignment_unit='word')
+    wer_calculator = LatticeWER(alignment_unit=args.unit, banded=args.banded,
+                                normalize=args.normalize)
     
     # Process each sample
     all_results = []
+    summary = ImprovementSummary()
+    output_file = args.output or os.path.join(
+        OUTPUT_DIR, 'dataset_lattice_wer_results' + ('' if parquet else '.json'))
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    writer = open_writer(output_file, args.format) if parquet else None
     
     for idx, sample in enumerate(data):
         print(f"\n{'=' * 80}")
         print(f"Processing Sample {idx + 1}/{len(data)}")
         print(f"{'=' * 80}")
         
-        # Tokenize reference and hypotheses
-        reference_tokens = tokenize(sample['reference'])
-        hypotheses_tokens = {
-            model: tokenize(hyp) 
-            for model, hyp in sample['hypotheses'].items()
-        }
-        
         print(f"\nReference: {sample['reference']}")
-        print(f"Reference tokens: {reference_tokens}")
+        print(f"Reference tokens: {tokenize(sample['reference'])}")
         print(f"\nModel Hypotheses:")
         for model, hyp in sample['hypotheses'].items():
             print(f"  {model}: {hyp}")
         
         # Compute WER
-        results = wer_calculator.compute_lattice_wer(
-            hypotheses_tokens,
-            reference_tokens
-        )
-        
-        # Add metadata
-        results['_meta']['audio_url'] = sample['audio_url']
-        results['_meta']['original_reference_text'] = sample['reference']
-        
-        all_results.append({
-            'sample_id': idx + 1,
-            'audio_url': sample['audio_url'],
-            'results': results
-        })
+        if writer:
+            record, nodes = score_sample(wer_calculator, idx + 1, sample, args.mode, args.cer,
+                                         with_lattice=True)
+            writer.add(record, nodes)
+        else:
+            record = score_sample(wer_calculator, idx + 1, sample, args.mode, args.cer)
+            all_results.append(record)
+        summary.add(record)
         
         # Print summary
         print(f"\n{'=' * 80}")
         print(f"RESULTS FOR SAMPLE {idx + 1}")
         print(f"{'=' * 80}")
-        print(wer_calculator.generate_report(results))
+        print(wer_calculator.generate_report(record['results']))
     
     # Save results
-    output_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'output')
-    os.makedirs(output_dir, exist_ok=True)
-    
-    output_file = os.path.join(output_dir, 'dataset_lattice_wer_results.json')
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(all_results, f, indent=2, ensure_ascii=False)
+    if writer:
+        writer.close()
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(all_results, f, indent=2, ensure_ascii=False)
     
     print(f"\n\n{'=' * 80}")
     print(f"PROCESSING COMPLETE")
@@ -115,26 +335,7 @@ def main():
     print(f"\n{'=' * 80}")
     print(f"SUMMARY STATISTICS")
     print(f"{'=' * 80}")
-    
-    total_samples = len(all_results)
-    model_improvements = {model: [] for model in ['Model_H', 'Model_i', 'Model_k', 'Model_l', 'Model_m', 'Model_n']}
-    
-    for sample in all_results:
-        for model in model_improvements.keys():
-            if model in sample['results']:
-                improvement = sample['results'][model]['improvement']
-                model_improvements[model].append(improvement)
-    
-    print(f"\nTotal samples processed: {total_samples}")
-    print(f"\nAverage WER Improvement by Model:")
-    print(f"{'Model':<15} {'Avg Improvement':<20} {'Samples Improved':<20}")
-    print(f"{'-' * 55}")
-    
-    for model, improvements in model_improvements.items():
-        if improvements:
-            avg_improvement = sum(improvements) / len(improvements)
-            samples_improved = sum(1 for imp in improvements if imp > 0)
-            print(f"{model:<15} {avg_improvement:>18.4f} {samples_improved:>19}/{len(improvements)}")
+    summary.print_table()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,243 @@
+"""
+Compact columnar storage for lattice WER results
+
+A results directory holds four Parquet tables:
+- scores.parquet: one row per (sample, model) with flat standard/lattice
+  WER columns, so per-model aggregates never touch token data
+- samples.parquet: one row per sample with the reference and consensus as
+  lists of vocabulary IDs, both in alignment units after normalization (so
+  they compare directly), plus the original reference tokens
+- lattices.parquet: one row per lattice node (sample_id, slot, token,
+  sources bitmask over reference + models, so at most 64 sources)
+- vocab.parquet: the interned vocabulary shared by the other tables
+
+Rows are buffered and written in row groups once either the score rows or
+the (much more numerous) lattice node rows fill up, so large runs stream to
+disk with bounded memory, and the loader can read single columns or filter
+on sample_id without parsing everything.
+
+Usage:
+    with ResultWriter('output/results') as writer:
+        results, lattice = wer_calculator.compute_lattice_wer(hyps, ref, return_lattice=True)
+        writer.add(record, lattice.node_columns())
+
+    store = ResultStore('output/results')
+    store.scores(columns=['model', 'lattice_wer']).to_pandas()
+    store.lattice(12)
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+SCORE_FIELDS = ('wer', 'distance', 'reference_length', 'substitutions', 'deletions', 'insertions')
+
+SCORES_SCHEMA = pa.schema(
+    [('sample_id', pa.int64()), ('model', pa.string())] +
+    [(f'{kind}_{field}', pa.float32() if field == 'wer' else pa.int32())
+     for kind in ('standard', 'lattice') for field in SCORE_FIELDS] +
+    [('standard_cer', pa.float32()), ('lattice_cer', pa.float32()),
+     ('improvement', pa.float32()), ('improved', pa.bool_()), ('hypothesis_length', pa.int32())]
+)
+
+SAMPLES_SCHEMA = pa.schema([
+    ('sample_id', pa.int64()),
+    ('audio_url', pa.string()),
+    ('original_reference', pa.list_(pa.int32())),
+    ('reference', pa.list_(pa.int32())),
+    ('consensus', pa.list_(pa.int32())),
+    ('reference_length', pa.int32()),
+    ('consensus_length', pa.int32()),
+    ('alignment_unit', pa.dictionary(pa.int8(), pa.string())),
+    ('mode', pa.dictionary(pa.int8(), pa.string())),
+])
+
+LATTICES_SCHEMA = pa.schema([
+    ('sample_id', pa.int64()),
+    ('slot', pa.int32()),
+    ('token', pa.int32()),
+    ('sources', pa.uint64()),
+])
+
+MAX_SOURCES = 64
+
+
+class ResultWriter:
+    """Stream lattice WER records into a results directory"""
+
+    def __init__(self, out_dir: str, row_group_size: int = 50000,
+                 lattice_row_group_size: int = 500000):
+        self.out_dir = out_dir
+        self.row_group_size = row_group_size
+        self.lattice_row_group_size = lattice_row_group_size
+        os.makedirs(out_dir, exist_ok=True)
+
+        self.ids: Dict[str, int] = {}
+        self.tokens: List[str] = []
+        self.names: Optional[List[str]] = None
+        self.buffers = {
+            'scores': {name: [] for name in SCORES_SCHEMA.names},
+            'samples': {name: [] for name in SAMPLES_SCHEMA.names},
+            'lattices': {name: [] for name in LATTICES_SCHEMA.names},
+        }
+        self.schemas = {'scores': SCORES_SCHEMA, 'samples': SAMPLES_SCHEMA,
+                        'lattices': LATTICES_SCHEMA}
+        self.writers: Dict[str, pq.ParquetWriter] = {}
+
+    def intern(self, tokens: Sequence[str]) -> List[int]:
+        """Vocabulary IDs of tokens, adding new ones"""
+        ids = self.ids
+        out = []
+        for token in tokens:
+            token_id = ids.get(token)
+            if token_id is None:
+                token_id = ids[token] = len(self.tokens)
+                self.tokens.append(token)
+            out.append(token_id)
+        return out
+
+    def add(self, record: Dict, nodes: Optional[Tuple] = None) -> None:
+        """
+        Add one process_dataset record and, optionally, its
+        WordLattice.node_columns()
+        """
+        sample_id = record['sample_id']
+        results = record['results']
+        meta = results['_meta']
+
+        scores = self.buffers['scores']
+        for model, model_results in results.items():
+            if model == '_meta':
+                continue
+            scores['sample_id'].append(sample_id)
+            scores['model'].append(model)
+            for kind in ('standard', 'lattice'):
+                wer = model_results[f'{kind}_wer']
+                for field in SCORE_FIELDS:
+                    scores[f'{kind}_{field}'].append(wer[field])
+                cer = model_results.get(f'{kind}_cer')
+                scores[f'{kind}_cer'].append(cer['cer'] if cer else None)
+            scores['improvement'].append(model_results['improvement'])
+            scores['improved'].append(model_results['improved'])
+            scores['hypothesis_length'].append(model_results['hypothesis_length'])
+
+        samples = self.buffers['samples']
+        samples['sample_id'].append(sample_id)
+        samples['audio_url'].append(record.get('audio_url'))
+        samples['original_reference'].append(self.intern(meta['original_reference']))
+        samples['reference'].append(self.intern(meta['reference']))
+        samples['consensus'].append(self.intern(meta['consensus_transcription']))
+        samples['reference_length'].append(meta['reference_length'])
+        samples['consensus_length'].append(meta['consensus_length'])
+        samples['alignment_unit'].append(meta['alignment_unit'])
+        samples['mode'].append(meta.get('mode', 'consensus'))
+
+        if nodes is not None:
+            names, slots, words, masks = nodes
+            if len(names) > MAX_SOURCES:
+                raise ValueError(f"{len(names)} lattice sources do not fit the {MAX_SOURCES}-bit "
+                                 f"sources mask; store fewer models per lattice")
+            if self.names is None:
+                self.names = names
+            elif names != self.names:
+                raise ValueError(f"Lattice sources {names} differ from {self.names}")
+            lattices = self.buffers['lattices']
+            lattices['sample_id'].extend([sample_id] * len(slots))
+            lattices['slot'].extend(slots)
+            lattices['token'].extend(self.intern(words))
+            lattices['sources'].extend(masks)
+
+        if (len(scores['sample_id']) >= self.row_group_size
+                or len(self.buffers['lattices']['sample_id']) >= self.lattice_row_group_size):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered rows as one row group per table"""
+        for table_name, columns in self.buffers.items():
+            if not columns['sample_id']:
+                continue
+            schema = self.schemas[table_name]
+            table = pa.table(columns, schema=schema)
+            if table_name not in self.writers:
+                self.writers[table_name] = pq.ParquetWriter(
+                    os.path.join(self.out_dir, f'{table_name}.parquet'), schema, compression='zstd')
+            self.writers[table_name].write_table(table)
+            for values in columns.values():
+                values.clear()
+
+    def close(self) -> None:
+        """Flush remaining rows and write the vocabulary"""
+        self.flush()
+        for writer in self.writers.values():
+            writer.close()
+        self.writers = {}
+
+        metadata = {'sources': json.dumps(self.names or [], ensure_ascii=False)}
+        vocab = pa.table({'token': pa.array(self.tokens, pa.string())}).replace_schema_metadata(metadata)
+        pq.write_table(vocab, os.path.join(self.out_dir, 'vocab.parquet'), compression='zstd')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ResultStore:
+    """Read back a results directory written by ResultWriter"""
+
+    def __init__(self, out_dir: str):
+        self.out_dir = out_dir
+        vocab = pq.read_table(self._path('vocab'))
+        self.tokens: List[str] = vocab.column('token').to_pylist()
+        self.names: List[str] = json.loads(vocab.schema.metadata[b'sources'])
+
+    def _path(self, table_name: str) -> str:
+        return os.path.join(self.out_dir, f'{table_name}.parquet')
+
+    def scores(self, columns: Optional[List[str]] = None, filters=None) -> pa.Table:
+        """Per-(sample, model) scores, optionally only some columns / rows"""
+        return pq.read_table(self._path('scores'), columns=columns, filters=filters)
+
+    def samples(self, columns: Optional[List[str]] = None, filters=None) -> pa.Table:
+        """Per-sample metadata with token ID lists"""
+        return pq.read_table(self._path('samples'), columns=columns, filters=filters)
+
+    def words(self, token_ids: Sequence[int]) -> List[str]:
+        """Decode vocabulary IDs"""
+        return [self.tokens[token_id] for token_id in token_ids]
+
+    def sample(self, sample_id: int) -> Dict:
+        """One sample with its references and consensus decoded to words"""
+        rows = self.samples(filters=[('sample_id', '=', sample_id)]).to_pylist()
+        if not rows:
+            raise KeyError(sample_id)
+        row = rows[0]
+        for column in ('original_reference', 'reference', 'consensus'):
+            row[column] = self.words(row[column])
+        return row
+
+    def lattice(self, sample_id: int) -> List[Dict[str, List[str]]]:
+        """Slots of one sample's lattice, each mapping word -> source names"""
+        table = pq.read_table(self._path('lattices'), filters=[('sample_id', '=', sample_id)])
+        table = table.sort_by('slot')
+        slots: List[Dict[str, List[str]]] = []
+        for slot, token, mask in zip(table.column('slot').to_pylist(),
+                                     table.column('token').to_pylist(),
+                                     table.column('sources').to_pylist()):
+            while len(slots) <= slot:
+                slots.append({})
+            slots[slot][self.tokens[token]] = [name for k, name in enumerate(self.names)
+                                               if mask >> k & 1]
+        return slots
+
+    def model_summary(self) -> pa.Table:
+        """Mean standard/lattice WER, mean improvement and improved count per model"""
+        scores = self.scores(columns=['model', 'standard_wer', 'lattice_wer', 'improvement', 'improved'])
+        return scores.group_by('model').aggregate([
+            ('standard_wer', 'mean'), ('lattice_wer', 'mean'),
+            ('improvement', 'mean'), ('improved', 'sum'), ('improved', 'count'),
+        ])
@@ -0,0 +1,60 @@
+"""
+Tests for the alignment engine
+
+Run from this directory: python -m pytest -q
+"""
+
+import random
+
+import editdistance
+import numpy as np
+
+from alignment import (MATCH, align_banded, align_core, count_operations,
+                       edit_operations_banded)
+
+
+def _path_cost(path):
+    return sum(op != MATCH for op, _, _ in path)
+
+
+def test_band_zero_permutation_terminates():
+    a = np.array([1, 2, 3], dtype=np.int32)
+    b = np.array([3, 2, 1], dtype=np.int32)
+    distance, path = align_banded(a, b, band=0)
+    assert distance == 2
+    assert _path_cost(path) == 2
+
+
+def test_align_core_band_zero_equal_bags():
+    a = np.array([4, 5, 6, 7, 4, 5, 6, 7], dtype=np.int32)
+    b = a[::-1].copy()
+    distance, _ = align_core(a, b, band=0)
+    assert distance == editdistance.eval(a.tolist(), b.tolist())
+
+
+def test_banded_matches_full_distance():
+    rng = random.Random(0)
+    for _ in range(300):
+        a = [rng.randrange(6) for _ in range(rng.randrange(0, 40))]
+        b = list(a)
+        for _ in range(rng.randrange(0, 6)):
+            k = rng.randrange(len(b) + 1)
+            if b and rng.random() < 0.5:
+                b[min(k, len(b) - 1)] = rng.randrange(6)
+            else:
+                b.insert(k, rng.randrange(6))
+        band = rng.randrange(0, 4)
+        distance, path = align_banded(np.array(a, dtype=np.int32), np.array(b, dtype=np.int32), band)
+        assert distance == editdistance.eval(a, b)
+        assert _path_cost(path) == distance
+        counts = count_operations(path)
+        matches = len(path) - _path_cost(path)
+        assert matches + counts['substitutions'] + counts['deletions'] == len(a)
+        assert matches + counts['substitutions'] + counts['insertions'] == len(b)
+
+
+def test_banded_distance_is_exact_within_band():
+    a = np.array([1, 2, 3, 4, 5], dtype=np.int32)
+    b = np.array([1, 2, 9, 4, 5, 6], dtype=np.int32)
+    distance, _ = edit_operations_banded(a, b, band=2)
+    assert distance == 2
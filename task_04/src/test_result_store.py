@@ -0,0 +1,79 @@
+"""
+Tests for Parquet result storage
+
+Run from this directory: python -m pytest -q
+"""
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from lattice_wer import LatticeWER
+from result_store import MAX_SOURCES, ResultStore, ResultWriter
+
+REFERENCE = ['हिन्दी', 'में', 'बात', 'करो।']
+HYPOTHESES = {
+    'model_a': ['हिंदी', 'में', 'बात', 'करो'],
+    'model_b': ['हिंदी', 'मे', 'बात', 'करो'],
+}
+
+
+def _record(calculator, sample_id):
+    results, lattice = calculator.compute_lattice_wer(HYPOTHESES, REFERENCE, return_lattice=True)
+    return {'sample_id': sample_id, 'audio_url': f'{sample_id}.wav', 'results': results}, lattice
+
+
+@pytest.mark.parametrize('unit', ['word', 'character'])
+def test_round_trip(tmp_path, unit):
+    calculator = LatticeWER(alignment_unit=unit, normalize=True)
+    with ResultWriter(str(tmp_path)) as writer:
+        for sample_id in range(3):
+            record, lattice = _record(calculator, sample_id)
+            writer.add(record, lattice.node_columns())
+
+    store = ResultStore(str(tmp_path))
+    meta = record['results']['_meta']
+    sample = store.sample(2)
+    assert sample['original_reference'] == REFERENCE
+    assert sample['reference'] == meta['reference']
+    assert sample['consensus'] == meta['consensus_transcription']
+    assert len(sample['reference']) == sample['reference_length']
+
+    scores = store.scores(filters=[('sample_id', '=', 1)]).to_pylist()
+    assert sorted(row['model'] for row in scores) == sorted(HYPOTHESES)
+    assert store.model_summary().num_rows == len(HYPOTHESES)
+
+    slots = store.lattice(0)
+    assert len(slots) == len(lattice.slot_best)
+    assert all(sources for slot in slots for sources in slot.values())
+
+
+def test_reference_is_normalized_like_consensus(tmp_path):
+    calculator = LatticeWER(normalize=True)
+    record, _ = _record(calculator, 0)
+    with ResultWriter(str(tmp_path)) as writer:
+        writer.add(record)
+    sample = ResultStore(str(tmp_path)).sample(0)
+    assert sample['reference'] == ['हिंदी', 'में', 'बात', 'करो']
+    assert sample['original_reference'] == REFERENCE
+
+
+def test_too_many_sources_raises(tmp_path):
+    calculator = LatticeWER()
+    hypotheses = {f'model_{k}': ['बात'] for k in range(MAX_SOURCES)}
+    results, lattice = calculator.compute_lattice_wer(hypotheses, ['बात'], return_lattice=True)
+    writer = ResultWriter(str(tmp_path))
+    with pytest.raises(ValueError):
+        writer.add({'sample_id': 0, 'results': results}, lattice.node_columns())
+
+
+def test_lattice_rows_trigger_flush(tmp_path):
+    calculator = LatticeWER()
+    record, lattice = _record(calculator, 0)
+    nodes = lattice.node_columns()
+    writer = ResultWriter(str(tmp_path), row_group_size=1000, lattice_row_group_size=len(nodes[1]))
+    writer.add(record, nodes)
+    assert not writer.buffers['lattices']['sample_id']
+    assert not writer.buffers['scores']['sample_id']
+    writer.close()
+    assert len(ResultStore(str(tmp_path)).lattice(0)) == len(lattice.slot_best)
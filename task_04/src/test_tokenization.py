@@ -0,0 +1,62 @@
+"""
+Tests for alignment units and text normalization (shared with task_01 and task_03)
+
+Run from this directory: python -m pytest -q
+"""
+
+import pytest
+
+from text_normalizer import HindiNormalizer
+from tokenization import WORD_START, aksaras, join_units, split_units
+
+
+@pytest.mark.parametrize('word, expected', [
+    ('हिंदी', ('हिं', 'दी')),
+    ('स्त्री', ('स्त्री',)),
+    ('क्षमा', ('क्ष', 'मा')),
+    ('ज़रूर', ('ज़', 'रू', 'र')),
+    ('आईं', ('आ', 'ईं')),
+    ('abc', ('a', 'b', 'c')),
+    ('', ()),
+])
+def test_aksaras(word, expected):
+    assert aksaras(word) == expected
+
+
+def test_aksaras_cover_the_word():
+    for word in ['विश्वविद्यालय', 'अ्', 'डा़', 'है्', 'क््', 'ाे']:
+        assert ''.join(aksaras(word)) == word
+
+
+@pytest.mark.parametrize('unit', ['word', 'subword', 'character', 'phrase'])
+def test_split_join_round_trip(unit):
+    words = ['मेरा', 'नाम', 'राहुल', 'है']
+    units = split_units(words, unit)
+    expected = 'मेरानामराहुलहै' if unit == 'character' else 'मेरा नाम राहुल है'
+    assert join_units(units, unit) == expected
+
+
+def test_subword_marks_word_starts():
+    assert split_units(['हिंदी', 'है'], 'subword') == [WORD_START + 'हिं', 'दी', WORD_START + 'है']
+    with pytest.raises(ValueError):
+        split_units(['है'], 'byte')
+
+
+def test_normalizer_folds_spelling_variants():
+    normalizer = HindiNormalizer()
+    assert normalizer.normalize('हिन्दी') == normalizer.normalize('हिंदी')
+    assert normalizer.normalize('हूँ') == normalizer.normalize('हूं')
+    assert normalizer.normalize('क्या?') == 'क्या'
+    assert normalizer.normalize('१२') == '12'
+
+
+@pytest.mark.parametrize('word', ['अन्य', 'तुम्हारा', 'सम्मान', 'कन्या'])
+def test_normalizer_keeps_non_homorganic_nasal_clusters(word):
+    assert HindiNormalizer().normalize(word) == word
+
+
+def test_normalizer_folds_homorganic_nasal_clusters():
+    normalizer = HindiNormalizer()
+    assert normalizer.normalize('सम्बन्ध') == 'संबंध'
+    assert normalizer.normalize('पण्डित') == 'पंडित'
+    assert normalizer.normalize('गङ्गा') == 'गंगा'
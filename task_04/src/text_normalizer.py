@@ -0,0 +1,98 @@
+"""
+Hindi text normalization shared by every WER computation
+(task_04 lattice WER and task_01 Whisper evaluation)
+
+All character rules are compiled once into a str.translate table and a
+regex, and each distinct token is normalized once and memoized, so scoring
+a corpus costs one dict lookup per token after warm-up.
+"""
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Tuple
+
+NUKTA = '़'
+CHANDRABINDU = 'ँ'
+ANUSVARA = 'ं'
+VIRAMA = '्'
+
+# A nasal consonant + virama before a stop of its own class is written as
+# anusvara in the other common spelling (हिन्दी -> हिंदी, सम्बन्ध -> संबंध).
+# Other clusters (अन्य, तुम्हारा, सम्मान, कन्या) have no anusvara spelling.
+_NASAL_CLUSTER = re.compile(
+    f"ङ{VIRAMA}(?=[क-घ])|ञ{VIRAMA}(?=[च-झ])|ण{VIRAMA}(?=[ट-ढ])"
+    f"|न{VIRAMA}(?=[त-ध])|म{VIRAMA}(?=[प-भ])"
+)
+
+
+def _build_table(fold_nukta: bool, fold_chandrabindu: bool,
+                 normalize_digits: bool) -> Dict[int, str]:
+    """str.translate table for punctuation, format characters, signs and digits"""
+    table = {}
+    # Punctuation outside the Basic Multilingual Plane never shows up in
+    # transcripts, and scanning only the BMP keeps start-up cheap
+    for code in range(0x10000):
+        category = unicodedata.category(chr(code))
+        if category == 'Pd':
+            table[code] = ' '  # dashes join words: खेती-बाड़ी -> खेती बाड़ी
+        elif category[0] == 'P' or category == 'Cf':
+            table[code] = None
+    if fold_nukta:
+        table[ord(NUKTA)] = None
+    if fold_chandrabindu:
+        table[ord(CHANDRABINDU)] = ANUSVARA
+    if normalize_digits:
+        for digit in range(10):
+            table[ord('०') + digit] = str(digit)
+    return table
+
+
+class HindiNormalizer:
+    """
+    Normalize Hindi transcripts before scoring
+
+    Steps, in order: NFC, lower-casing, punctuation and zero-width character
+    removal (dashes become spaces), nukta removal, chandrabindu -> anusvara,
+    homorganic nasal + virama -> anusvara, Devanagari digits -> ASCII.
+    """
+
+    _tables: Dict[Tuple[bool, bool, bool], Dict[int, str]] = {}
+
+    def __init__(self, fold_nukta: bool = True, fold_nasals: bool = True,
+                 normalize_digits: bool = True):
+        key = (fold_nukta, fold_nasals, normalize_digits)
+        if key not in self._tables:
+            self._tables[key] = _build_table(*key)
+        self.table = self._tables[key]
+        self.fold_nasals = fold_nasals
+        self.cache: Dict[str, Tuple[str, ...]] = {}
+
+    def normalize_token(self, token: str) -> Tuple[str, ...]:
+        """Normalized form of one whitespace token (empty if it was only punctuation)"""
+        normalized = self.cache.get(token)
+        if normalized is None:
+            text = unicodedata.normalize('NFC', token).lower()
+            # NFC keeps क़-style letters decomposed, so the nukta is a separate mark
+            text = text.translate(self.table)
+            if self.fold_nasals:
+                text = _NASAL_CLUSTER.sub(ANUSVARA, text)
+            normalized = tuple(text.split())
+            self.cache[token] = normalized
+        return normalized
+
+    def normalize_tokens(self, tokens: Iterable[str]) -> List[str]:
+        """Normalize a token sequence, dropping tokens that were only punctuation"""
+        out = []
+        for token in tokens:
+            out.extend(self.normalize_token(token))
+        return out
+
+    def normalize(self, text: str) -> str:
+        """Normalize a whole transcript"""
+        return ' '.join(self.normalize_tokens(text.split()))
+
+    def normalize_batch(self, texts: Iterable[str]) -> List[str]:
+        """Normalize many transcripts, sharing the token cache"""
+        return [self.normalize(text) for text in texts]
+
+    __call__ = normalize
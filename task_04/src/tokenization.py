@@ -0,0 +1,77 @@
+"""
+Alignment units for Devanagari text
+Splits words into grapheme clusters (aksaras) so lattice WER can be computed
+at subword or character level as well as word level
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Sequence
+
+# Marks the first unit of each word in subword mode (SentencePiece convention)
+WORD_START = '▁'
+
+_CONSONANT = '[क-हक़-य़ॸ-ॿ]'
+_NUKTA = '़'
+_VIRAMA = '्'
+_JOINER = '[‌‍]'
+_MATRA = '[ऺऻा-ौॎॏॕ-ॗॢॣ]'
+_MODIFIER = '[ऀ-ः]'
+_VOWEL = '[ऄ-औॠॡॲ-ॷ]'
+
+# One aksara: a consonant cluster joined by viramas with its vowel sign and
+# modifiers, an independent vowel with its modifiers, or any other character
+# with whatever combining marks follow it
+AKSARA = re.compile(
+    f"(?:{_CONSONANT}{_NUKTA}?{_VIRAMA}{_JOINER}?)*{_CONSONANT}{_NUKTA}?"
+    f"(?:{_VIRAMA}{_JOINER}?|{_MATRA}*){_MODIFIER}*"
+    f"|{_VOWEL}{_NUKTA}?{_MATRA}*{_MODIFIER}*"
+    f"|.[̀-ͯ{_NUKTA}{_VIRAMA}ऺ-ॏ॑-ॗॢॣऀ-ः]*",
+    re.DOTALL
+)
+
+UNITS = ('word', 'subword', 'character', 'phrase')
+
+
+@lru_cache(maxsize=65536)
+def aksaras(word: str) -> tuple:
+    """Grapheme clusters of a word, memoized since vocabularies are small"""
+    return tuple(AKSARA.findall(word))
+
+
+def split_units(words: Sequence[str], unit: str = 'word') -> List[str]:
+    """
+    Re-split a word sequence into alignment units
+
+    Args:
+        words: Word tokens
+        unit: 'word' (unchanged), 'subword' (aksaras, with WORD_START on the
+            first aksara of each word so word boundaries still count) or
+            'character' (aksaras only, so joining or splitting words costs
+            nothing). 'phrase' is aligned at word level.
+
+    Returns:
+        List of unit strings
+    """
+    if unit in ('word', 'phrase'):
+        return list(words)
+    if unit == 'character':
+        return [piece for word in words for piece in aksaras(word)]
+    if unit == 'subword':
+        units = []
+        for word in words:
+            pieces = aksaras(word)
+            if pieces:
+                units.append(WORD_START + pieces[0])
+                units.extend(pieces[1:])
+        return units
+    raise ValueError(f"Unknown alignment unit: {unit}")
+
+
+def join_units(units: Sequence[str], unit: str = 'word') -> str:
+    """Text of a unit sequence (character units carry no word boundaries)"""
+    if unit in ('word', 'phrase'):
+        return ' '.join(units)
+    if unit == 'character':
+        return ''.join(units)
+    return ''.join(units).replace(WORD_START, ' ').strip()